@@ -1,11 +1,26 @@
 # api/main.py
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from apps.camera_feed_worker.routes.router import router as camera_feed_worker_router
+from apps.landmark_extractor import service as landmark_extractor_service
+from apps.landmark_extractor.config import BACKEND_WARMUP_ON_STARTUP
 from apps.schema_recorder.routes.router import router as schema_recorder_router
 from apps.session_manager.routes.router import router as session_manager_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load MediaPipe models before serving instead of on the first frame.
+    if BACKEND_WARMUP_ON_STARTUP:
+        await asyncio.to_thread(landmark_extractor_service.warmup)
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="A3CP API",
     version="1.0.0",
     description="MVP API for session management and module integration",
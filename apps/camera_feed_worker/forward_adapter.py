@@ -2,7 +2,7 @@ import base64
 import uuid
 
 from apps.camera_feed_worker.repository import ForwardItem
-from schemas import LandmarkExtractorFrameInput
+from schemas import LandmarkExtractorFrameBytesInput, LandmarkExtractorFrameInput
 
 
 def forward_item_to_landmark_input(item: ForwardItem) -> LandmarkExtractorFrameInput:
@@ -25,6 +25,33 @@ def forward_item_to_landmark_input(item: ForwardItem) -> LandmarkExtractorFrameI
         timestamp_frame=item.timestamp_frame,
         # payload (raw base64 is fine)
         frame_data=frame_data_b64,
+        detector_profile=item.detector_profile,
         # optional legacy field, omit unless needed
         # frame_id=record_id,
     )
+
+
+def forward_item_to_landmark_bytes_input(
+    item: ForwardItem,
+) -> LandmarkExtractorFrameBytesInput:
+    """
+    Binary in-process variant of forward_item_to_landmark_input.
+
+    Passes the payload through as-is (no base64 encode here, no decode in the
+    extractor); a memoryview is kept as a view, not copied.
+    """
+    return LandmarkExtractorFrameBytesInput(
+        schema_version="1.0.1",
+        record_id=uuid.uuid4(),
+        user_id=item.user_id,
+        session_id=item.session_id,
+        timestamp=item.timestamp_frame,
+        event="capture.frame_bytes",
+        modality="image",
+        source="camera_feed_worker",
+        capture_id=uuid.UUID(item.capture_id),
+        seq=item.seq,
+        timestamp_frame=item.timestamp_frame,
+        frame_bytes=item.payload,
+        detector_profile=item.detector_profile,
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
 
-from apps.camera_feed_worker.forward_adapter import forward_item_to_landmark_input
+from apps.camera_feed_worker.forward_adapter import forward_item_to_landmark_bytes_input
 from apps.camera_feed_worker.repository import repo
 from schemas import LandmarkExtractorInput
 
@@ -15,7 +15,7 @@ async def forwarder_loop(
     """
     Async worker:
     - consumes ForwardItem from repo queue
-    - adapts to LandmarkExtractorInput (pure)
+    - adapts to LandmarkExtractorInput (pure; binary frame, no base64)
     - calls ingest entrypoint (injected)
 
     Must NOT:
@@ -25,5 +25,5 @@ async def forwarder_loop(
     """
     while True:
         item = await repo.dequeue_frame(connection_key)
-        le_in = forward_item_to_landmark_input(item)
+        le_in = forward_item_to_landmark_bytes_input(item)
         await ingest_fn(le_in)
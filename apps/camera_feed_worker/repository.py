@@ -67,6 +67,7 @@ class ForwardItem:
     height: int
     user_id: str
     session_id: str
+    detector_profile: str | None = None
 
 
 # ---------------------------------------------------------------------
@@ -589,6 +589,7 @@ def _build_forward_item_or_none(
         height=int(current_state.height),
         user_id=str(current_state.user_id),
         session_id=str(current_state.session_id),
+        detector_profile=current_state.detector_profile,
     )
 
 
@@ -229,6 +229,8 @@ def handle_open(
     new_state = ActiveState(
         record_id=_get(open_event, "record_id"),
         annotation_intent=annotation_intent,
+        # Validated against the known profiles by CameraFeedWorkerInput.
+        detector_profile=getattr(open_event, "detector_profile", None),
         capture_id=str(capture_id),
         user_id=str(user_id),
         session_id=str(session_id),
@@ -34,6 +34,9 @@ class ActiveState:
     # capture-time immutable annotation (Sprint 1)
     annotation_intent: str | None = None
 
+    # capture-time landmark detector profile (None = extractor default)
+    detector_profile: str | None = None
+
     # event-time
     timestamp_start: datetime | None = None
     last_frame_timestamp: datetime | None = None
@@ -0,0 +1,118 @@
+# apps/camera_feed_worker/tests/test_detector_profile.py
+
+import uuid
+from datetime import datetime, timezone
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from apps.camera_feed_worker.forward_adapter import (
+    forward_item_to_landmark_bytes_input,
+    forward_item_to_landmark_input,
+)
+from apps.camera_feed_worker.repository import ForwardItem
+from apps.camera_feed_worker.service import dispatch
+from apps.camera_feed_worker.state import ActiveState, IdleState
+from apps.landmark_extractor.config import DETECTOR_PROFILES
+from schemas import CameraFeedWorkerInput
+from schemas.camera_feed_worker.camera_feed_worker import DetectorProfile
+
+
+def _base_msg(event: str) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "schema_version": "1.0.1",
+        "record_id": str(uuid.uuid4()),
+        "user_id": "u_test",
+        "session_id": "sess_test",
+        "timestamp": now,
+        "modality": "image",
+        "source": "ui",
+        "event": event,
+        "capture_id": str(uuid.uuid4()),
+    }
+
+
+def _open_msg(**extra) -> dict:
+    msg = _base_msg("capture.open")
+    msg.update(
+        timestamp_start=msg["timestamp"],
+        fps_target=15,
+        width=640,
+        height=480,
+        encoding="jpeg",
+        **extra,
+    )
+    return msg
+
+
+def test_dispatch_open_sets_detector_profile() -> None:
+    msg = CameraFeedWorkerInput(**_open_msg(detector_profile="hands_only"))
+
+    new_state, _ = dispatch(
+        connection_key=f"ck_{uuid.uuid4()}",
+        current_state=IdleState(),
+        event_kind=msg.event,
+        event=msg,
+        now_ingest=datetime.now(timezone.utc),
+    )
+
+    assert isinstance(new_state, ActiveState)
+    assert new_state.detector_profile == "hands_only"
+
+
+def test_dispatch_open_without_detector_profile_sets_none() -> None:
+    msg = CameraFeedWorkerInput(**_open_msg())
+
+    new_state, _ = dispatch(
+        connection_key=f"ck_{uuid.uuid4()}",
+        current_state=IdleState(),
+        event_kind=msg.event,
+        event=msg,
+        now_ingest=datetime.now(timezone.utc),
+    )
+
+    assert isinstance(new_state, ActiveState)
+    assert new_state.detector_profile is None
+
+
+def test_unknown_detector_profile_rejected_at_capture_open() -> None:
+    with pytest.raises(ValidationError):
+        CameraFeedWorkerInput(**_open_msg(detector_profile="no_such_profile"))
+
+
+def test_detector_profile_literal_matches_extractor_profiles() -> None:
+    assert set(get_args(DetectorProfile)) == set(DETECTOR_PROFILES)
+
+
+def test_detector_profile_rejected_outside_capture_open() -> None:
+    msg = _base_msg("capture.frame_meta")
+    msg.update(
+        seq=1,
+        timestamp_frame=msg["timestamp"],
+        byte_length=3,
+        detector_profile="hands_only",
+    )
+
+    with pytest.raises(ValidationError):
+        CameraFeedWorkerInput(**msg)
+
+
+def test_forward_adapters_carry_detector_profile() -> None:
+    item = ForwardItem(
+        capture_id=str(uuid.uuid4()),
+        seq=1,
+        timestamp_frame=datetime.now(timezone.utc),
+        payload=b"abc",
+        byte_length=3,
+        encoding="jpeg",
+        width=640,
+        height=480,
+        user_id="u_test",
+        session_id="sess_test",
+        detector_profile="hands_only",
+    )
+
+    assert forward_item_to_landmark_input(item).detector_profile == "hands_only"
+    assert forward_item_to_landmark_bytes_input(item).detector_profile == "hands_only"
@@ -2,10 +2,55 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Mapping
 from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
-from apps.landmark_extractor.domain import FeatureMatrix
+import numpy as np
+
+from apps.landmark_extractor.config import (
+    CAPTURE_MAX_FRAMES,
+    FEATURE_ARTIFACT_ARRAY_KEY,
+    FEATURE_ARTIFACT_FORMAT,
+    FEATURE_ARTIFACT_SCALE_KEY,
+    FEATURE_ARTIFACT_STORAGE_KEY,
+    FEATURE_DIM,
+    FEATURE_DTYPE,
+)
+from apps.landmark_extractor.domain import FeatureBuffer, FeatureMatrix
+from apps.landmark_extractor.feature_codec import (
+    FeatureCodecError,
+    encode_feature_matrix,
+)
+from apps.landmark_extractor.feature_store import (
+    artifact_staging_dir,
+    publish_feature_artifact,
+    release_feature_artifact,
+    stored_artifact_path,
+)
+from utils.paths import feature_artifact_path
+
+_COMPRESSIONS = ("stored", "deflate")
+_FSYNC_POLICIES = ("none", "file")
+_RESERVED_ARRAY_KEYS = frozenset(
+    {
+        FEATURE_ARTIFACT_ARRAY_KEY,
+        FEATURE_ARTIFACT_STORAGE_KEY,
+        FEATURE_ARTIFACT_SCALE_KEY,
+    }
+)
+
+
+class ArtifactWriterError(Exception):
+    """Raised for invalid artifact writer configuration or inputs."""
 
 
 @dataclass(frozen=True)
@@ -28,19 +73,542 @@ def write_feature_artifact(
     session_id: str,
     capture_id: UUID,
     feature_matrix: FeatureMatrix,
+    extra_arrays: Mapping[str, np.ndarray] | None = None,
 ) -> ArtifactWriteResult:
     """
     Write the feature artifact for one completed capture.
 
-    This is a placeholder skeleton. Implementation will be added later.
+    extra_arrays are stored as additional npz members next to the feature
+    matrix (e.g. per-row masks); the matrix stays under
+    FEATURE_ARTIFACT_ARRAY_KEY.
+
+    The matrix is stored in FEATURE_STORAGE_ENCODING (see
+    feature_codec.encode_feature_matrix); the result's dtype names that
+    encoding. "int16_delta" members are always deflate-compressed.
+
+    Steps:
+    - resolve the canonical path via utils.paths.feature_artifact_path(...)
+    - stream the npz archive into a temp file (feature_store.artifact_staging_dir)
+    - hash the archive bytes while they are written (no read-back pass)
+    - fsync the temp file per ARTIFACT_FSYNC_POLICY
+    - publish it atomically (see feature_store.publish_feature_artifact); the
+      result's artifact_path is the stored path, i.e. the shared blob with the
+      content-addressed store
+
+    Failure behavior:
+    - the temp file is removed; no partial artifact is left at the final path
+
+    Config (FEATURE_DATA_ROOT, ARTIFACT_COMPRESSION, ARTIFACT_FSYNC_POLICY,
+    FEATURE_STORAGE_ENCODING, FEATURE_INT16_SCALE) is read at call time so
+    tests can override it.
+    """
+    from apps.landmark_extractor.config import (
+        ARTIFACT_COMPRESSION,
+        ARTIFACT_FSYNC_POLICY,
+        FEATURE_DATA_ROOT,
+        FEATURE_INT16_SCALE,
+        FEATURE_STORAGE_ENCODING,
+    )
+
+    if ARTIFACT_COMPRESSION not in _COMPRESSIONS:
+        raise ArtifactWriterError(
+            f"Unsupported artifact compression: {ARTIFACT_COMPRESSION!r}"
+        )
+    if ARTIFACT_FSYNC_POLICY not in _FSYNC_POLICIES:
+        raise ArtifactWriterError(
+            f"Unsupported artifact fsync policy: {ARTIFACT_FSYNC_POLICY!r}"
+        )
+
+    matrix = np.ascontiguousarray(feature_matrix, dtype=FEATURE_DTYPE)
+    if matrix.ndim != 2:
+        raise ArtifactWriterError(
+            f"Feature matrix must be 2-D, got shape {matrix.shape}"
+        )
+
+    try:
+        encoded = encode_feature_matrix(
+            matrix, FEATURE_STORAGE_ENCODING, scale=FEATURE_INT16_SCALE
+        )
+    except FeatureCodecError as exc:
+        raise ArtifactWriterError(str(exc)) from exc
+
+    arrays = {**encoded, **_check_extra_arrays(extra_arrays)}
+
+    compression = ARTIFACT_COMPRESSION
+    if FEATURE_STORAGE_ENCODING == "int16_delta":
+        compression = "deflate"
+
+    artifact_path = feature_artifact_path(
+        FEATURE_DATA_ROOT, user_id, session_id, capture_id
+    )
+
+    artifact_hash = _write_atomic(
+        artifact_path,
+        arrays,
+        compression=compression,
+        fsync=ARTIFACT_FSYNC_POLICY == "file",
+    )
+
+    return ArtifactWriteResult(
+        capture_id=capture_id,
+        artifact_path=str(stored_artifact_path(artifact_path, artifact_hash)),
+        artifact_hash=f"sha256:{artifact_hash}",
+        shape=(int(matrix.shape[0]), int(matrix.shape[1])),
+        dtype=FEATURE_STORAGE_ENCODING,
+        format=FEATURE_ARTIFACT_FORMAT,
+    )
+
+
+class StagedFeatureArtifact:
+    """
+    Memory-mapped staging file for one capture's artifact.
+
+    The staging file is laid out as a stored (uncompressed) npz archive whose
+    first member's row region is preallocated for CAPTURE_MAX_FRAMES rows:
+
+        [zip local header][npy header][row 0][row 1]...[row capacity-1]
+
+    buffer appends rows straight into that region. Sealing rewrites the two
+    headers for the actual row count, truncates the unused rows, appends any
+    extra (small) members plus the zip central directory and publishes the
+    file via feature_store.publish_feature_artifact.
+    """
+
+    def __init__(
+        self,
+        *,
+        capture_id: UUID,
+        artifact_path: Path,
+        staging_path: Path,
+        file: BinaryIO,
+        mapping: np.memmap,
+        buffer: FeatureBuffer,
+    ) -> None:
+        self.capture_id = capture_id
+        self.artifact_path = artifact_path
+        self.staging_path = staging_path
+        self.buffer = buffer
+        self.sealed = False
+        self._file: BinaryIO | None = file
+        self._mapping = mapping
+
+    @property
+    def sealable(self) -> bool:
+        """
+        True while seal_feature_artifact can still run on this staging file.
+
+        False once sealed, discarded, or when a previous seal failed after
+        the file was completed (e.g. while publishing); the rows then remain
+        readable through buffer.view().
+        """
+        return not self.sealed and self._file is not None
+
+
+def stage_feature_artifact(
+    *,
+    user_id: str,
+    session_id: str,
+    capture_id: UUID,
+    capacity: int = CAPTURE_MAX_FRAMES,
+) -> StagedFeatureArtifact:
+    """
+    Create the memory-mapped staging file for one capture.
+
+    The staging file lives in feature_store.artifact_staging_dir() so sealing
+    is a same-filesystem rename. Its buffer is a FeatureBuffer over the mapped row
+    region; appended rows are written to the page cache directly.
+    """
+    from apps.landmark_extractor.config import FEATURE_DATA_ROOT
+
+    artifact_path = feature_artifact_path(
+        FEATURE_DATA_ROOT, user_id, session_id, capture_id
+    )
+    staging_dir = artifact_staging_dir(artifact_path)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    fd, staging_name = tempfile.mkstemp(
+        prefix=f".{artifact_path.stem}.",
+        suffix=".staging",
+        dir=staging_dir,
+    )
+    staging_path = Path(staging_name)
+
+    try:
+        file = os.fdopen(fd, "r+b")
+        itemsize = np.dtype(FEATURE_DTYPE).itemsize
+        data_offset = _STAGED_DATA_OFFSET
+
+        mapping = np.memmap(
+            file,
+            dtype=np.uint8,
+            mode="r+",
+            shape=(data_offset + capacity * FEATURE_DIM * itemsize,),
+        )
+        rows = mapping[data_offset:].view(FEATURE_DTYPE).reshape(capacity, FEATURE_DIM)
+    except BaseException:
+        staging_path.unlink(missing_ok=True)
+        raise
+
+    return StagedFeatureArtifact(
+        capture_id=capture_id,
+        artifact_path=artifact_path,
+        staging_path=staging_path,
+        file=file,
+        mapping=mapping,
+        buffer=FeatureBuffer(storage=rows),
+    )
+
+
+def seal_feature_artifact(
+    staged: StagedFeatureArtifact,
+    extra_arrays: Mapping[str, np.ndarray] | None = None,
+) -> ArtifactWriteResult:
+    """
+    Turn a staging file into the final artifact for the rows appended so far.
+
+    Steps:
+    - write the npy header for shape (T, D) and the zip local header
+    - truncate the unused row capacity, then append extra_arrays as further
+      stored members and the zip central directory
+    - compute sha256 over the final bytes (no serialization or row copy)
+    - fsync per ARTIFACT_FSYNC_POLICY and publish at the final path via
+      feature_store.publish_feature_artifact
+
+    After sealing, the buffer is read-only; its view() stays valid. If
+    writing the trailer fails, the staging file stays open and sealing can be
+    retried; if publishing fails, staged.sealable turns False and the rows
+    must be written with write_feature_artifact instead.
+
+    Raises:
+    - ArtifactWriterError if not sealable or no rows were appended
+    """
+    from apps.landmark_extractor.config import ARTIFACT_FSYNC_POLICY
+
+    if not staged.sealable:
+        raise ArtifactWriterError(f"Artifact already sealed: {staged.capture_id}")
+
+    data = staged.buffer.view()
+    rows = data.shape[0]
+    if rows == 0:
+        raise ArtifactWriterError("Cannot seal artifact with zero feature rows")
+
+    extras = _check_extra_arrays(extra_arrays)
+
+    mapping = staged._mapping
+    file = staged._file
+
+    npy_header = _npy_header(data.shape, data.dtype)
+    member_size = len(npy_header) + data.nbytes
+    crc = zlib.crc32(data, zlib.crc32(npy_header))
+
+    local_header = _zip_local_header(
+        _ZIP_MEMBER_NAME, crc, member_size, extra=_ZIP_LOCAL_EXTRA
+    )
+    mapping[: len(local_header)] = np.frombuffer(local_header, dtype=np.uint8)
+    mapping[_STAGED_DATA_OFFSET - _NPY_HEADER_SIZE : _STAGED_DATA_OFFSET] = (
+        np.frombuffer(npy_header, dtype=np.uint8)
+    )
+    mapping.flush()
+
+    # No more writes through the mapping; pages past data_end are truncated.
+    staged.buffer.freeze()
+
+    data_end = _STAGED_DATA_OFFSET + data.nbytes
+    trailer = _zip_tail(
+        [(_ZIP_MEMBER_NAME, crc, member_size, 0)], extras, offset=data_end
+    )
+
+    digest = hashlib.sha256(mapping[:data_end])
+    digest.update(trailer)
+
+    # On failure the file stays open so a retried close can seal again.
+    file.truncate(data_end)
+    file.seek(data_end)
+    file.write(trailer)
+    file.flush()
+    if ARTIFACT_FSYNC_POLICY == "file":
+        os.fsync(file.fileno())
+
+    file.close()
+    staged._file = None
+
+    artifact_hash = digest.hexdigest()
+    publish_feature_artifact(staged.staging_path, staged.artifact_path, artifact_hash)
+    staged.sealed = True
+
+    return ArtifactWriteResult(
+        capture_id=staged.capture_id,
+        artifact_path=str(stored_artifact_path(staged.artifact_path, artifact_hash)),
+        artifact_hash=f"sha256:{artifact_hash}",
+        shape=(rows, int(data.shape[1])),
+        dtype=str(data.dtype),
+        format=FEATURE_ARTIFACT_FORMAT,
+    )
+
+
+def discard_staged_artifact(staged: StagedFeatureArtifact) -> None:
+    """
+    Drop a staging file without producing an artifact (capture.abort).
+
+    Idempotent; a sealed artifact at the final path is not touched.
     """
-    raise NotImplementedError("write_feature_artifact is not implemented yet.")
+    if staged._file is not None:
+        staged._file.close()
+        staged._file = None
+
+    staged.staging_path.unlink(missing_ok=True)
 
 
-def delete_feature_artifact(*, artifact_path: str) -> None:
+def delete_feature_artifact(
+    *, artifact_path: str, capture_id: UUID | None = None
+) -> None:
     """
     Delete a previously written artifact.
 
     Used for commit-unit rollback if event append fails.
+    A missing artifact is not an error (rollback is idempotent). For a
+    content-addressed blob only the capture's ref is removed (so capture_id
+    is required to undo it); the shared blob is left to
+    feature_store.collect_garbage().
+    """
+    release_feature_artifact(Path(artifact_path), capture_id)
+
+
+# ============================================================
+# Internal helpers
+# ============================================================
+
+
+def _check_extra_arrays(
+    extra_arrays: Mapping[str, np.ndarray] | None,
+) -> dict[str, np.ndarray]:
+    """
+    Return extra_arrays as C-contiguous arrays, rejecting reserved/bad keys.
+
+    0-d (scalar) members stay 0-d; np.ascontiguousarray would make them (1,).
     """
-    raise NotImplementedError("delete_feature_artifact is not implemented yet.")
+    arrays: dict[str, np.ndarray] = {}
+
+    for key, array in (extra_arrays or {}).items():
+        if key in _RESERVED_ARRAY_KEYS or not key.isidentifier():
+            raise ArtifactWriterError(f"Invalid extra artifact array key: {key!r}")
+        array = np.asarray(array)
+        arrays[key] = array if array.flags.c_contiguous else np.ascontiguousarray(array)
+
+    return arrays
+
+
+class _HashingWriter:
+    """
+    Write-only, non-seekable file wrapper that sha256-hashes bytes as written.
+
+    Exposing tell() but no seek() makes zipfile stream members with data
+    descriptors instead of seeking back to patch headers, so every byte of the
+    archive passes through write() exactly once, in file order.
+    """
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self._raw = raw
+        self._digest = hashlib.sha256()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        written = self._raw.write(data)
+        self._position += len(data)
+        return written
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        # Present only so numpy treats this as a file object, not a path.
+        raise io.UnsupportedOperation("write-only stream")
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _write_atomic(
+    artifact_path: Path,
+    arrays: Mapping[str, np.ndarray],
+    *,
+    compression: str,
+    fsync: bool,
+) -> str:
+    """
+    Write arrays as an npz archive for artifact_path via temp file + publish.
+
+    Returns the sha256 hex digest of the archive bytes.
+    """
+    temp_dir = artifact_staging_dir(artifact_path)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{artifact_path.stem}.",
+        suffix=".tmp",
+        dir=temp_dir,
+    )
+    temp_path = Path(temp_name)
+
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            writer = _HashingWriter(raw)
+            save = np.savez_compressed if compression == "deflate" else np.savez
+            save(writer, **arrays)
+
+            raw.flush()
+            if fsync:
+                os.fsync(raw.fileno())
+
+        publish_feature_artifact(temp_path, artifact_path, writer.hexdigest())
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return writer.hexdigest()
+
+
+# ------------------------------------------------------------
+# Staged npz layout
+# ------------------------------------------------------------
+
+_ZIP_MEMBER_NAME = f"{FEATURE_ARTIFACT_ARRAY_KEY}.npy".encode("ascii")
+_ZIP_DOS_TIME = 0
+_ZIP_DOS_DATE = (1 << 5) | 1  # 1980-01-01, fixed for reproducible bytes
+_ZIP_VERSION = 20
+_ZIP_PADDING_EXTRA_ID = 0xA3C9
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+_ZIP_CENTRAL_HEADER = struct.Struct("<4s6H3I5H2I")
+_ZIP_END_RECORD = struct.Struct("<4s4H2IH")
+
+# Fixed npy header size; fits any (rows, dim) shape this module writes.
+_NPY_HEADER_SIZE = 128
+
+# Pad the local header's extra field so row data starts 64-byte aligned.
+_ZIP_EXTRA_PAD = (
+    -(_ZIP_LOCAL_HEADER.size + len(_ZIP_MEMBER_NAME) + 4 + _NPY_HEADER_SIZE)
+) % 64
+_ZIP_LOCAL_EXTRA = (
+    struct.pack("<2H", _ZIP_PADDING_EXTRA_ID, _ZIP_EXTRA_PAD) + b"\0" * _ZIP_EXTRA_PAD
+)
+
+_STAGED_DATA_OFFSET = (
+    _ZIP_LOCAL_HEADER.size
+    + len(_ZIP_MEMBER_NAME)
+    + len(_ZIP_LOCAL_EXTRA)
+    + _NPY_HEADER_SIZE
+)
+
+
+def _npy_header(shape: tuple[int, ...], dtype: np.dtype) -> bytes:
+    """Return an npy v1.0 header for a C-order array, padded to _NPY_HEADER_SIZE."""
+    header = {
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": tuple(int(n) for n in shape),
+    }
+    prefix = b"\x93NUMPY\x01\x00"
+    body_size = _NPY_HEADER_SIZE - len(prefix) - 2
+    body = repr(header).encode("latin1")
+
+    if len(body) + 1 > body_size:
+        raise ArtifactWriterError(f"npy header too long for shape {tuple(shape)}")
+
+    body = body + b" " * (body_size - len(body) - 1) + b"\n"
+    return prefix + struct.pack("<H", body_size) + body
+
+
+def _zip_local_header(
+    name: bytes, crc: int, member_size: int, *, extra: bytes = b""
+) -> bytes:
+    """Return the zip local file header for one stored member."""
+    return (
+        _ZIP_LOCAL_HEADER.pack(
+            b"PK\x03\x04",
+            _ZIP_VERSION,
+            0,
+            0,
+            _ZIP_DOS_TIME,
+            _ZIP_DOS_DATE,
+            crc,
+            member_size,
+            member_size,
+            len(name),
+            len(extra),
+        )
+        + name
+        + extra
+    )
+
+
+def _zip_tail(
+    members: list[tuple[bytes, int, int, int]],
+    extra_arrays: Mapping[str, np.ndarray],
+    *,
+    offset: int,
+) -> bytes:
+    """
+    Return the bytes that follow the first member's data at offset.
+
+    Appends each extra array as a stored npy member, then the central
+    directory for all members. members holds (name, crc, size, local header
+    offset) of members already in the file.
+    """
+    members = list(members)
+    tail = bytearray()
+
+    for key, array in extra_arrays.items():
+        name = f"{key}.npy".encode("ascii")
+        payload = _npy_header(array.shape, array.dtype) + array.tobytes()
+        crc = zlib.crc32(payload)
+
+        members.append((name, crc, len(payload), offset + len(tail)))
+        tail += _zip_local_header(name, crc, len(payload)) + payload
+
+    tail += _zip_trailer(members, central_directory_offset=offset + len(tail))
+    return bytes(tail)
+
+
+def _zip_trailer(
+    members: list[tuple[bytes, int, int, int]], *, central_directory_offset: int
+) -> bytes:
+    """Return central directory + end-of-central-directory record for members."""
+    central = b"".join(
+        _ZIP_CENTRAL_HEADER.pack(
+            b"PK\x01\x02",
+            _ZIP_VERSION,
+            _ZIP_VERSION,
+            0,
+            0,
+            _ZIP_DOS_TIME,
+            _ZIP_DOS_DATE,
+            crc,
+            member_size,
+            member_size,
+            len(name),
+            0,
+            0,
+            0,
+            0,
+            0,
+            local_header_offset,
+        )
+        + name
+        for name, crc, member_size, local_header_offset in members
+    )
+    end = _ZIP_END_RECORD.pack(
+        b"PK\x05\x06",
+        0,
+        0,
+        len(members),
+        len(members),
+        len(central),
+        central_directory_offset,
+        0,
+    )
+    return central + end
@@ -0,0 +1,177 @@
+# apps/landmark_extractor/backend_pool.py
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from apps.landmark_extractor.frame_buffers import FrameBufferPoolStats
+from apps.landmark_extractor.landmark_mediapipe import MediaPipeLandmarkBackend
+
+
+class MediaPipeBackendPoolError(Exception):
+    """Base exception for backend pool failures."""
+
+
+class MediaPipeBackendLeaseTimeout(MediaPipeBackendPoolError):
+    """Raised when no backend becomes available within the lease timeout."""
+
+
+@dataclass(frozen=True)
+class BackendPoolStats:
+    """
+    Point-in-time occupancy metrics for one MediaPipeBackendPool.
+    """
+
+    size: int
+    leased: int
+    available: int
+    waiting: int
+    peak_leased: int
+    leases_granted: int
+    lease_timeouts: int
+
+
+class MediaPipeBackendPool:
+    """
+    Fixed-size pool of pre-initialized MediaPipe backends.
+
+    Responsibilities:
+    - construct `size` backends up front via backend_factory
+    - hand out one backend per lease; a leased backend is used by one capture only
+    - block lease() callers until a backend is released or the timeout elapses
+    - track occupancy metrics
+
+    Concurrency:
+    - thread-safe; lease() blocks the calling thread and must not be called on
+      the asyncio event loop
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        backend_factory: Callable[[], MediaPipeLandmarkBackend],
+        lease_timeout_s: float,
+    ) -> None:
+        if size < 1:
+            raise MediaPipeBackendPoolError("Backend pool size must be >= 1")
+
+        self._size = size
+        self._lease_timeout_s = lease_timeout_s
+        self._condition = threading.Condition()
+
+        self._backends: tuple[MediaPipeLandmarkBackend, ...] = tuple(
+            backend_factory() for _ in range(size)
+        )
+        self._available: list[MediaPipeLandmarkBackend] = list(self._backends)
+        self._leased: set[int] = set()
+
+        self._waiting = 0
+        self._peak_leased = 0
+        self._leases_granted = 0
+        self._lease_timeouts = 0
+
+    def lease(self, timeout_s: float | None = None) -> MediaPipeLandmarkBackend:
+        """
+        Lease one backend, waiting up to timeout_s (default: pool lease timeout).
+
+        Raises:
+        - MediaPipeBackendLeaseTimeout if no backend becomes available in time
+        """
+        timeout = self._lease_timeout_s if timeout_s is None else timeout_s
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            self._waiting += 1
+            try:
+                while not self._available:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        if self._available:
+                            break
+                        self._lease_timeouts += 1
+                        raise MediaPipeBackendLeaseTimeout(
+                            f"No MediaPipe backend available within {timeout:.2f}s "
+                            f"(pool size={self._size})"
+                        )
+            finally:
+                self._waiting -= 1
+
+            backend = self._available.pop()
+            self._leased.add(id(backend))
+            self._leases_granted += 1
+            self._peak_leased = max(self._peak_leased, len(self._leased))
+            return backend
+
+    def release(self, backend: MediaPipeLandmarkBackend) -> None:
+        """
+        Return a leased backend to the pool.
+
+        Raises:
+        - MediaPipeBackendPoolError if the backend is not currently leased
+        """
+        with self._condition:
+            if id(backend) not in self._leased:
+                raise MediaPipeBackendPoolError("Backend is not leased from this pool")
+
+            self._leased.discard(id(backend))
+            self._available.append(backend)
+            self._condition.notify()
+
+    def stats(self) -> BackendPoolStats:
+        """Return current occupancy metrics."""
+        with self._condition:
+            return BackendPoolStats(
+                size=self._size,
+                leased=len(self._leased),
+                available=len(self._available),
+                waiting=self._waiting,
+                peak_leased=self._peak_leased,
+                leases_granted=self._leases_granted,
+                lease_timeouts=self._lease_timeouts,
+            )
+
+    def warmup(self) -> None:
+        """
+        Run MediaPipeLandmarkBackend.warmup() on every available backend.
+
+        Warmed backends are withheld from lease() until all are done, so a
+        capture never shares a backend with warm-up. Leased backends are
+        skipped (they are already running frames).
+        """
+        with self._condition:
+            backends, self._available = self._available, []
+
+        try:
+            for backend in backends:
+                backend.warmup()
+        finally:
+            with self._condition:
+                self._available.extend(backends)
+                self._condition.notify_all()
+
+    def frame_buffer_stats(self) -> FrameBufferPoolStats:
+        """
+        Return frame buffer reuse metrics summed over all backends.
+
+        Counters are read without taking backend ownership, so a frame in
+        flight may or may not be included.
+        """
+        per_backend = [backend.frame_buffer_stats() for backend in self._backends]
+
+        return FrameBufferPoolStats(
+            sizes=sum(stats.sizes for stats in per_backend),
+            hits=sum(stats.hits for stats in per_backend),
+            misses=sum(stats.misses for stats in per_backend),
+        )
+
+    def close(self) -> None:
+        """Close all backends currently available in the pool."""
+        with self._condition:
+            backends, self._available = self._available, []
+
+        for backend in backends:
+            backend.close()
@@ -0,0 +1,200 @@
+# apps/landmark_extractor/capture_registry.py
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping, MutableSet
+from typing import Any
+from uuid import UUID
+
+from apps.landmark_extractor.domain import CaptureState
+
+
+class ActiveCaptureRegistry(MutableMapping[UUID, CaptureState]):
+    """
+    Active capture states keyed by capture_id, ordered by last activity.
+
+    Responsibilities:
+    - behave as a dict of capture_id → CaptureState
+    - record the last activity time of every capture (insert or touch())
+    - report captures idle longer than idle_ttl_s (orphans whose terminal
+      event was lost)
+    - report the least recently active captures to drop so the buffered row
+      memory stays within max_bytes
+
+    The registry never evicts on its own; the service aborts the reported
+    captures so backends and staging files are released with them.
+
+    Concurrency:
+    - thread-safe; frame worker threads insert and touch while the event loop
+      reads and removes
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_ttl_s: float,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if idle_ttl_s <= 0:
+            raise ValueError("idle_ttl_s must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self._idle_ttl_s = idle_ttl_s
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: OrderedDict[UUID, CaptureState] = OrderedDict()
+        self._last_active: dict[UUID, float] = {}
+
+    def __getitem__(self, capture_id: UUID) -> CaptureState:
+        return self._states[capture_id]
+
+    def __setitem__(self, capture_id: UUID, state: CaptureState) -> None:
+        with self._lock:
+            self._states[capture_id] = state
+            self._states.move_to_end(capture_id)
+            self._last_active[capture_id] = self._clock()
+
+    def __delitem__(self, capture_id: UUID) -> None:
+        with self._lock:
+            del self._states[capture_id]
+            del self._last_active[capture_id]
+
+    def __iter__(self) -> Iterator[UUID]:
+        with self._lock:
+            return iter(list(self._states))
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def pop(self, capture_id: UUID, *default: CaptureState | None) -> Any:
+        """Remove and return the state of capture_id (atomic, dict semantics)."""
+        with self._lock:
+            self._last_active.pop(capture_id, None)
+            return self._states.pop(capture_id, *default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._last_active.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the row buffers of all active captures."""
+        with self._lock:
+            return sum(state.feature_rows.nbytes for state in self._states.values())
+
+    def touch(self, capture_id: UUID) -> None:
+        """Record activity (e.g. a received frame) for capture_id, if active."""
+        with self._lock:
+            if capture_id in self._states:
+                self._states.move_to_end(capture_id)
+                self._last_active[capture_id] = self._clock()
+
+    def idle_captures(self) -> list[UUID]:
+        """Return captures idle for longer than idle_ttl_s, oldest first."""
+        deadline = self._clock() - self._idle_ttl_s
+
+        with self._lock:
+            idle = []
+            for capture_id in self._states:
+                if self._last_active[capture_id] > deadline:
+                    break
+                idle.append(capture_id)
+            return idle
+
+    def over_budget_captures(self, reserve_bytes: int = 0) -> list[UUID]:
+        """
+        Return the least recently active captures whose removal brings the
+        buffered bytes plus reserve_bytes within max_bytes, oldest first.
+        """
+        with self._lock:
+            excess = (
+                sum(state.feature_rows.nbytes for state in self._states.values())
+                + reserve_bytes
+                - self._max_bytes
+            )
+
+            victims = []
+            for capture_id, state in self._states.items():
+                if excess <= 0:
+                    break
+                victims.append(capture_id)
+                excess -= state.feature_rows.nbytes
+            return victims
+
+
+class TerminalCaptureIds(MutableSet[UUID]):
+    """
+    Set of capture_ids that received a terminal event, bounded in time and size.
+
+    An id is remembered for at least replay_window_s after it was added unless
+    more than max_size newer ids arrive first; late frames or terminal events
+    within that window are still rejected. Older ids are forgotten.
+
+    Concurrency:
+    - thread-safe
+    """
+
+    def __init__(
+        self,
+        *,
+        replay_window_s: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if replay_window_s <= 0:
+            raise ValueError("replay_window_s must be positive")
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+
+        self._replay_window_s = replay_window_s
+        self._max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._added_at: OrderedDict[UUID, float] = OrderedDict()
+
+    def __contains__(self, capture_id: object) -> bool:
+        with self._lock:
+            self._prune()
+            return capture_id in self._added_at
+
+    def __iter__(self) -> Iterator[UUID]:
+        with self._lock:
+            self._prune()
+            return iter(list(self._added_at))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune()
+            return len(self._added_at)
+
+    def add(self, capture_id: UUID) -> None:
+        """Remember capture_id as terminal (refreshes its replay window)."""
+        with self._lock:
+            self._added_at[capture_id] = self._clock()
+            self._added_at.move_to_end(capture_id)
+            self._prune()
+
+    def discard(self, capture_id: UUID) -> None:
+        with self._lock:
+            self._added_at.pop(capture_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._added_at.clear()
+
+    def _prune(self) -> None:
+        """Drop ids past the replay window, then the oldest beyond max_size."""
+        deadline = self._clock() - self._replay_window_s
+
+        while self._added_at:
+            capture_id, added_at = next(iter(self._added_at.items()))
+            if added_at > deadline and len(self._added_at) <= self._max_size:
+                break
+            del self._added_at[capture_id]
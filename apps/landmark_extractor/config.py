@@ -17,6 +17,7 @@ Constraints:
 - no filesystem IO
 """
 
+from pathlib import Path
 
 # ------------------------------------------------------------
 # MediaPipe Tasks configuration (MVP)
@@ -33,6 +34,125 @@ POSE_MAX_RESULTS = 1
 HAND_MAX_NUM_HANDS = 2
 FACE_MAX_NUM_FACES = 1
 
+# Run pose, hand and face detectors in parallel on a backend-owned thread pool.
+# Per-frame latency becomes that of the slowest detector instead of the sum.
+MEDIAPIPE_CONCURRENT_DETECTORS = False
+MEDIAPIPE_DETECTOR_THREADS = 3
+
+# Pose-guided ROI: run pose first, then give the hand and face detectors tight
+# crops around the pose hand (wrist/pinky/index/thumb) and face anchors.
+# Crop-local landmarks are mapped back to full-frame normalized (x, y).
+# A detector falls back to the full frame when pose is missing, no anchor is
+# visible, or its crop would cover most of the frame anyway.
+# Margins are in multiples of the pose shoulder width.
+# In ROI mode the hand and face detectors run in IMAGE mode (no cross-frame
+# tracking, which cannot follow a crop that moves every frame).
+POSE_ROI_ENABLED = False
+POSE_ROI_MIN_VISIBILITY = 0.5
+POSE_ROI_HAND_MARGIN = 0.75
+POSE_ROI_FACE_MARGIN = 0.4
+POSE_ROI_MAX_AREA_FRACTION = 0.8
+
+# ------------------------------------------------------------
+# Frame pipeline execution
+# ------------------------------------------------------------
+
+# Worker threads used to run per-frame decode + extraction off the event loop.
+# Frames of one capture are still processed strictly in arrival order.
+FRAME_PIPELINE_MAX_WORKERS = 4
+
+# Worker threads running capture.close finalize (artifact write, then event
+# append, then rollback on failure) off the asyncio event loop. Separate from
+# the frame pool so a close is never queued behind other captures' frames.
+FINALIZE_MAX_WORKERS = 2
+
+# Pre-initialized MediaPipe backends shared by concurrent captures.
+# A capture leases one backend on its first frame and holds it until
+# capture.close / capture.abort, so each VIDEO-mode detector set only ever
+# sees one capture's frames at a time.
+BACKEND_POOL_SIZE = 2
+
+# Maximum time a first frame waits for a free backend before failing.
+BACKEND_LEASE_TIMEOUT_S = 2.0
+
+# Backends are built on first use, not at import. When True, the API lifespan
+# calls service.warmup() at startup so model loading and graph init are not
+# paid by the first frame of the first capture.
+BACKEND_WARMUP_ON_STARTUP = True
+
+# Where capture messages are executed:
+# - "thread":  in this process (frame executor + backend pool)
+# - "process": in PROCESS_POOL_WORKERS worker processes, each owning its own
+#              backend pool; all messages of a capture go to the same worker
+EXTRACTION_EXECUTION_MODE = "thread"
+PROCESS_POOL_WORKERS = 2
+
+# Longest image side handed to the MediaPipe detectors (None = native size).
+# Opt-in: landmarks stay normalized, so the feature layout is unchanged, but
+# the hand and face landmark stages crop their ROI from the input image, so a
+# smaller input lowers landmark precision. Check accuracy before enabling
+# (e.g. 320 for 640x480 input).
+# When set, larger JPEGs are decoded at 1/2 or 1/4 scale (libjpeg DCT scaling)
+# whenever that still covers this size; the remainder is one INTER_AREA
+# resize, done before the BGR->RGB conversion so the conversion runs on the
+# small frame.
+EXTRACTION_MAX_LONG_SIDE = None
+
+# Distinct frame sizes for which each backend keeps a reusable RGB buffer.
+# Captures normally hold one resolution, so a few entries cover steady state.
+FRAME_BUFFER_POOL_MAX_SIZES = 4
+
+# Opt-in motion gate: when a frame differs from the last extracted frame by
+# less than MOTION_GATE_THRESHOLD (mean absolute difference of a small
+# grayscale thumbnail, 0-255 scale), the previous feature row is repeated
+# instead of running the detectors. Comparison is against the last extracted
+# frame (not the previous frame), so slow drift still triggers extraction.
+# After MOTION_GATE_MAX_REUSED_RUN consecutive reused rows one frame is always
+# extracted.
+MOTION_GATE_ENABLED = False
+MOTION_GATE_THRESHOLD = 2.0
+MOTION_GATE_SIGNATURE_SIZE = (32, 24)  # (width, height)
+MOTION_GATE_MAX_REUSED_RUN = 15
+
+# Temporal subsampling: run extraction on every EXTRACTION_STRIDE-th frame of a
+# capture (frames 0, N, 2N, ...). Skipped frames are not decoded; their rows
+# are linearly interpolated at finalize so T still equals the received frame
+# count, and the artifact records which rows were interpolated. 1 = off.
+EXTRACTION_STRIDE = 1
+
+# Compute landmark missingness masks and a quality summary at capture.close;
+# stored in the artifact and emitted as quality_summary on raw_features.ready.
+CAPTURE_QUALITY_STATS_ENABLED = True
+
+# Per-stage latency histograms (decode, detectors, finalize, ...) recorded per
+# process and read via service.get_latency_stats(). A span costs two
+# perf_counter calls and one bucket increment, so this stays on in production.
+LATENCY_INSTRUMENTATION_ENABLED = True
+
+# Also attach a per-capture stage summary (count / total / max ms per stage) to
+# the raw_features.ready event as latency_summary.
+LATENCY_CAPTURE_SUMMARY_ENABLED = False
+
+# ------------------------------------------------------------
+# Capture state lifecycle
+# ------------------------------------------------------------
+
+# An active capture that receives no frame for CAPTURE_IDLE_TTL_S is treated
+# as orphaned (terminal event lost, e.g. client crash or forwarder cancel) and
+# aborted, freeing its row buffer, staging file and backend lease.
+CAPTURE_IDLE_TTL_S = 120.0
+
+# Soft cap on the row buffers of all active captures (each preallocates
+# CAPTURE_MAX_FRAMES rows). A new capture that would exceed it first aborts the
+# least recently active captures.
+ACTIVE_CAPTURES_MAX_BYTES = 64 * 1024 * 1024
+
+# Terminal capture_ids are remembered for TERMINAL_CAPTURE_REPLAY_WINDOW_S so
+# late frames and duplicate terminal events are still rejected; at most
+# TERMINAL_CAPTURE_IDS_MAX ids are kept (oldest forgotten first).
+TERMINAL_CAPTURE_REPLAY_WINDOW_S = 600.0
+TERMINAL_CAPTURE_IDS_MAX = 10_000
+
 # ------------------------------------------------------------
 # Landmark selection contract
 # ------------------------------------------------------------
@@ -43,6 +163,19 @@ INCLUDE_RIGHT_HAND_LANDMARKS = True
 INCLUDE_FACE_LANDMARKS = True
 USE_REDUCED_FACE_SUBSET = True
 
+# Detector profiles: which MediaPipe detectors ("pose", "hand", "face") run for
+# a capture. The capture.open message selects one via detector_profile, which
+# is carried on each forwarded frame; None selects DEFAULT_DETECTOR_PROFILE.
+# Detectors outside the profile never run and their columns hold
+# MISSING_LANDMARK_PAIR, so D is unchanged. Non-default profiles are named in
+# the emitted encoding id.
+DETECTOR_PROFILES = {
+    "full": ("pose", "hand", "face"),
+    "pose_hands": ("pose", "hand"),
+    "hands_only": ("hand",),
+}
+DEFAULT_DETECTOR_PROFILE = "full"
+
 USE_FULL_POSE_LANDMARK_SET = True
 POSE_LANDMARK_COUNT = 33
 
@@ -147,15 +280,107 @@ FEATURE_DIM = LANDMARK_COUNT * FEATURE_COORDS_PER_LANDMARK
 # Encoding and artifact configuration
 # ------------------------------------------------------------
 
-# Identifier emitted in raw_features_ref.encoding
+# Identifier emitted in raw_features_ref.encoding (default detector profile;
+# other profiles append "+<profile>", see extractor.feature_encoding_id)
 FEATURE_ENCODING_ID = "mediapipe_tasks_video_xy_v1"
 
 # Artifact format
 FEATURE_ARTIFACT_FORMAT = "npz"
 
+# Name of the (T, D) feature matrix inside the npz archive
+FEATURE_ARTIFACT_ARRAY_KEY = "features"
+
+# (T,) bool member marking interpolated rows; written only when
+# EXTRACTION_STRIDE > 1 (absent means every row was extracted)
+FEATURE_ARTIFACT_INTERPOLATED_KEY = "interpolated"
+
+# Per-capture landmark quality members, computed at finalize when
+# CAPTURE_QUALITY_STATS_ENABLED (see extractor.compute_capture_quality):
+# - (T, R) bool: region entirely missing in the row
+# - (T,) float32: fraction of missing landmarks in the row
+# - (R,) str: region names of the missing_regions columns
+FEATURE_ARTIFACT_MISSING_REGIONS_KEY = "missing_regions"
+FEATURE_ARTIFACT_MISSING_FRACTION_KEY = "missing_fraction"
+FEATURE_ARTIFACT_REGION_NAMES_KEY = "region_names"
+
+# Per-row time axis members (see extractor.compute_frame_timing):
+# - (T,) int32: event-time offset of each row from the first row, in ms
+# - 0-d float64: frames per second from the median inter-row interval
+# - 0-d float64: standard deviation / maximum of the inter-row intervals, ms
+# Written whenever every row of the capture has a recorded timestamp_frame.
+FEATURE_ARTIFACT_FRAME_OFFSETS_KEY = "frame_offsets_ms"
+FEATURE_ARTIFACT_FPS_KEY = "fps_estimate"
+FEATURE_ARTIFACT_JITTER_KEY = "frame_jitter_ms"
+FEATURE_ARTIFACT_MAX_INTERVAL_KEY = "frame_interval_max_ms"
+
+# Root for persisted feature artifacts (default for dev/demo; tests must override
+# to tmp_path). Read at write time, not import time.
+FEATURE_DATA_ROOT = Path("data")
+
+# Where artifact bytes live:
+# - "capture_path":      one file per capture at the canonical capture path
+# - "content_addressed": one blob per distinct sha256 under
+#                        <FEATURE_DATA_ROOT>/blobs/sha256/<h[0:2]>/<h[2:4]>/;
+#                        raw_features_ref.uri is the blob path, so identical
+#                        matrices (e.g. retried captures) are stored once and
+#                        no file is created in the per-session directories.
+#                        Each capture holds a hard-linked ref under
+#                        <FEATURE_DATA_ROOT>/blobs/refs/ (fanned out by capture
+#                        id) that keeps its blob from GC. Needs
+#                        FEATURE_DATA_ROOT on one filesystem with hard links.
+FEATURE_ARTIFACT_STORE = "capture_path"
+
+# feature_store.collect_garbage() leaves unreferenced blobs younger than this
+# alone: a blob is published before its first capture ref is created.
+FEATURE_STORE_GC_MIN_AGE_S = 3600.0
+
+# npz member compression:
+# - "stored":  no compression (fastest write, largest file)
+# - "deflate": zlib-compressed members
+ARTIFACT_COMPRESSION = "stored"
+
+# Durability of artifact writes before the atomic rename:
+# - "none": rely on the OS page cache
+# - "file": fsync the temp file before it is renamed into place
+ARTIFACT_FSYNC_POLICY = "file"
+
+# Where capture rows are buffered before capture.close:
+# - "memory": in-process FeatureBuffer; close serializes and writes the npz
+# - "mmap":   rows are written straight into a memory-mapped staging npz next
+#             to the final artifact; close only patches headers, appends the
+#             zip trailer and renames (abort unlinks the staging file)
+ARTIFACT_STAGING_MODE = "memory"
+
 # Feature dtype used in stored matrix
 FEATURE_DTYPE = "float32"
 
+# On-disk encoding of the feature matrix (readers decode back to FEATURE_DTYPE
+# via feature_codec.load_feature_artifact):
+# - "float32":     FEATURE_DTYPE as buffered (no conversion)
+# - "float16":     half precision (~5e-4 resolution near 1.0)
+# - "int16":       fixed point, value = stored * FEATURE_INT16_SCALE
+# - "int16_delta": "int16" stored as row-to-row differences (first row
+#                  absolute), always deflate-compressed
+# Non-float32 encodings are named in raw_features_ref.encoding/dtype. "mmap"
+# staging writes FEATURE_DTYPE rows in place, so it only applies to "float32";
+# other encodings buffer in memory.
+FEATURE_STORAGE_ENCODINGS = ("float32", "float16", "int16", "int16_delta")
+FEATURE_STORAGE_ENCODING = "float32"
+
+# Fixed-point step of the int16 encodings: 2**-14 covers [-2, 2) (normalized
+# coordinates can leave [0, 1] slightly for off-frame landmarks) at ~6e-5.
+FEATURE_INT16_SCALE = 2.0**-14
+
+# npz members written next to the matrix for non-float32 encodings: the
+# encoding name (0-d str) and the int16 scale (0-d float64)
+FEATURE_ARTIFACT_STORAGE_KEY = "storage"
+FEATURE_ARTIFACT_SCALE_KEY = "scale"
+
+# Row capacity preallocated per capture buffer.
+# Matches the camera_feed_worker capture limit (15 fps x 15 s = 225 frames);
+# a capture never forwards more frames than this.
+CAPTURE_MAX_FRAMES = 225
+
 # ------------------------------------------------------------
 # Missing landmark encoding
 # ------------------------------------------------------------
@@ -2,13 +2,182 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import TypeAlias
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypeAlias
 from uuid import UUID
 
+import numpy as np
+
+from apps.landmark_extractor.config import (
+    CAPTURE_MAX_FRAMES,
+    DEFAULT_DETECTOR_PROFILE,
+    FEATURE_DIM,
+    FEATURE_DTYPE,
+)
+
+if TYPE_CHECKING:
+    from apps.landmark_extractor.artifact_writer import StagedFeatureArtifact
+    from apps.landmark_extractor.latency import StageTotals
+
 FeatureRow: TypeAlias = list[float]
 FeatureRows: TypeAlias = list[FeatureRow]
-FeatureMatrix: TypeAlias = FeatureRows
+
+# Finalized (T, D) matrix; a FEATURE_DTYPE ndarray view of a FeatureBuffer.
+FeatureMatrix: TypeAlias = np.ndarray
+
+
+class FeatureBuffer:
+    """
+    Preallocated row buffer for one capture.
+
+    Invariants:
+    - storage is allocated once as (capacity, dim) FEATURE_DTYPE
+    - append() copies one row into the next free slot in O(1)
+    - every stored row has exactly dim values
+    - view() returns the filled (T, dim) region without copying
+
+    storage may supply an existing (capacity, dim) array (e.g. a memory-mapped
+    artifact region) to append into instead of allocating one.
+    """
+
+    def __init__(
+        self,
+        capacity: int = CAPTURE_MAX_FRAMES,
+        dim: int = FEATURE_DIM,
+        dtype: str = FEATURE_DTYPE,
+        *,
+        storage: np.ndarray | None = None,
+    ) -> None:
+        if storage is None:
+            storage = np.empty((capacity, dim), dtype=dtype)
+        elif storage.ndim != 2:
+            raise ValueError(f"storage must be 2-D, got shape {storage.shape}")
+
+        self._data = storage
+        self._count = 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[float]],
+        capacity: int = CAPTURE_MAX_FRAMES,
+        dim: int = FEATURE_DIM,
+    ) -> FeatureBuffer:
+        """Build a buffer pre-filled with rows (in order)."""
+        buffer = cls(capacity=capacity, dim=dim)
+        for row in rows:
+            buffer.append(row)
+        return buffer
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of rows."""
+        return self._data.shape[0]
+
+    @property
+    def dim(self) -> int:
+        """Values per row."""
+        return self._data.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the preallocated storage (all capacity rows)."""
+        return self._data.nbytes
+
+    @property
+    def is_full(self) -> bool:
+        """True once capacity rows have been appended."""
+        return self._count == self._data.shape[0]
+
+    def append(self, row: Sequence[float] | np.ndarray) -> None:
+        """
+        Copy one row into the next free slot.
+
+        Raises:
+        - ValueError if the buffer is full or the row length is not dim
+        """
+        if self._count == self._data.shape[0]:
+            raise ValueError(f"Feature buffer full ({self.capacity} rows)")
+        if len(row) != self._data.shape[1]:
+            raise ValueError(
+                f"Feature row dimension mismatch: expected {self.dim}, got {len(row)}"
+            )
+
+        self._data[self._count] = row
+        self._count += 1
+
+    def repeat_last(self, step: int = 1) -> None:
+        """
+        Append a copy of the row `step` rows before the next free slot
+        (step=1: the last filled row).
+
+        Raises:
+        - ValueError if that row does not exist or the buffer is full
+        """
+        if not 1 <= step <= self._count:
+            raise ValueError(f"No row {step} back to repeat ({self._count} rows)")
+
+        self.append(self._data[self._count - step])
+
+    def freeze(self) -> None:
+        """Make the buffer read-only; later append() calls raise ValueError."""
+        self._data.setflags(write=False)
+
+    def view(self) -> np.ndarray:
+        """Return the filled rows as a zero-copy (T, dim) view."""
+        return self._data[: self._count]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class FrameTimeBuffer:
+    """
+    Preallocated per-row event-time buffer for one capture.
+
+    Invariants:
+    - origin is the timestamp_frame of the first appended row
+    - offsets are int32 milliseconds relative to origin, one per row, in row
+      order (negative if a frame's event time precedes the first frame)
+    - view() returns the filled (T,) region without copying
+    """
+
+    _INT32 = np.iinfo(np.int32)
+
+    def __init__(self, capacity: int = CAPTURE_MAX_FRAMES) -> None:
+        self._offsets_ms = np.empty(capacity, dtype=np.int32)
+        self._count = 0
+        self.origin: datetime | None = None
+
+    def append(self, timestamp_frame: datetime) -> None:
+        """
+        Record the event time of the next row.
+
+        Raises:
+        - ValueError if the buffer is full
+        """
+        if self._count == self._offsets_ms.shape[0]:
+            raise ValueError(
+                f"Frame time buffer full ({self._offsets_ms.shape[0]} rows)"
+            )
+
+        if self.origin is None:
+            self.origin = timestamp_frame
+
+        offset_ms = round((timestamp_frame - self.origin) / timedelta(milliseconds=1))
+        self._offsets_ms[self._count] = min(
+            max(offset_ms, self._INT32.min), self._INT32.max
+        )
+        self._count += 1
+
+    def view(self) -> np.ndarray:
+        """Return the recorded offsets as a zero-copy (T,) int32 view."""
+        return self._offsets_ms[: self._count]
+
+    def __len__(self) -> int:
+        return self._count
 
 
 @dataclass
@@ -18,16 +187,37 @@ class CaptureState:
 
     Invariants:
     - keyed by capture_id in the service layer
-    - stores extracted feature rows only
+    - stores extracted feature rows only, in a preallocated FeatureBuffer
     - never stores raw frames
     - rows are buffered in frame arrival order
     - seq is not stored or validated here
+    - staged_artifact is set only when rows are written straight into a
+      memory-mapped staging artifact (feature_rows then wraps its data region)
+    - motion_reference is a tiny grayscale thumbnail of the last extracted
+      frame (motion gate only), not a raw frame
+    - frames_extracted + frames_reused + len(skipped_rows) == len(feature_rows)
+    - skipped_rows holds the indices of stride-skipped placeholder rows, which
+      are filled by interpolation at finalize
+    - detector_profile is a DETECTOR_PROFILES key fixed by the first frame
+    - latency accumulates per-stage timings only when the per-capture latency
+      summary is enabled
+    - frame_times holds one event-time offset per row when every row came
+      through the frame handler
     """
 
     capture_id: UUID
     user_id: str
     session_id: str
-    feature_rows: FeatureRows = field(default_factory=list)
+    feature_rows: FeatureBuffer = field(default_factory=FeatureBuffer)
+    staged_artifact: StagedFeatureArtifact | None = None
+    frames_extracted: int = 0
+    frames_reused: int = 0
+    consecutive_reused: int = 0
+    motion_reference: np.ndarray | None = None
+    skipped_rows: list[int] = field(default_factory=list)
+    detector_profile: str = DEFAULT_DETECTOR_PROFILE
+    latency: StageTotals | None = None
+    frame_times: FrameTimeBuffer = field(default_factory=FrameTimeBuffer)
 
 
 @dataclass
@@ -36,13 +226,81 @@ class FinalizeResult:
     Pure internal finalization structure returned to the service layer, if needed.
 
     Represents the ordered buffered rows for one completed capture before
-    artifact writing and event construction.
+    artifact writing and event construction. interpolated_mask is set (T,)
+    bool only when stride-skipped rows were interpolated. quality is set when
+    capture quality statistics are enabled. frame_timing is set when every
+    row has a recorded event time.
     """
 
     capture_id: UUID
     user_id: str
     session_id: str
     feature_matrix: FeatureMatrix
+    interpolated_mask: np.ndarray | None = None
+    detector_profile: str = DEFAULT_DETECTOR_PROFILE
+    quality: CaptureQuality | None = None
+    frame_timing: FrameTiming | None = None
+
+
+@dataclass(frozen=True)
+class FrameTiming:
+    """
+    Time axis of one finalized capture.
+
+    Invariants:
+    - offsets_ms is (T,) int32, milliseconds since the first row's
+      timestamp_frame
+    - fps_estimate is 1000 / median inter-row interval (0.0 if undefined)
+    - jitter_ms is the standard deviation of the inter-row intervals
+    - max_interval_ms is the longest inter-row interval (largest gap)
+    """
+
+    offsets_ms: np.ndarray
+    fps_estimate: float
+    jitter_ms: float
+    max_interval_ms: float
+
+
+@dataclass(frozen=True)
+class CaptureQuality:
+    """
+    Landmark quality statistics of one finalized capture.
+
+    Invariants:
+    - region_names follows the feature layout's region order
+    - missing_regions is (T, len(region_names)) bool; True where every
+      landmark of the region is missing in that row
+    - missing_fraction is (T,) float32; share of missing landmarks per row
+    - summary is JSON-ready (per-capture aggregates of the arrays above)
+    """
+
+    region_names: tuple[str, ...]
+    missing_regions: np.ndarray
+    missing_fraction: np.ndarray
+    summary: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class CropBox:
+    """
+    Pixel region [x0, x1) x [y0, y1) of one frame.
+
+    Invariants:
+    - 0 <= x0 < x1 <= frame width, 0 <= y0 < y1 <= frame height
+    """
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
 
 
 LandmarkXY: TypeAlias = tuple[float, float]
@@ -67,3 +325,35 @@ class NormalizedLandmarks:
     left_hand: LandmarkMap = field(default_factory=dict)
     right_hand: LandmarkMap = field(default_factory=dict)
     face: LandmarkMap = field(default_factory=dict)
+
+
+@dataclass(frozen=True, eq=False)
+class RegionLayout:
+    """
+    Compiled feature-row columns for one landmark region.
+
+    Invariants:
+    - landmark_indices are MediaPipe landmark indices in feature order
+    - x_columns[i] / y_columns[i] are the row columns of landmark_indices[i]
+    """
+
+    region: str
+    landmark_indices: tuple[int, ...]
+    x_columns: np.ndarray
+    y_columns: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class FeatureLayout:
+    """
+    Feature row layout compiled once from ORDERED_LANDMARKS.
+
+    Invariants:
+    - regions appear in first-occurrence order of ORDERED_LANDMARKS
+    - missing_row has length feature_dim and holds MISSING_LANDMARK_PAIR in
+      every landmark slot
+    """
+
+    feature_dim: int
+    regions: tuple[RegionLayout, ...]
+    missing_row: np.ndarray
@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
 from apps.landmark_extractor.config import (
+    DEFAULT_DETECTOR_PROFILE,
+    FEATURE_COORDS_PER_LANDMARK,
     FEATURE_DIM,
+    FEATURE_DTYPE,
+    FEATURE_ENCODING_ID,
+    FEATURE_INT16_SCALE,
     MISSING_LANDMARK_PAIR,
     ORDERED_LANDMARKS,
 )
-from apps.landmark_extractor.domain import FeatureRow, LandmarkMap, NormalizedLandmarks
+from apps.landmark_extractor.domain import (
+    CaptureQuality,
+    FeatureLayout,
+    FeatureRow,
+    FrameTiming,
+    LandmarkMap,
+    NormalizedLandmarks,
+    RegionLayout,
+)
 
 
 def build_feature_row(landmarks: NormalizedLandmarks) -> FeatureRow:
@@ -75,3 +92,297 @@ def _missing_landmark_pair() -> tuple[float, float]:
     Return the configured missing-landmark fill pair.
     """
     return MISSING_LANDMARK_PAIR
+
+
+# ============================================================
+# Compiled layout (array path)
+# ============================================================
+
+
+def compile_feature_layout(
+    ordered_landmarks: Sequence[tuple[str, int]] = ORDERED_LANDMARKS,
+) -> FeatureLayout:
+    """
+    Compile the landmark ordering into per-region index and column arrays.
+
+    The compiled layout produces rows identical to build_feature_row but lets
+    callers gather only the configured landmarks of each region and write them
+    into a preallocated row with a few vectorized assignments.
+    """
+    region_order: list[str] = []
+    region_indices: dict[str, list[int]] = {}
+    region_columns: dict[str, list[int]] = {}
+
+    for position, (region, landmark_index) in enumerate(ordered_landmarks):
+        if region not in region_indices:
+            region_order.append(region)
+            region_indices[region] = []
+            region_columns[region] = []
+
+        region_indices[region].append(landmark_index)
+        region_columns[region].append(position * FEATURE_COORDS_PER_LANDMARK)
+
+    regions = []
+    for region in region_order:
+        x_columns = np.asarray(region_columns[region], dtype=np.intp)
+        regions.append(
+            RegionLayout(
+                region=region,
+                landmark_indices=tuple(region_indices[region]),
+                x_columns=x_columns,
+                y_columns=x_columns + 1,
+            )
+        )
+
+    feature_dim = len(ordered_landmarks) * FEATURE_COORDS_PER_LANDMARK
+    missing_row = np.tile(
+        np.asarray(MISSING_LANDMARK_PAIR, dtype=FEATURE_DTYPE),
+        len(ordered_landmarks),
+    )
+    missing_row.setflags(write=False)
+
+    return FeatureLayout(
+        feature_dim=feature_dim,
+        regions=tuple(regions),
+        missing_row=missing_row,
+    )
+
+
+FEATURE_LAYOUT = compile_feature_layout()
+"""
+Layout for the configured ORDERED_LANDMARKS; shared by all backends.
+"""
+
+
+def build_feature_row_array(
+    region_xy: Mapping[str, np.ndarray | None],
+    layout: FeatureLayout = FEATURE_LAYOUT,
+) -> np.ndarray:
+    """
+    Assemble one feature row from per-region gathered coordinates.
+
+    Contract:
+    - region_xy maps region → array of shape (len(landmark_indices), 2) holding
+      the (x, y) of each layout landmark in layout order
+    - NaN rows mark individual landmarks that were not returned
+    - a region that is absent or None is entirely missing
+    - missing landmarks are filled with MISSING_LANDMARK_PAIR
+    - output is a new FEATURE_DTYPE array of length layout.feature_dim, equal
+      element-wise to build_feature_row for the same landmarks
+    """
+    row = layout.missing_row.copy()
+
+    for region in layout.regions:
+        xy = region_xy.get(region.region)
+        if xy is None:
+            continue
+
+        present = ~np.isnan(xy).any(axis=1)
+        if present.all():
+            row[region.x_columns] = xy[:, 0]
+            row[region.y_columns] = xy[:, 1]
+        else:
+            row[region.x_columns[present]] = xy[present, 0]
+            row[region.y_columns[present]] = xy[present, 1]
+
+    return row
+
+
+def interpolate_skipped_rows(feature_matrix: np.ndarray, skipped: np.ndarray) -> None:
+    """
+    Fill skipped rows of a (T, D) feature matrix in place.
+
+    Contract:
+    - skipped is a (T,) bool mask; False rows were extracted and are kept
+    - each skipped row is linearly interpolated between the nearest extracted
+      rows before and after it (vectorized over all skipped rows)
+    - skipped rows after the last extracted row repeat that row
+    - where a landmark is missing (MISSING_LANDMARK_PAIR) in either neighbour,
+      the nearer neighbour's value is used instead of blending with the fill
+    - a matrix with no extracted rows is left unchanged
+    """
+    targets = np.flatnonzero(skipped)
+    extracted = np.flatnonzero(~skipped)
+    if targets.size == 0 or extracted.size == 0:
+        return
+
+    after = np.searchsorted(extracted, targets)
+    left = extracted[np.maximum(after - 1, 0)]
+    right = extracted[np.minimum(after, extracted.size - 1)]
+
+    span = right - left
+    weight = np.divide(
+        targets - left,
+        span,
+        out=np.zeros(targets.size, dtype=np.float64),
+        where=span != 0,
+    )[:, None]
+
+    before_rows = feature_matrix[left]
+    after_rows = feature_matrix[right]
+
+    blended = before_rows + (after_rows - before_rows) * weight
+    nearest = np.where(weight < 0.5, before_rows, after_rows)
+    missing = _missing_columns(before_rows) | _missing_columns(after_rows)
+
+    feature_matrix[targets] = np.where(missing, nearest, blended)
+
+
+def _missing_columns(rows: np.ndarray) -> np.ndarray:
+    """
+    Return a column mask that is True for both coordinates of missing landmarks.
+    """
+    missing = _missing_landmarks(rows)
+    return np.repeat(missing, FEATURE_COORDS_PER_LANDMARK, axis=1)
+
+
+def _missing_landmarks(rows: np.ndarray) -> np.ndarray:
+    """
+    Return a (T, landmarks) mask that is True where a landmark is missing.
+    """
+    pairs = rows.reshape(rows.shape[0], -1, FEATURE_COORDS_PER_LANDMARK)
+    return (pairs == np.asarray(MISSING_LANDMARK_PAIR, dtype=rows.dtype)).all(axis=2)
+
+
+# ============================================================
+# Capture quality
+# ============================================================
+
+
+def compute_capture_quality(
+    feature_matrix: np.ndarray,
+    interpolated_mask: np.ndarray | None = None,
+    layout: FeatureLayout = FEATURE_LAYOUT,
+) -> CaptureQuality:
+    """
+    Compute missingness masks and a quality summary for one (T, D) matrix.
+
+    Contract:
+    - feature_matrix has at least one row
+    - a landmark is missing where both coordinates equal MISSING_LANDMARK_PAIR
+    - a region is missing in a row when all of its landmarks are missing
+    - summary holds, rounded for logging:
+        - frames, interpolated_frames, empty_frames (every region missing)
+        - landmark_missing_fraction over the whole matrix
+        - per region: missing_fraction (share of rows) and longest_gap_frames
+          (longest run of consecutive rows with the region missing)
+    - computed with whole-matrix NumPy operations (no per-row Python loop)
+    """
+    missing_landmarks = _missing_landmarks(feature_matrix)
+    frames = missing_landmarks.shape[0]
+
+    region_names = tuple(region.region for region in layout.regions)
+    missing_regions = np.empty((frames, len(region_names)), dtype=bool)
+    for column, region in enumerate(layout.regions):
+        positions = region.x_columns // FEATURE_COORDS_PER_LANDMARK
+        missing_regions[:, column] = missing_landmarks[:, positions].all(axis=1)
+
+    missing_fraction = missing_landmarks.mean(axis=1, dtype=np.float64).astype(
+        np.float32
+    )
+
+    region_missing_share = missing_regions.mean(axis=0)
+    longest_gaps = _longest_true_runs(missing_regions)
+
+    summary = {
+        "frames": int(frames),
+        "interpolated_frames": (
+            int(np.count_nonzero(interpolated_mask))
+            if interpolated_mask is not None
+            else 0
+        ),
+        "empty_frames": int(np.count_nonzero(missing_regions.all(axis=1))),
+        "landmark_missing_fraction": round(float(missing_landmarks.mean()), 4),
+        "regions": {
+            name: {
+                "missing_fraction": round(float(region_missing_share[column]), 4),
+                "longest_gap_frames": int(longest_gaps[column]),
+            }
+            for column, name in enumerate(region_names)
+        },
+    }
+
+    return CaptureQuality(
+        region_names=region_names,
+        missing_regions=missing_regions,
+        missing_fraction=missing_fraction,
+        summary=summary,
+    )
+
+
+def compute_frame_timing(offsets_ms: np.ndarray) -> FrameTiming:
+    """
+    Derive the frame rate and jitter of a capture from its row offsets.
+
+    Contract:
+    - offsets_ms is the (T,) int32 row event-time offsets in row order
+    - intervals are the differences of consecutive offsets
+    - fps_estimate = 1000 / median interval, robust to isolated dropped or
+      late frames; 0.0 with fewer than two rows or a non-positive median
+    - jitter_ms / max_interval_ms are the std / max of the intervals (0.0
+      with fewer than two rows)
+    - offsets_ms is copied, so the result outlives the capture buffers
+    """
+    offsets = np.array(offsets_ms, dtype=np.int32)
+    intervals = np.diff(offsets.astype(np.int64))
+
+    if intervals.size == 0:
+        return FrameTiming(
+            offsets_ms=offsets, fps_estimate=0.0, jitter_ms=0.0, max_interval_ms=0.0
+        )
+
+    median = float(np.median(intervals))
+
+    return FrameTiming(
+        offsets_ms=offsets,
+        fps_estimate=1000.0 / median if median > 0 else 0.0,
+        jitter_ms=float(intervals.std()),
+        max_interval_ms=float(intervals.max()),
+    )
+
+
+def _longest_true_runs(mask: np.ndarray) -> np.ndarray:
+    """
+    Return the longest run of consecutive True rows of each column of a
+    (T, C) bool mask.
+    """
+    columns = mask.shape[1]
+    padded = np.zeros((columns, mask.shape[0] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T
+
+    edges = np.diff(padded, axis=1)
+    start_columns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    longest = np.zeros(columns, dtype=np.intp)
+    np.maximum.at(longest, start_columns, ends - starts)
+    return longest
+
+
+# ============================================================
+# Encoding identifier
+# ============================================================
+
+
+def feature_encoding_id(
+    detector_profile: str = DEFAULT_DETECTOR_PROFILE, storage: str = "float32"
+) -> str:
+    """
+    Return the raw_features_ref.encoding value for a detector profile and
+    artifact storage encoding.
+
+    The default profile keeps FEATURE_ENCODING_ID unchanged; any other profile
+    is appended as "+<profile>" so consumers can tell which regions were never
+    detected (their columns hold MISSING_LANDMARK_PAIR in every row).
+    A storage encoding other than "float32" is appended as ";storage=<name>"
+    (";scale=<step>" as well for the int16 encodings).
+    """
+    encoding_id = FEATURE_ENCODING_ID
+    if detector_profile != DEFAULT_DETECTOR_PROFILE:
+        encoding_id = f"{encoding_id}+{detector_profile}"
+
+    if storage == "float32":
+        return encoding_id
+    if storage == "float16":
+        return f"{encoding_id};storage={storage}"
+    return f"{encoding_id};storage={storage};scale={FEATURE_INT16_SCALE!r}"
@@ -0,0 +1,121 @@
+# apps/landmark_extractor/feature_codec.py
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+from apps.landmark_extractor.config import (
+    FEATURE_ARTIFACT_ARRAY_KEY,
+    FEATURE_ARTIFACT_SCALE_KEY,
+    FEATURE_ARTIFACT_STORAGE_KEY,
+    FEATURE_DTYPE,
+    FEATURE_INT16_SCALE,
+    FEATURE_STORAGE_ENCODINGS,
+)
+from apps.landmark_extractor.domain import FeatureMatrix
+
+_INT16_INFO = np.iinfo(np.int16)
+
+
+class FeatureCodecError(Exception):
+    """Raised for unknown storage encodings or malformed encoded artifacts."""
+
+
+def encode_feature_matrix(
+    feature_matrix: FeatureMatrix,
+    storage: str,
+    *,
+    scale: float = FEATURE_INT16_SCALE,
+) -> dict[str, np.ndarray]:
+    """
+    Return the npz members storing feature_matrix in the given encoding.
+
+    - "float32": {features: matrix} only, identical to pre-encoding artifacts
+    - otherwise: {features: encoded matrix, storage: name[, scale: step]}
+
+    int16 values are rounded to the nearest step and clipped to the int16
+    range. int16_delta differences wrap modulo 2**16, which the cumulative sum
+    in decode_feature_matrix undoes exactly.
+
+    Raises:
+    - FeatureCodecError for an unknown storage encoding or non-positive scale
+    """
+    if storage not in FEATURE_STORAGE_ENCODINGS:
+        raise FeatureCodecError(f"Unsupported feature storage encoding: {storage!r}")
+
+    matrix = np.asarray(feature_matrix, dtype=FEATURE_DTYPE)
+
+    if storage == "float32":
+        return {FEATURE_ARTIFACT_ARRAY_KEY: matrix}
+
+    arrays = {FEATURE_ARTIFACT_STORAGE_KEY: np.array(storage)}
+
+    if storage == "float16":
+        arrays[FEATURE_ARTIFACT_ARRAY_KEY] = matrix.astype(np.float16)
+        return arrays
+
+    if scale <= 0:
+        raise FeatureCodecError(f"int16 scale must be positive, got {scale!r}")
+
+    quantized = np.rint(matrix / np.float32(scale))
+    np.clip(quantized, _INT16_INFO.min, _INT16_INFO.max, out=quantized)
+    quantized = quantized.astype(np.int16)
+
+    if storage == "int16_delta" and len(quantized) > 1:
+        # In-place backwards so each row is diffed against its original
+        # predecessor; int16 subtraction wraps.
+        quantized[1:] -= quantized[:-1].copy()
+
+    arrays[FEATURE_ARTIFACT_ARRAY_KEY] = quantized
+    arrays[FEATURE_ARTIFACT_SCALE_KEY] = np.array(scale, dtype=np.float64)
+    return arrays
+
+
+def decode_feature_matrix(arrays: Mapping[str, np.ndarray]) -> FeatureMatrix:
+    """
+    Return the FEATURE_DTYPE (T, D) matrix stored in npz members.
+
+    Artifacts without a storage member are "float32" (all artifacts written
+    before the other encodings existed).
+
+    Raises:
+    - FeatureCodecError for an unknown encoding or missing members
+    """
+    try:
+        encoded = np.asarray(arrays[FEATURE_ARTIFACT_ARRAY_KEY])
+    except KeyError as exc:
+        raise FeatureCodecError("Artifact has no feature matrix member") from exc
+
+    storage = "float32"
+    if FEATURE_ARTIFACT_STORAGE_KEY in arrays:
+        storage = str(arrays[FEATURE_ARTIFACT_STORAGE_KEY])
+
+    if storage not in FEATURE_STORAGE_ENCODINGS:
+        raise FeatureCodecError(f"Unsupported feature storage encoding: {storage!r}")
+
+    if storage in ("float32", "float16"):
+        return encoded.astype(FEATURE_DTYPE)
+
+    try:
+        scale = float(arrays[FEATURE_ARTIFACT_SCALE_KEY])
+    except KeyError as exc:
+        raise FeatureCodecError(f"{storage} artifact has no scale member") from exc
+
+    if storage == "int16_delta":
+        encoded = np.cumsum(encoded, axis=0, dtype=np.int16)
+
+    return encoded.astype(FEATURE_DTYPE) * np.asarray(scale, dtype=FEATURE_DTYPE)
+
+
+def load_feature_artifact(artifact_path: str | Path) -> FeatureMatrix:
+    """
+    Read a persisted feature artifact and return its decoded matrix.
+
+    Works for every FEATURE_STORAGE_ENCODINGS variant, staged artifacts
+    included; extra members (e.g. interpolated) are ignored.
+    """
+    with np.load(artifact_path, allow_pickle=False) as archive:
+        return decode_feature_matrix(archive)
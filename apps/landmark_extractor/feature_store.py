@@ -0,0 +1,233 @@
+# apps/landmark_extractor/feature_store.py
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.paths import (
+    feature_blob_path,
+    feature_blob_root,
+    feature_ref_path,
+    feature_staging_root,
+)
+
+logger = logging.getLogger(__name__)
+
+_STORES = ("capture_path", "content_addressed")
+
+
+class FeatureStoreError(Exception):
+    """Raised for an invalid feature store configuration."""
+
+
+@dataclass(frozen=True)
+class GarbageCollectionResult:
+    """
+    Outcome of one collect_garbage() pass.
+    """
+
+    blobs_scanned: int
+    blobs_removed: int
+    bytes_freed: int
+
+
+def artifact_staging_dir(artifact_path: Path) -> Path:
+    """
+    Directory for the temp/staging file that will be published as artifact_path.
+
+    - "capture_path" store: the capture's own directory (same-directory
+      os.replace)
+    - "content_addressed" store: <FEATURE_DATA_ROOT>/blobs/staging, so the
+      per-session directory is never touched
+
+    The directory is not created here.
+    """
+    from apps.landmark_extractor.config import FEATURE_DATA_ROOT
+
+    if _store() == "capture_path":
+        return artifact_path.parent
+    return feature_staging_root(FEATURE_DATA_ROOT)
+
+
+def stored_artifact_path(artifact_path: Path, content_hash: str) -> Path:
+    """
+    Path readers use for an artifact published for artifact_path.
+
+    This is what raw_features_ref.uri points at: the capture path itself, or
+    the shared blob for content_hash with the content-addressed store.
+    """
+    from apps.landmark_extractor.config import FEATURE_DATA_ROOT
+
+    if _store() == "capture_path":
+        return artifact_path
+    return feature_blob_path(FEATURE_DATA_ROOT, content_hash)
+
+
+def publish_feature_artifact(
+    temp_path: Path, artifact_path: Path, content_hash: str
+) -> None:
+    """
+    Move a fully written (and fsynced) temp artifact to its final place.
+
+    - "capture_path" store: os.replace(temp_path, artifact_path)
+    - "content_addressed" store (artifact_path itself is not created):
+        - if the blob for content_hash exists, temp_path is dropped (dedup)
+        - otherwise temp_path is renamed onto the blob path
+        - the capture's ref (utils.paths.feature_ref_path, keyed by the
+          artifact_path stem, i.e. the capture id) is then atomically
+          replaced by a hard link to the blob
+
+    temp_path must come from artifact_staging_dir() (same filesystem as the
+    blobs); it is consumed on success.
+
+    Config (FEATURE_ARTIFACT_STORE, FEATURE_DATA_ROOT) is read at call time.
+
+    Raises:
+    - FeatureStoreError for an unknown FEATURE_ARTIFACT_STORE
+    - OSError from the filesystem (temp_path is left for the caller)
+    """
+    from apps.landmark_extractor.config import FEATURE_DATA_ROOT
+
+    if _store() == "capture_path":
+        os.replace(temp_path, artifact_path)
+        return
+
+    blob_path = feature_blob_path(FEATURE_DATA_ROOT, content_hash)
+    ref_path = feature_ref_path(FEATURE_DATA_ROOT, artifact_path.stem)
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    ref_path.parent.mkdir(parents=True, exist_ok=True)
+    link_path = temp_path.with_name(f"{temp_path.name}.link")
+
+    try:
+        try:
+            os.link(blob_path, link_path)
+        except FileNotFoundError:
+            os.replace(temp_path, blob_path)
+            os.link(blob_path, link_path)
+        else:
+            temp_path.unlink()
+
+        os.replace(link_path, ref_path)
+    except BaseException:
+        link_path.unlink(missing_ok=True)
+        raise
+
+    # A concurrent collect_garbage() may have dropped the blob name between
+    # its link-count check and our link; the ref still holds the bytes.
+    try:
+        os.link(ref_path, blob_path)
+    except FileExistsError:
+        pass
+
+
+def release_feature_artifact(artifact_path: Path, capture_id: Any | None) -> None:
+    """
+    Undo publish_feature_artifact for one capture.
+
+    A stored path under the blob root is shared with other captures, so only
+    the capture's ref is removed (nothing without a capture_id) and the blob
+    is left to collect_garbage(). Any other path is unlinked. Missing files
+    are not an error.
+    """
+    from apps.landmark_extractor.config import FEATURE_DATA_ROOT
+
+    if artifact_path.is_relative_to(feature_blob_root(FEATURE_DATA_ROOT)):
+        if capture_id is not None:
+            feature_ref_path(FEATURE_DATA_ROOT, capture_id).unlink(missing_ok=True)
+        return
+
+    artifact_path.unlink(missing_ok=True)
+
+
+def collect_garbage(
+    data_root: Path | None = None,
+    *,
+    min_age_s: float | None = None,
+    dry_run: bool = False,
+) -> GarbageCollectionResult:
+    """
+    Remove content-addressed blobs no capture ref links to any more.
+
+    A blob is unreferenced when its link count is 1 (only the blob name).
+    Blobs modified less than min_age_s ago are kept, since a blob is
+    published just before its first capture ref. Safe to run next to
+    writers: publish_feature_artifact restores a blob name removed while it
+    was linking a capture ref.
+
+    Defaults: data_root = FEATURE_DATA_ROOT,
+    min_age_s = FEATURE_STORE_GC_MIN_AGE_S (both read at call time).
+    """
+    from apps.landmark_extractor.config import (
+        FEATURE_DATA_ROOT,
+        FEATURE_STORE_GC_MIN_AGE_S,
+    )
+
+    root = feature_blob_root(FEATURE_DATA_ROOT if data_root is None else data_root)
+    cutoff = time.time() - (
+        FEATURE_STORE_GC_MIN_AGE_S if min_age_s is None else min_age_s
+    )
+
+    scanned = removed = freed = 0
+
+    for blob in _iter_blobs(root):
+        scanned += 1
+        try:
+            stat = blob.stat(follow_symlinks=False)
+            if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                os.unlink(blob.path)
+        except FileNotFoundError:
+            continue
+
+        removed += 1
+        freed += stat.st_size
+
+    logger.info(
+        "Feature store GC%s: %d of %d blobs unreferenced, %d bytes",
+        " (dry run)" if dry_run else "",
+        removed,
+        scanned,
+        freed,
+    )
+    return GarbageCollectionResult(
+        blobs_scanned=scanned, blobs_removed=removed, bytes_freed=freed
+    )
+
+
+def _store() -> str:
+    """Return FEATURE_ARTIFACT_STORE (read at call time), validated."""
+    from apps.landmark_extractor.config import FEATURE_ARTIFACT_STORE
+
+    if FEATURE_ARTIFACT_STORE not in _STORES:
+        raise FeatureStoreError(
+            f"Unsupported feature artifact store: {FEATURE_ARTIFACT_STORE!r}"
+        )
+    return FEATURE_ARTIFACT_STORE
+
+
+def _iter_blobs(root: Path) -> Iterator[os.DirEntry[str]]:
+    """Yield the DirEntry of every blob under the two fan-out levels."""
+    if not root.is_dir():
+        return
+
+    with os.scandir(root) as first_level:
+        for first in first_level:
+            if not first.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(first.path) as second_level:
+                for second in second_level:
+                    if not second.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(second.path) as blobs:
+                        for blob in blobs:
+                            if blob.name.endswith(".npz") and blob.is_file(
+                                follow_symlinks=False
+                            ):
+                                yield blob
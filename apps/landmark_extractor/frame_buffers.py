@@ -0,0 +1,82 @@
+# apps/landmark_extractor/frame_buffers.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from apps.landmark_extractor.config import FRAME_BUFFER_POOL_MAX_SIZES
+
+
+@dataclass(frozen=True)
+class FrameBufferPoolStats:
+    """
+    Point-in-time reuse metrics for one or more FrameBufferPools.
+    """
+
+    sizes: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of requests served by an existing buffer (0.0 if none)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FrameBufferPool:
+    """
+    Reusable uint8 (height, width, 3) image buffers keyed by (width, height).
+
+    Used as the `dst` of resize / color conversion so steady-state frames of a
+    capture allocate no new image memory.
+
+    Concurrency:
+    - not thread-safe; owned by one MediaPipeLandmarkBackend, which processes
+      one frame at a time
+    - a returned buffer is overwritten by the next request for the same size,
+      so callers must be done with it before preparing the next frame
+    """
+
+    def __init__(self, max_sizes: int = FRAME_BUFFER_POOL_MAX_SIZES) -> None:
+        if max_sizes < 1:
+            raise ValueError("max_sizes must be >= 1")
+
+        self._max_sizes = max_sizes
+        self._buffers: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, width: int, height: int) -> np.ndarray:
+        """
+        Return the buffer for (width, height), allocating it on first use.
+
+        The least recently used size is dropped once max_sizes is exceeded.
+        """
+        key = (width, height)
+        buffer = self._buffers.get(key)
+
+        if buffer is not None:
+            self._hits += 1
+            self._buffers.move_to_end(key)
+            return buffer
+
+        self._misses += 1
+        buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._buffers[key] = buffer
+
+        if len(self._buffers) > self._max_sizes:
+            self._buffers.popitem(last=False)
+
+        return buffer
+
+    def stats(self) -> FrameBufferPoolStats:
+        """Return current reuse metrics."""
+        return FrameBufferPoolStats(
+            sizes=len(self._buffers),
+            hits=self._hits,
+            misses=self._misses,
+        )
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import cv2
 import mediapipe as mp
+import numpy as np
 from mediapipe.tasks.python import BaseOptions
 from mediapipe.tasks.python.vision import (
     FaceLandmarker,
@@ -20,12 +22,42 @@ from mediapipe.tasks.python.vision import (
 )
 
 from apps.landmark_extractor.config import (
+    EXTRACTION_MAX_LONG_SIDE,
     FACE_MAX_NUM_FACES,
     HAND_MAX_NUM_HANDS,
+    MEDIAPIPE_CONCURRENT_DETECTORS,
+    MEDIAPIPE_DETECTOR_THREADS,
     MEDIAPIPE_RUNNING_MODE,
     POSE_MAX_RESULTS,
+    POSE_ROI_ENABLED,
+    POSE_ROI_FACE_MARGIN,
+    POSE_ROI_HAND_MARGIN,
+    POSE_ROI_MIN_VISIBILITY,
 )
-from apps.landmark_extractor.domain import LandmarkMap, NormalizedLandmarks
+from apps.landmark_extractor.domain import (
+    CropBox,
+    FeatureLayout,
+    LandmarkMap,
+    NormalizedLandmarks,
+)
+from apps.landmark_extractor.extractor import FEATURE_LAYOUT, build_feature_row_array
+from apps.landmark_extractor.frame_buffers import FrameBufferPool, FrameBufferPoolStats
+from apps.landmark_extractor.latency import LatencyRecorder
+from apps.landmark_extractor.pose_roi import (
+    POSE_FACE_ANCHORS,
+    POSE_HAND_ANCHORS,
+    pose_crop_box,
+)
+
+_INPUT_COLOR_ORDERS = ("bgr", "rgb")
+
+# Detector names accepted by begin_stream, in result order.
+DETECTOR_NAMES = ("pose", "hand", "face")
+
+# Detectors that run on pose-guided crops in ROI mode.
+_ROI_DETECTORS = ("hand", "face")
+
+_NO_LATENCY = LatencyRecorder(enabled=False)
 
 
 class MediaPipeBackendError(Exception):
@@ -46,8 +78,16 @@ class MediaPipeLandmarkBackend:
 
     Responsibilities:
     - initialize detectors once
-    - run detectors in VIDEO mode
-    - normalize outputs into module-internal landmark maps
+    - run detectors in VIDEO mode (hand/face in IMAGE mode under ROI mode)
+    - downscale / color-convert frames into reusable per-backend buffers
+    - optionally run the three detectors concurrently on a backend-owned pool
+    - optionally run hand/face detectors on pose-guided crops (ROI mode)
+    - run only the detectors selected for the current stream; skipped regions
+      come out as not detected
+    - time frame preparation, each detector and feature gathering into an
+      optional LatencyRecorder
+    - normalize outputs into module-internal landmark maps, or gather them
+      directly into a feature row via a compiled FeatureLayout
     - expose no raw MediaPipe result objects outside this file
     """
 
@@ -56,13 +96,39 @@ class MediaPipeLandmarkBackend:
         pose_model_path: str | Path,
         hand_model_path: str | Path,
         face_model_path: str | Path,
+        *,
+        concurrent_detectors: bool = MEDIAPIPE_CONCURRENT_DETECTORS,
+        max_long_side: int | None = EXTRACTION_MAX_LONG_SIDE,
+        input_color_order: str = "bgr",
+        pose_roi: bool = POSE_ROI_ENABLED,
+        latency: LatencyRecorder | None = None,
     ) -> None:
+        if max_long_side is not None and max_long_side <= 0:
+            raise ValueError("max_long_side must be positive or None")
+        if input_color_order not in _INPUT_COLOR_ORDERS:
+            raise ValueError(f"input_color_order must be one of {_INPUT_COLOR_ORDERS}")
+
+        self._max_long_side = max_long_side
+        self._input_is_rgb = input_color_order == "rgb"
+        self._pose_roi = pose_roi
+        self._image_mode_detectors = (
+            frozenset(_ROI_DETECTORS) if pose_roi else frozenset()
+        )
+        self._latency = latency or _NO_LATENCY
+        self._frame_buffers = FrameBufferPool()
         self._pose_model_path = Path(pose_model_path)
         self._hand_model_path = Path(hand_model_path)
         self._face_model_path = Path(face_model_path)
+        self._detector_executor: ThreadPoolExecutor | None = None
+        self._last_timestamp_ms = -1
+        self._stream_offset_ms: int | None = None
+        self._active_detectors = frozenset(DETECTOR_NAMES)
 
         try:
             running_mode = getattr(RunningMode, str(MEDIAPIPE_RUNNING_MODE).upper())
+            # ROI crops move every frame; VIDEO-mode hand/face tracking would
+            # carry its ROI over in the previous crop's coordinates.
+            roi_running_mode = RunningMode.IMAGE if pose_roi else running_mode
 
             pose_options = PoseLandmarkerOptions(
                 base_options=BaseOptions(model_asset_path=str(self._pose_model_path)),
@@ -72,13 +138,13 @@ class MediaPipeLandmarkBackend:
 
             hand_options = HandLandmarkerOptions(
                 base_options=BaseOptions(model_asset_path=str(self._hand_model_path)),
-                running_mode=running_mode,
+                running_mode=roi_running_mode,
                 num_hands=HAND_MAX_NUM_HANDS,
             )
 
             face_options = FaceLandmarkerOptions(
                 base_options=BaseOptions(model_asset_path=str(self._face_model_path)),
-                running_mode=running_mode,
+                running_mode=roi_running_mode,
                 num_faces=FACE_MAX_NUM_FACES,
             )
 
@@ -91,6 +157,85 @@ class MediaPipeLandmarkBackend:
                 "Failed to initialize MediaPipe Tasks landmark detectors."
             ) from exc
 
+        if concurrent_detectors:
+            self._detector_executor = ThreadPoolExecutor(
+                max_workers=MEDIAPIPE_DETECTOR_THREADS,
+                thread_name_prefix="mediapipe-detector",
+            )
+
+    @property
+    def concurrent_detectors(self) -> bool:
+        """
+        True if detectors run in parallel on the backend-owned thread pool.
+        """
+        return self._detector_executor is not None
+
+    def frame_buffer_stats(self) -> FrameBufferPoolStats:
+        """Return reuse metrics of this backend's frame buffer pool."""
+        return self._frame_buffers.stats()
+
+    def warmup(self) -> None:
+        """
+        Run one blank frame through every detector.
+
+        Forces MediaPipe graph and delegate initialization now instead of on a
+        capture's first frame. Consumes one VIDEO-mode timestamp; the next
+        stream is shifted after it as usual (see begin_stream).
+        """
+        side = self._max_long_side or 640
+        frame = np.zeros((side * 3 // 4, side, 3), dtype=np.uint8)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+
+        self._last_timestamp_ms += 1
+        self._run_detectors(
+            mp_image, self._last_timestamp_ms, frozenset(DETECTOR_NAMES)
+        )
+
+    @property
+    def active_detectors(self) -> frozenset[str]:
+        """Names of the detectors run for frames of the current stream."""
+        return self._active_detectors
+
+    def begin_stream(self, detectors: Iterable[str] | None = None) -> None:
+        """
+        Mark the start of a new frame stream (one capture) on this backend.
+
+        VIDEO-mode detectors require strictly increasing timestamps for their
+        whole lifetime. A pooled backend is reused across captures whose client
+        clocks may differ, so each stream is shifted to start after the last
+        timestamp this backend has seen while keeping in-stream frame spacing.
+
+        Args:
+            detectors:
+                Subset of DETECTOR_NAMES to run for this stream (None = all).
+                Skipped detectors are never invoked; their landmarks are
+                reported as not detected.
+        """
+        active = frozenset(DETECTOR_NAMES if detectors is None else detectors)
+        unknown = active - frozenset(DETECTOR_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown detectors: {sorted(unknown)}")
+
+        self._active_detectors = active
+        self._stream_offset_ms = None
+
+    def close(self) -> None:
+        """
+        Release the detector thread pool and the underlying MediaPipe detectors.
+        """
+        if self._detector_executor is not None:
+            self._detector_executor.shutdown(wait=True)
+            self._detector_executor = None
+
+        for detector in (
+            self._pose_landmarker,
+            self._hand_landmarker,
+            self._face_landmarker,
+        ):
+            close = getattr(detector, "close", None)
+            if close is not None:
+                close()
+
     def extract_landmarks(
         self,
         frame: Any,
@@ -101,24 +246,16 @@ class MediaPipeLandmarkBackend:
 
         Args:
             frame:
-                Decoded BGR image frame.
+                Decoded image frame in the backend's input color order
+                (BGR unless constructed with input_color_order="rgb").
             timestamp_frame:
                 Frame timestamp used to derive MediaPipe VIDEO-mode timestamp_ms.
 
         Returns:
             NormalizedLandmarks containing normalized (x, y) only.
         """
-        if frame is None:
-            raise MediaPipeExtractionError("frame must not be None")
-
         try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-            timestamp_ms = self._to_timestamp_ms(timestamp_frame)
-
-            pose_result = self._pose_landmarker.detect_for_video(mp_image, timestamp_ms)
-            hand_result = self._hand_landmarker.detect_for_video(mp_image, timestamp_ms)
-            face_result = self._face_landmarker.detect_for_video(mp_image, timestamp_ms)
+            pose_result, hand_result, face_result = self._detect(frame, timestamp_frame)
 
             pose_landmarks = self._extract_pose_landmarks(pose_result)
             left_hand_landmarks, right_hand_landmarks = self._extract_hand_landmarks(
@@ -139,6 +276,254 @@ class MediaPipeLandmarkBackend:
                 "Failed to extract landmarks from frame."
             ) from exc
 
+    def extract_feature_row(
+        self,
+        frame: Any,
+        timestamp_frame: datetime,
+        layout: FeatureLayout = FEATURE_LAYOUT,
+    ) -> np.ndarray:
+        """
+        Run detectors on one decoded frame and return its feature row directly.
+
+        Only the landmarks named by the layout are read from the MediaPipe
+        results; no intermediate landmark maps are built. The row is equal to
+        build_feature_row(self.extract_landmarks(...)) cast to FEATURE_DTYPE.
+
+        Returns:
+            Array of shape (layout.feature_dim,) with dtype FEATURE_DTYPE.
+        """
+        try:
+            pose_result, hand_result, face_result = self._detect(frame, timestamp_frame)
+
+            left_hand, right_hand = self._select_hand_landmark_lists(hand_result)
+            region_lists = {
+                "pose": self._first_landmark_list(pose_result, "pose_landmarks"),
+                "left_hand": left_hand,
+                "right_hand": right_hand,
+                "face": self._first_landmark_list(face_result, "face_landmarks"),
+            }
+
+            with self._latency.span("gather_features"):
+                region_xy = {
+                    region.region: self._gather_xy(
+                        region_lists.get(region.region), region.landmark_indices
+                    )
+                    for region in layout.regions
+                }
+
+                return build_feature_row_array(region_xy, layout)
+        except MediaPipeBackendError:
+            raise
+        except Exception as exc:
+            raise MediaPipeExtractionError(
+                "Failed to extract landmarks from frame."
+            ) from exc
+
+    def _detect(self, frame: Any, timestamp_frame: datetime) -> tuple[Any, Any, Any]:
+        """
+        Downscale and convert one frame, then run the active detectors on it.
+
+        Returns raw (pose, hand, face) results, None for a skipped detector;
+        callers must not let them escape this module.
+        """
+        if frame is None:
+            raise MediaPipeExtractionError("frame must not be None")
+
+        with self._latency.span("prepare_rgb"):
+            rgb_frame = self._prepare_rgb_frame(frame)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        timestamp_ms = self._to_timestamp_ms(timestamp_frame)
+
+        if self._pose_roi:
+            return self._run_detectors_with_pose_roi(rgb_frame, mp_image, timestamp_ms)
+
+        return self._run_detectors(mp_image, timestamp_ms, self._active_detectors)
+
+    def _prepare_rgb_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Return the RGB frame handed to the detectors.
+
+        Frames whose longest side exceeds max_long_side are shrunk with one
+        aspect-preserving INTER_AREA resize into a pooled buffer; BGR input is
+        then converted in place, so the conversion only touches the reduced
+        pixels. RGB input at target size is passed through untouched.
+
+        The returned array may be a pooled buffer that the next frame reuses.
+        """
+        height, width = frame.shape[:2]
+        long_side = max(height, width)
+
+        if self._max_long_side is not None and long_side > self._max_long_side:
+            scale = self._max_long_side / long_side
+            width = max(1, round(width * scale))
+            height = max(1, round(height * scale))
+            rgb_frame = cv2.resize(
+                frame,
+                (width, height),
+                dst=self._frame_buffers.get(width, height),
+                interpolation=cv2.INTER_AREA,
+            )
+            if not self._input_is_rgb:
+                cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            return rgb_frame
+
+        if self._input_is_rgb:
+            return frame
+
+        return cv2.cvtColor(
+            frame, cv2.COLOR_BGR2RGB, dst=self._frame_buffers.get(width, height)
+        )
+
+    def _run_detectors(
+        self, mp_image: Any, timestamp_ms: int, detectors: frozenset[str]
+    ) -> tuple[Any, Any, Any]:
+        """
+        Run the named detectors on one mp.Image.
+
+        Returns (pose, hand, face) results with None for detectors not named.
+        """
+        names = [name for name in DETECTOR_NAMES if name in detectors]
+        results = self._run_detector_jobs(
+            [(name, mp_image) for name in names], timestamp_ms
+        )
+        by_name = dict(zip(names, results))
+
+        return by_name.get("pose"), by_name.get("hand"), by_name.get("face")
+
+    def _run_detector_jobs(
+        self, jobs: list[tuple[Any, Any]], timestamp_ms: int
+    ) -> list[Any]:
+        """
+        Run (detector name, image) jobs and return their results in job order.
+
+        Sequential by default. In concurrent mode the jobs are submitted to the
+        backend-owned pool and all of them are awaited before any result or
+        error is surfaced, so no detector is ever still running when the next
+        frame is submitted.
+        """
+        if self._detector_executor is None or len(jobs) < 2:
+            return [self._detect_one(name, image, timestamp_ms) for name, image in jobs]
+
+        futures = [
+            self._detector_executor.submit(self._detect_one, name, image, timestamp_ms)
+            for name, image in jobs
+        ]
+        wait(futures)
+
+        return [future.result() for future in futures]
+
+    def _detect_one(self, name: str, image: Any, timestamp_ms: int) -> Any:
+        """Run one named detector on image, timed as "detect_<name>"."""
+        landmarker = self._landmarker(name)
+        with self._latency.span(f"detect_{name}"):
+            if name in self._image_mode_detectors:
+                return landmarker.detect(image)
+            return landmarker.detect_for_video(image, timestamp_ms)
+
+    def _landmarker(self, name: str) -> Any:
+        """Return the detector registered under one of DETECTOR_NAMES."""
+        return getattr(self, f"_{name}_landmarker")
+
+    def _run_detectors_with_pose_roi(
+        self, rgb_frame: np.ndarray, mp_image: Any, timestamp_ms: int
+    ) -> tuple[Any, Any, Any]:
+        """
+        Run pose on the full frame, then hand and face on pose-guided crops.
+
+        Each of hand/face falls back to the full frame independently when no
+        crop is available (including when pose is not an active detector).
+        Hand and face run in IMAGE mode here: every frame is detected from
+        scratch, since cross-frame tracking cannot follow a moving crop.
+        Crop-local landmarks in the returned results are rewritten to
+        full-frame normalized coordinates. Hand and face run concurrently when
+        the backend-owned pool exists.
+        """
+        active = self._active_detectors
+        pose_result = None
+        if "pose" in active:
+            pose_result = self._detect_one("pose", mp_image, timestamp_ms)
+
+        height, width = rgb_frame.shape[:2]
+        pose_xy = self._pose_anchor_xy(pose_result)
+
+        crops: dict[str, CropBox | None] = {"hand": None, "face": None}
+        if pose_xy is not None:
+            crops["hand"] = pose_crop_box(
+                pose_xy, POSE_HAND_ANCHORS, POSE_ROI_HAND_MARGIN, width, height
+            )
+            crops["face"] = pose_crop_box(
+                pose_xy, POSE_FACE_ANCHORS, POSE_ROI_FACE_MARGIN, width, height
+            )
+
+        names = [name for name in _ROI_DETECTORS if name in active]
+        jobs = [
+            (
+                name,
+                (self._crop_image(rgb_frame, crops[name]) if crops[name] else mp_image),
+            )
+            for name in names
+        ]
+        results = dict(zip(names, self._run_detector_jobs(jobs, timestamp_ms)))
+        hand_result, face_result = results.get("hand"), results.get("face")
+
+        if crops["hand"] is not None:
+            self._remap_to_frame(
+                getattr(hand_result, "hand_landmarks", None),
+                crops["hand"],
+                width,
+                height,
+            )
+        if crops["face"] is not None:
+            self._remap_to_frame(
+                getattr(face_result, "face_landmarks", None),
+                crops["face"],
+                width,
+                height,
+            )
+
+        return pose_result, hand_result, face_result
+
+    def _pose_anchor_xy(self, pose_result: Any) -> np.ndarray | None:
+        """
+        Return (N, 2) normalized pose (x, y) for ROI anchoring, or None.
+
+        Landmarks below POSE_ROI_MIN_VISIBILITY are NaN.
+        """
+        landmarks = self._first_landmark_list(pose_result, "pose_landmarks")
+        if not landmarks:
+            return None
+
+        xy = np.full((len(landmarks), 2), np.nan, dtype=np.float32)
+        for index, landmark in enumerate(landmarks):
+            visibility = getattr(landmark, "visibility", None)
+            if visibility is not None and visibility < POSE_ROI_MIN_VISIBILITY:
+                continue
+            xy[index] = (landmark.x, landmark.y)
+
+        return xy
+
+    def _crop_image(self, rgb_frame: np.ndarray, crop: CropBox) -> Any:
+        """
+        Wrap one crop of the RGB frame as an mp.Image.
+        """
+        region = rgb_frame[crop.y0 : crop.y1, crop.x0 : crop.x1]
+        return mp.Image(
+            image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(region)
+        )
+
+    def _remap_to_frame(
+        self, landmark_sets: Any, crop: CropBox, width: int, height: int
+    ) -> None:
+        """
+        Rewrite crop-local normalized landmarks to full-frame normalized (x, y).
+
+        Mutates the result objects in place; they never leave this module.
+        """
+        for landmarks in landmark_sets or []:
+            for landmark in landmarks:
+                landmark.x = (crop.x0 + landmark.x * crop.width) / width
+                landmark.y = (crop.y0 + landmark.y * crop.height) / height
+
     def _get_running_mode(self) -> Any:
         """
         Resolve configured running mode to MediaPipe enum.
@@ -156,13 +541,24 @@ class MediaPipeLandmarkBackend:
     def _to_timestamp_ms(self, timestamp_frame: datetime) -> int:
         """
         Convert frame timestamp to integer milliseconds for VIDEO mode.
+
+        Guarantees strictly increasing values per backend (see begin_stream).
         """
         if not isinstance(timestamp_frame, datetime):
             raise MediaPipeExtractionError(
                 "timestamp_frame must be a datetime instance"
             )
 
-        return int(timestamp_frame.timestamp() * 1000)
+        timestamp_ms = int(timestamp_frame.timestamp() * 1000)
+
+        if self._stream_offset_ms is None:
+            self._stream_offset_ms = max(0, self._last_timestamp_ms + 1 - timestamp_ms)
+
+        timestamp_ms = max(
+            timestamp_ms + self._stream_offset_ms, self._last_timestamp_ms + 1
+        )
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
 
     def _extract_pose_landmarks(self, pose_result: Any) -> LandmarkMap:
         """
@@ -180,23 +576,68 @@ class MediaPipeLandmarkBackend:
         """
         Resolve hand outputs into left/right maps using handedness classification.
         """
-        left_hand: LandmarkMap = {}
-        right_hand: LandmarkMap = {}
+        left_hand, right_hand = self._select_hand_landmark_lists(hand_result)
+
+        return (
+            self._landmark_list_to_map(left_hand) if left_hand else {},
+            self._landmark_list_to_map(right_hand) if right_hand else {},
+        )
+
+    def _select_hand_landmark_lists(self, hand_result: Any) -> tuple[Any, Any]:
+        """
+        Resolve raw hand landmark lists into (left, right) by handedness.
+
+        A hand side with no detection is None. Later detections of the same
+        side replace earlier ones.
+        """
+        left_hand = None
+        right_hand = None
 
         hand_landmark_sets = getattr(hand_result, "hand_landmarks", None) or []
         handedness_sets = getattr(hand_result, "handedness", None) or []
 
         for index, landmarks in enumerate(hand_landmark_sets):
             handedness_label = self._resolve_handedness_label(handedness_sets, index)
-            landmark_map = self._landmark_list_to_map(landmarks)
 
             if handedness_label == "left":
-                left_hand = landmark_map
+                left_hand = landmarks
             elif handedness_label == "right":
-                right_hand = landmark_map
+                right_hand = landmarks
 
         return left_hand, right_hand
 
+    def _first_landmark_list(self, result: Any, attribute: str) -> Any:
+        """
+        Return the first detected landmark list of a pose/face result, or None.
+        """
+        landmark_sets = getattr(result, attribute, None)
+        if not landmark_sets:
+            return None
+        return landmark_sets[0]
+
+    def _gather_xy(
+        self, landmarks: Any, landmark_indices: tuple[int, ...]
+    ) -> np.ndarray | None:
+        """
+        Gather (x, y) of the requested landmark indices into an (N, 2) array.
+
+        Returns None when the region was not detected. Indices beyond the
+        returned landmark list are NaN.
+        """
+        if not landmarks:
+            return None
+
+        count = len(landmarks)
+        xy = np.full((len(landmark_indices), 2), np.nan, dtype=np.float32)
+
+        for row, landmark_index in enumerate(landmark_indices):
+            if landmark_index < count:
+                landmark = landmarks[landmark_index]
+                xy[row, 0] = landmark.x
+                xy[row, 1] = landmark.y
+
+        return xy
+
     def _extract_face_landmarks(self, face_result: Any) -> LandmarkMap:
         """
         Extract first detected face into a normalized landmark map.
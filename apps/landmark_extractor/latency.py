@@ -0,0 +1,218 @@
+# apps/landmark_extractor/latency.py
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+
+# Log-spaced histogram bucket upper bounds (seconds): 1 µs to ~134 s with
+# 8 buckets per doubling (~9% relative resolution).
+_BUCKETS_PER_DOUBLING = 8
+_BUCKET_BOUNDS_S = tuple(
+    1e-6 * 2 ** (i / _BUCKETS_PER_DOUBLING)
+    for i in range(27 * _BUCKETS_PER_DOUBLING + 1)
+)
+
+
+@dataclass(frozen=True)
+class StageLatencyStats:
+    """
+    Point-in-time latency distribution of one pipeline stage.
+
+    Percentiles are histogram bucket upper bounds (capped at max_ms).
+    """
+
+    stage: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with O(log buckets) record().
+
+    Concurrency:
+    - not thread-safe; LatencyRecorder serializes access
+    """
+
+    __slots__ = ("_counts", "_count", "_total_s", "_max_s")
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BUCKET_BOUNDS_S) + 1)
+        self._count = 0
+        self._total_s = 0.0
+        self._max_s = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration in seconds."""
+        self._counts[bisect_left(_BUCKET_BOUNDS_S, seconds)] += 1
+        self._count += 1
+        self._total_s += seconds
+        if seconds > self._max_s:
+            self._max_s = seconds
+
+    def quantile(self, q: float) -> float:
+        """Return the q-quantile in seconds (0.0 if empty)."""
+        if self._count == 0:
+            return 0.0
+
+        target = max(1, math.ceil(q * self._count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index == len(_BUCKET_BOUNDS_S):
+                    return self._max_s
+                return min(_BUCKET_BOUNDS_S[index], self._max_s)
+
+        return self._max_s
+
+    def stats(self, stage: str) -> StageLatencyStats:
+        """Return the current distribution as StageLatencyStats."""
+        return StageLatencyStats(
+            stage=stage,
+            count=self._count,
+            mean_ms=(self._total_s / self._count * 1000.0) if self._count else 0.0,
+            p50_ms=self.quantile(0.50) * 1000.0,
+            p95_ms=self.quantile(0.95) * 1000.0,
+            p99_ms=self.quantile(0.99) * 1000.0,
+            max_ms=self._max_s * 1000.0,
+        )
+
+
+class StageTotals:
+    """
+    Per-stage count / total / max for one capture (no percentiles).
+
+    Concurrency:
+    - not thread-safe; a capture's frames are processed one at a time
+    """
+
+    __slots__ = ("_totals",)
+
+    def __init__(self) -> None:
+        self._totals: dict[str, list[float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add one duration in seconds to stage."""
+        totals = self._totals.get(stage)
+        if totals is None:
+            self._totals[stage] = [1, seconds, seconds]
+            return
+
+        totals[0] += 1
+        totals[1] += seconds
+        if seconds > totals[2]:
+            totals[2] = seconds
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return {stage: {"count", "total_ms", "max_ms"}} (JSON-ready)."""
+        return {
+            stage: {
+                "count": int(count),
+                "total_ms": round(total_s * 1000.0, 3),
+                "max_ms": round(max_s * 1000.0, 3),
+            }
+            for stage, (count, total_s, max_s) in self._totals.items()
+        }
+
+
+class _Span:
+    """Context manager timing one stage into a LatencyRecorder."""
+
+    __slots__ = ("_recorder", "_stage", "_totals", "_start")
+
+    def __init__(
+        self, recorder: LatencyRecorder, stage: str, totals: StageTotals | None
+    ) -> None:
+        self._recorder = recorder
+        self._stage = stage
+        self._totals = totals
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        self._recorder.record(self._stage, elapsed)
+        if self._totals is not None:
+            self._totals.add(self._stage, elapsed)
+
+
+class _NullSpan:
+    """No-op span used when instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyRecorder:
+    """
+    Per-process latency histograms keyed by stage name.
+
+    Usage:
+        with recorder.span("decode", state.latency):
+            ...
+
+    A span records its duration into the stage histogram and, if given, into
+    a per-capture StageTotals. Spans are recorded even if the block raises.
+    A disabled recorder hands out a shared no-op span.
+
+    Concurrency:
+    - thread-safe
+    """
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def span(self, stage: str, totals: StageTotals | None = None) -> _Span | _NullSpan:
+        """Return a context manager timing one execution of stage."""
+        if not self._enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, totals)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one duration in seconds to the stage histogram."""
+        if not self._enabled:
+            return
+
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def stats(self) -> dict[str, StageLatencyStats]:
+        """Return current per-stage distributions, keyed by stage."""
+        with self._lock:
+            return {
+                stage: histogram.stats(stage)
+                for stage, histogram in self._histograms.items()
+            }
+
+    def reset(self) -> None:
+        """Drop all recorded durations."""
+        with self._lock:
+            self._histograms.clear()
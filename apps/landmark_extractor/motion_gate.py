@@ -0,0 +1,29 @@
+# apps/landmark_extractor/motion_gate.py
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from apps.landmark_extractor.config import MOTION_GATE_SIGNATURE_SIZE
+
+
+def motion_signature(
+    frame: np.ndarray,
+    size: tuple[int, int] = MOTION_GATE_SIGNATURE_SIZE,
+) -> np.ndarray:
+    """
+    Return a (height, width) uint8 grayscale thumbnail of an RGB frame.
+
+    Used by the motion gate to compare frames cheaply; INTER_AREA averages
+    each cell, which also suppresses sensor noise.
+    """
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+
+def motion_score(reference: np.ndarray, signature: np.ndarray) -> float:
+    """
+    Return the mean absolute difference between two signatures (0-255).
+    """
+    return float(cv2.absdiff(reference, signature).mean())
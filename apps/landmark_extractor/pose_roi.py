@@ -0,0 +1,75 @@
+# apps/landmark_extractor/pose_roi.py
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from apps.landmark_extractor.config import POSE_ROI_MAX_AREA_FRACTION
+from apps.landmark_extractor.domain import CropBox
+
+# MediaPipe pose landmark indices used as crop anchors.
+POSE_HAND_ANCHORS = (15, 16, 17, 18, 19, 20, 21, 22)  # wrists, pinky, index, thumb
+POSE_FACE_ANCHORS = tuple(range(11))  # nose, eyes, ears, mouth
+POSE_SHOULDERS = (11, 12)
+
+
+def pose_crop_box(
+    pose_xy: np.ndarray,
+    anchors: tuple[int, ...],
+    margin: float,
+    width: int,
+    height: int,
+    *,
+    max_area_fraction: float = POSE_ROI_MAX_AREA_FRACTION,
+) -> CropBox | None:
+    """
+    Return a crop around the visible pose anchors, or None for full frame.
+
+    Args:
+        pose_xy:
+            (33, 2) normalized pose (x, y); NaN rows are not visible.
+        anchors:
+            pose landmark indices the crop must contain.
+        margin:
+            padding on every side, in multiples of the shoulder width.
+
+    Returns None when no anchor is visible or the padded crop would cover
+    max_area_fraction of the frame or more.
+    """
+    points = pose_xy[list(anchors)]
+    points = points[~np.isnan(points).any(axis=1)]
+    if len(points) == 0:
+        return None
+
+    pixels = points * (width, height)
+    pad = margin * _body_scale(pose_xy, width, height)
+
+    x0 = max(0, math.floor(pixels[:, 0].min() - pad))
+    y0 = max(0, math.floor(pixels[:, 1].min() - pad))
+    x1 = min(width, math.ceil(pixels[:, 0].max() + pad))
+    y1 = min(height, math.ceil(pixels[:, 1].max() + pad))
+
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    if (x1 - x0) * (y1 - y0) >= max_area_fraction * width * height:
+        return None
+
+    return CropBox(x0=x0, y0=y0, x1=x1, y1=y1)
+
+
+def _body_scale(pose_xy: np.ndarray, width: int, height: int) -> float:
+    """
+    Return the shoulder width in pixels, floored at 10% of the short side.
+
+    Falls back to a quarter of the short side when a shoulder is not visible.
+    """
+    short_side = min(width, height)
+    shoulders = pose_xy[list(POSE_SHOULDERS)]
+
+    if np.isnan(shoulders).any():
+        return 0.25 * short_side
+
+    dx, dy = (shoulders[0] - shoulders[1]) * (width, height)
+    return max(math.hypot(dx, dy), 0.1 * short_side)
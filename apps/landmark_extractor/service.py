@@ -3,8 +3,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import binascii
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID, uuid4
 
@@ -14,30 +21,92 @@ import numpy as np
 from apps.landmark_extractor.artifact_writer import (
     ArtifactWriteResult,
     delete_feature_artifact,
+    discard_staged_artifact,
+    seal_feature_artifact,
+    stage_feature_artifact,
     write_feature_artifact,
 )
+from apps.landmark_extractor.backend_pool import (
+    BackendPoolStats,
+    MediaPipeBackendLeaseTimeout,
+    MediaPipeBackendPool,
+)
+from apps.landmark_extractor.capture_registry import (
+    ActiveCaptureRegistry,
+    TerminalCaptureIds,
+)
 from apps.landmark_extractor.config import (
+    ACTIVE_CAPTURES_MAX_BYTES,
+    ARTIFACT_STAGING_MODE,
+    BACKEND_LEASE_TIMEOUT_S,
+    BACKEND_POOL_SIZE,
+    CAPTURE_IDLE_TTL_S,
+    CAPTURE_MAX_FRAMES,
+    CAPTURE_QUALITY_STATS_ENABLED,
+    DEFAULT_DETECTOR_PROFILE,
+    DETECTOR_PROFILES,
+    EXTRACTION_EXECUTION_MODE,
+    EXTRACTION_MAX_LONG_SIDE,
+    EXTRACTION_STRIDE,
     FACE_LANDMARKER_MODEL_PATH,
+    FEATURE_ARTIFACT_FPS_KEY,
+    FEATURE_ARTIFACT_FRAME_OFFSETS_KEY,
+    FEATURE_ARTIFACT_INTERPOLATED_KEY,
+    FEATURE_ARTIFACT_JITTER_KEY,
+    FEATURE_ARTIFACT_MAX_INTERVAL_KEY,
+    FEATURE_ARTIFACT_MISSING_FRACTION_KEY,
+    FEATURE_ARTIFACT_MISSING_REGIONS_KEY,
+    FEATURE_ARTIFACT_REGION_NAMES_KEY,
     FEATURE_DIM,
-    FEATURE_ENCODING_ID,
+    FEATURE_DTYPE,
+    FEATURE_STORAGE_ENCODING,
+    FINALIZE_MAX_WORKERS,
+    FRAME_PIPELINE_MAX_WORKERS,
     HAND_LANDMARKER_MODEL_PATH,
+    LATENCY_CAPTURE_SUMMARY_ENABLED,
+    LATENCY_INSTRUMENTATION_ENABLED,
+    MOTION_GATE_ENABLED,
+    MOTION_GATE_MAX_REUSED_RUN,
+    MOTION_GATE_THRESHOLD,
     POSE_LANDMARKER_MODEL_PATH,
+    PROCESS_POOL_WORKERS,
+    TERMINAL_CAPTURE_IDS_MAX,
+    TERMINAL_CAPTURE_REPLAY_WINDOW_S,
 )
 from apps.landmark_extractor.domain import CaptureState, FeatureMatrix, FinalizeResult
-from apps.landmark_extractor.extractor import build_feature_row
+from apps.landmark_extractor.extractor import (
+    compute_capture_quality,
+    compute_frame_timing,
+    feature_encoding_id,
+    interpolate_skipped_rows,
+)
+from apps.landmark_extractor.frame_buffers import FrameBufferPoolStats
 from apps.landmark_extractor.landmark_mediapipe import (
     MediaPipeExtractionError,
     MediaPipeLandmarkBackend,
 )
+from apps.landmark_extractor.latency import (
+    LatencyRecorder,
+    StageLatencyStats,
+    StageTotals,
+)
+from apps.landmark_extractor.motion_gate import motion_score, motion_signature
+from apps.landmark_extractor.worker_pool import (
+    CaptureAffinityProcessPool,
+    LandmarkWorkerCrashedError,
+)
 from apps.schema_recorder.service import append_event
 from schemas import (
     A3CPMessage,
+    LandmarkExtractorFrameBytesInput,
     LandmarkExtractorFrameInput,
     LandmarkExtractorInput,
     LandmarkExtractorTerminalInput,
     RawFeaturesRef,
 )
 
+logger = logging.getLogger(__name__)
+
 # ============================================================
 # Exceptions
 # ============================================================
@@ -59,30 +128,120 @@ class LandmarkExtractorFinalizeError(LandmarkExtractorServiceError):
 # Module-local state
 # ============================================================
 
-_ACTIVE_CAPTURES: dict[UUID, CaptureState] = {}
+_ACTIVE_CAPTURES = ActiveCaptureRegistry(
+    idle_ttl_s=CAPTURE_IDLE_TTL_S,
+    max_bytes=ACTIVE_CAPTURES_MAX_BYTES,
+)
 """
-Active bounded captures keyed by capture_id.
+Active bounded captures keyed by capture_id, ordered by last frame. Idle and
+over-budget captures are aborted by _evict_stale_captures.
 """
 
-_TERMINAL_CAPTURE_IDS: set[UUID] = set()
+_TERMINAL_CAPTURE_IDS = TerminalCaptureIds(
+    replay_window_s=TERMINAL_CAPTURE_REPLAY_WINDOW_S,
+    max_size=TERMINAL_CAPTURE_IDS_MAX,
+)
 """
 Tracks captures that have already received a terminal event
-(capture.close or capture.abort) to reject later frames/terminals.
+(capture.close or capture.abort) to reject later frames/terminals within the
+replay window.
+"""
+
+_NEW_CAPTURE_BYTES = CAPTURE_MAX_FRAMES * FEATURE_DIM * np.dtype(FEATURE_DTYPE).itemsize
+"""
+Row buffer bytes preallocated by each new capture.
+"""
+
+_LATENCY = LatencyRecorder(enabled=LATENCY_INSTRUMENTATION_ENABLED)
+"""
+Per-stage latency histograms of this process (frame, detector and finalize
+stages); shared with the backends this process creates.
+"""
+
+
+def _create_backend() -> MediaPipeLandmarkBackend:
+    """Construct one MediaPipe backend from the configured model paths."""
+    return MediaPipeLandmarkBackend(
+        pose_model_path=POSE_LANDMARKER_MODEL_PATH,
+        hand_model_path=HAND_LANDMARKER_MODEL_PATH,
+        face_model_path=FACE_LANDMARKER_MODEL_PATH,
+        input_color_order="rgb",
+        latency=_LATENCY,
+    )
+
+
+_BACKEND_POOL: MediaPipeBackendPool | None = None
+"""
+Pre-initialized backends, constructed on first use (or by warmup()), not at
+import time. Backend initialization failure surfaces at that first use.
+"""
+
+_BACKEND_POOL_LOCK = threading.Lock()
+"""
+Serializes construction of _BACKEND_POOL across frame worker threads.
 """
 
-_BACKEND = MediaPipeLandmarkBackend(
-    pose_model_path=POSE_LANDMARKER_MODEL_PATH,
-    hand_model_path=HAND_LANDMARKER_MODEL_PATH,
-    face_model_path=FACE_LANDMARKER_MODEL_PATH,
+_CAPTURE_BACKENDS: dict[UUID, MediaPipeLandmarkBackend] = {}
+"""
+Backends currently leased by active captures, keyed by capture_id.
+"""
+
+_FRAME_EXECUTOR = ThreadPoolExecutor(
+    max_workers=FRAME_PIPELINE_MAX_WORKERS,
+    thread_name_prefix="landmark-frame",
 )
 """
-Initialized once at module import time and reused across frames.
-Backend initialization failure surfaces immediately at import time.
+Worker threads running _handle_frame off the asyncio event loop.
 """
 
-# ============================================================
-# Public entrypoint
-# ============================================================
+_FINALIZE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=FINALIZE_MAX_WORKERS,
+    thread_name_prefix="landmark-finalize",
+)
+"""
+Worker threads running _handle_close (blocking artifact and JSONL IO) off the
+asyncio event loop.
+"""
+
+_FRAME_EVENTS = ("capture.frame", "capture.frame_bytes")
+"""
+Events carrying one frame payload (base64 text or binary).
+"""
+
+_SKIPPED_ROW = np.full(FEATURE_DIM, np.nan, dtype=FEATURE_DTYPE)
+"""
+Placeholder appended for stride-skipped frames until finalize interpolation.
+"""
+
+_PROCESS_POOL: CaptureAffinityProcessPool | None = None
+"""
+Worker processes used when EXTRACTION_EXECUTION_MODE == "process".
+Created on first use so worker processes importing this module never start
+pools of their own.
+"""
+
+_IN_WORKER_PROCESS = False
+"""
+True inside a _PROCESS_POOL worker (set by _init_worker_process).
+"""
+
+_CAPTURE_ORDER_LOCKS: dict[UUID, asyncio.Lock] = {}
+"""
+Per-capture FIFO locks. Every message for a capture_id is handled under its
+lock, so feature rows are appended in arrival order and terminal events run
+only after all previously received frames have been processed.
+"""
+
+_PENDING_ABORTS: dict[UUID, int] = {}
+"""
+Captures whose capture.abort has been received but not yet handled, mapped to
+the number of their frames dropped before inference in the meantime.
+"""
+
+_FRAMES_SKIPPED_ON_ABORT = 0
+"""
+Total frames dropped because their capture was being aborted.
+"""
 
 # ============================================================
 # Public entrypoint
@@ -97,48 +256,311 @@ async def handle_message(message: LandmarkExtractorInput) -> None:
     - Accept validated LandmarkExtractorInput forwarded by ingest_boundary
     - Dispatch by message.event to the appropriate handler
     - Enforce service-level event routing
+    - Keep strict arrival order per capture_id
 
     Dispatch targets:
     - capture.frame  → _handle_frame(message: LandmarkExtractorFrameInput)
+                       (runs on the frame executor, off the event loop)
+    - capture.frame_bytes → _handle_frame(message: LandmarkExtractorFrameBytesInput)
+                       (same as capture.frame, binary payload)
     - capture.close  → _handle_close(message: LandmarkExtractorTerminalInput)
+                       (runs on the finalize executor, off the event loop)
     - capture.abort  → _handle_abort(message: LandmarkExtractorTerminalInput)
+                       (via _abort_in_capture_order)
+
+    In "process" execution mode every event is forwarded to the worker process
+    owning the capture, which runs the same handlers there.
+
+    A capture.abort is observed on arrival: frames of that capture still
+    queued behind it are dropped without decoding or inference.
     """
 
-    if message.event == "capture.frame":
-        _handle_frame(message)
+    if message.event == "capture.abort":
+        await _abort_in_capture_order(message)
+        return
+
+    if EXTRACTION_EXECUTION_MODE == "process" and message.event in (
+        *_FRAME_EVENTS,
+        "capture.close",
+    ):
+        await _run_in_capture_order(
+            message.capture_id, _submit_to_worker_process, message
+        )
         return
 
-    if message.event == "capture.close":
-        _handle_close(message)
+    if message.event in _FRAME_EVENTS:
+        _evict_stale_captures(message.capture_id)
+        await _run_in_capture_order(
+            message.capture_id, _handle_frame, message, executor=_FRAME_EXECUTOR
+        )
         return
 
-    if message.event == "capture.abort":
-        _handle_abort(message)
+    if message.event == "capture.close":
+        await _run_in_capture_order(
+            message.capture_id, _handle_close, message, executor=_FINALIZE_EXECUTOR
+        )
         return
 
     raise LandmarkExtractorServiceError(f"Unsupported event: {message.event}")
 
 
+def get_frames_skipped_on_abort() -> int:
+    """Return the number of frames dropped before inference by capture.abort."""
+    return _FRAMES_SKIPPED_ON_ABORT
+
+
+def get_latency_stats() -> dict[str, StageLatencyStats]:
+    """
+    Return per-stage latency percentiles recorded in this process.
+
+    In "process" execution mode frames and finalize run in the worker
+    processes, so their stages are recorded there, not here.
+    """
+    return _LATENCY.stats()
+
+
+def reset_latency_stats() -> None:
+    """Drop all latency samples recorded in this process."""
+    _LATENCY.reset()
+
+
+async def _abort_in_capture_order(message: LandmarkExtractorTerminalInput) -> None:
+    """
+    Run capture.abort in capture order, dropping the capture's pending frames.
+
+    - registers the abort before waiting for the capture lock, so frames queued
+      ahead of it (and an in-flight frame not yet at inference) are skipped
+    - if every frame of the capture was skipped, no capture state was ever
+      created; the abort then only marks the capture terminal
+    - reports the number of skipped frames once the abort has run
+    """
+    global _FRAMES_SKIPPED_ON_ABORT
+
+    capture_id = message.capture_id
+    handler = (
+        _submit_to_worker_process
+        if EXTRACTION_EXECUTION_MODE == "process"
+        else _handle_abort
+    )
+
+    _PENDING_ABORTS.setdefault(capture_id, 0)
+    try:
+        await _run_in_capture_order(capture_id, handler, message)
+    except LandmarkExtractorServiceError:
+        if not _PENDING_ABORTS.get(capture_id) or capture_id in _TERMINAL_CAPTURE_IDS:
+            raise
+        _mark_terminal(capture_id)
+        _CAPTURE_ORDER_LOCKS.pop(capture_id, None)
+    finally:
+        skipped = _PENDING_ABORTS.pop(capture_id, 0)
+
+    if skipped:
+        _FRAMES_SKIPPED_ON_ABORT += skipped
+        logger.info(
+            "Aborted capture %s: %d pending frames skipped before inference",
+            capture_id,
+            skipped,
+        )
+
+
+def _skip_for_pending_abort(capture_id: UUID) -> bool:
+    """Return True (and count the frame) if capture_id is being aborted."""
+    if capture_id not in _PENDING_ABORTS:
+        return False
+
+    _PENDING_ABORTS[capture_id] += 1
+    return True
+
+
+async def _run_in_capture_order(
+    capture_id: UUID,
+    handler: Callable[[LandmarkExtractorInput], None],
+    message: LandmarkExtractorInput,
+    *,
+    executor: Executor | None = None,
+) -> None:
+    """
+    Run one handler under the capture's FIFO lock.
+
+    - with an executor the handler runs there and the lock is held until its
+      future completes, so the event loop keeps serving other connections
+      while a frame is processed or a capture is finalized
+    - async handlers are awaited directly
+    - frames of a capture with a pending abort are dropped without running
+      the handler
+    - the per-capture lock is dropped once the capture is terminal
+    """
+    lock = _CAPTURE_ORDER_LOCKS.setdefault(capture_id, asyncio.Lock())
+
+    try:
+        async with lock:
+            if message.event in _FRAME_EVENTS and _skip_for_pending_abort(capture_id):
+                return
+
+            if executor is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(executor, handler, message)
+            else:
+                result = handler(message)
+                if asyncio.iscoroutine(result):
+                    await result
+    finally:
+        if capture_id in _TERMINAL_CAPTURE_IDS:
+            _CAPTURE_ORDER_LOCKS.pop(capture_id, None)
+
+
+# ============================================================
+# Process execution mode
+# ============================================================
+
+
+def _get_process_pool() -> CaptureAffinityProcessPool:
+    """Return the worker process pool, creating it on first use."""
+    global _PROCESS_POOL
+
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = CaptureAffinityProcessPool(
+            workers=PROCESS_POOL_WORKERS, initializer=_init_worker_process
+        )
+    return _PROCESS_POOL
+
+
+def _init_worker_process() -> None:
+    """Worker-process initializer: mark this process as a pool worker."""
+    global _IN_WORKER_PROCESS
+    _IN_WORKER_PROCESS = True
+
+
+@dataclass(frozen=True)
+class _WorkerResult:
+    """
+    Outcome of one _handle_message_in_worker call, returned to the main process.
+
+    evicted_capture_ids lists captures the worker aborted on its own (idle TTL
+    or memory cap); error is the service error raised by the handler, if any.
+    """
+
+    evicted_capture_ids: tuple[UUID, ...] = ()
+    error: LandmarkExtractorServiceError | None = None
+
+
+async def _submit_to_worker_process(message: LandmarkExtractorInput) -> None:
+    """
+    Run one message in the worker process that owns its capture_id.
+
+    Worker-side service exceptions propagate unchanged. Terminal events are
+    mirrored into this process's terminal set so later frames are rejected
+    without a round trip to the worker; so are captures the worker evicted.
+
+    If the worker process dies while the capture is open, its buffered rows
+    are gone: the capture is marked terminal here and a frame or close raises
+    LandmarkExtractorFrameError / LandmarkExtractorFinalizeError (an abort
+    has nothing left to discard and succeeds).
+    """
+    capture_id = message.capture_id
+
+    _reject_if_terminal(capture_id)
+
+    if message.event == "capture.frame_bytes" and isinstance(
+        message.frame_bytes, memoryview
+    ):
+        # memoryviews cannot be pickled across the process boundary
+        message = message.model_copy(update={"frame_bytes": bytes(message.frame_bytes)})
+
+    pool = _get_process_pool()
+
+    try:
+        future = pool.submit(capture_id, _handle_message_in_worker, message)
+        result = await asyncio.wrap_future(future)
+    except (BrokenProcessPool, LandmarkWorkerCrashedError) as exc:
+        pool.forget(capture_id)
+        _mark_terminal(capture_id)
+
+        if message.event == "capture.abort":
+            return
+        if message.event == "capture.close":
+            raise LandmarkExtractorFinalizeError(
+                f"Worker process crashed; capture {capture_id} lost"
+            ) from exc
+        raise LandmarkExtractorFrameError(
+            f"Worker process crashed; capture {capture_id} lost"
+        ) from exc
+
+    for evicted_id in result.evicted_capture_ids:
+        pool.forget(evicted_id)
+        _mark_terminal(evicted_id)
+        lock = _CAPTURE_ORDER_LOCKS.get(evicted_id)
+        if lock is not None and not lock.locked():
+            del _CAPTURE_ORDER_LOCKS[evicted_id]
+
+    if result.error is not None:
+        raise result.error
+
+    if message.event in ("capture.close", "capture.abort"):
+        pool.forget(capture_id)
+        _mark_terminal(capture_id)
+
+
+def _handle_message_in_worker(message: LandmarkExtractorInput) -> _WorkerResult:
+    """
+    Worker-process entrypoint: run the matching handler synchronously.
+
+    Executes against the worker's own capture state and backend pool.
+    Service errors are returned rather than raised, so the captures evicted
+    before the handler ran always reach the main process.
+    """
+    evicted: list[UUID] = []
+
+    try:
+        if message.event in _FRAME_EVENTS:
+            evicted = _evict_stale_captures(message.capture_id)
+            _handle_frame(message)
+        elif message.event == "capture.close":
+            _handle_close(message)
+        elif message.event == "capture.abort":
+            _handle_abort(message)
+        else:
+            raise LandmarkExtractorServiceError(f"Unsupported event: {message.event}")
+    except LandmarkExtractorServiceError as exc:
+        return _WorkerResult(evicted_capture_ids=tuple(evicted), error=exc)
+
+    return _WorkerResult(evicted_capture_ids=tuple(evicted))
+
+
 # ============================================================
 # Event handlers
 # ============================================================
 
 
-def _handle_frame(message: LandmarkExtractorFrameInput) -> None:
+def _handle_frame(
+    message: LandmarkExtractorFrameInput | LandmarkExtractorFrameBytesInput,
+) -> None:
     """
     Handle one validated capture.frame message.
 
+    Runs on a _FRAME_EXECUTOR worker thread when dispatched by handle_message.
+
     Steps:
     - reject frame ingest if capture_id is already terminal
     - resolve or create capture state for capture_id
-    - initialize new capture state from capture_id, user_id, session_id
-    - decode frame_data → image frame
-    - call backend.extract_landmarks(...)
-    - pass returned NormalizedLandmarks to build_feature_row(...)
-    - append exactly one feature row to state.feature_rows
+    - initialize new capture state from capture_id, user_id, session_id and
+      detector_profile
+    - if EXTRACTION_STRIDE > 1 and this frame is off-stride, append a
+      placeholder row (filled by interpolation at finalize) without decoding
+    - decode frame_data (base64) or frame_bytes (binary) → image frame
+    - if a capture.abort for the capture arrived meanwhile, stop here (no
+      inference, no row)
+    - if the motion gate is enabled and the frame is near-static relative to
+      the last extracted frame, repeat the last extracted feature row
+    - otherwise lease a backend for the capture on its first frame (held until
+      terminal, running only the capture's profile detectors) and call
+      backend.extract_feature_row(...)
+    - append exactly one feature row to state.feature_rows and count it as
+      extracted or reused, and record its timestamp_frame in state.frame_times
 
     Failure behavior:
-    - if frame decoding or landmark extraction fails:
+    - if the capture buffer is already full or sealed, or frame decoding,
+      backend lease, landmark extraction or the row append fails:
         - raise LandmarkExtractorFrameError
         - append no feature row
         - preserve existing capture state
@@ -149,35 +571,87 @@ def _handle_frame(message: LandmarkExtractorFrameInput) -> None:
 
     state = _get_or_create_capture_state(message)
 
+    if state.feature_rows.is_full:
+        raise LandmarkExtractorFrameError(
+            f"Capture buffer full ({state.feature_rows.capacity} rows): {capture_id}"
+        )
+
+    totals = state.latency
+    row_index = len(state.feature_rows)
+
     try:
-        frame = _decode_frame_data(message.frame_data)
-        landmarks = _BACKEND.extract_landmarks(frame, message.timestamp_frame)
-        feature_row = build_feature_row(landmarks)
+        if EXTRACTION_STRIDE > 1 and row_index % EXTRACTION_STRIDE:
+            state.feature_rows.append(_SKIPPED_ROW)
+            state.skipped_rows.append(row_index)
+            state.frame_times.append(message.timestamp_frame)
+            return
+
+        with _LATENCY.span("decode", totals):
+            frame = _decode_frame_payload(message)
+
+        signature = None
+        if MOTION_GATE_ENABLED:
+            with _LATENCY.span("motion_signature", totals):
+                signature = motion_signature(frame)
+
+        if _skip_for_pending_abort(capture_id):
+            return
+
+        if signature is not None and _is_static_frame(state, signature):
+            feature_row = None
+        else:
+            with _LATENCY.span("backend_lease", totals):
+                backend = _lease_backend(capture_id)
+            with _LATENCY.span("extract", totals):
+                feature_row = backend.extract_feature_row(
+                    frame, message.timestamp_frame
+                )
+
+        # Buffer appends raise ValueError once the buffer is full or frozen
+        # (staged artifact sealed), e.g. for a late or duplicate frame.
+        if feature_row is None:
+            state.feature_rows.repeat_last(EXTRACTION_STRIDE)
+        else:
+            state.feature_rows.append(feature_row)
     except (MediaPipeExtractionError, LandmarkExtractorFrameError) as exc:
         raise LandmarkExtractorFrameError(str(exc)) from exc
     except Exception as exc:
         raise LandmarkExtractorFrameError("Frame processing failed") from exc
 
-    state.feature_rows.append(feature_row)
+    state.frame_times.append(message.timestamp_frame)
+
+    if feature_row is None:
+        state.frames_reused += 1
+        state.consecutive_reused += 1
+        return
+
+    state.frames_extracted += 1
+    state.consecutive_reused = 0
+    state.motion_reference = signature
 
 
 def _handle_close(message: LandmarkExtractorTerminalInput) -> None:
     """
     Handle one validated capture.close message.
 
+    Runs on a _FINALIZE_EXECUTOR worker thread when dispatched by
+    handle_message, under the capture's order lock (after all earlier frames).
+
     Steps:
     - require event == "capture.close"
     - reject if capture_id is already terminal
     - resolve active capture state for capture_id
     - require buffered feature rows > 0
     - convert buffered rows into feature matrix (T, D)
-    - write artifact via write_feature_artifact(...)
+    - write artifact via write_feature_artifact(...), or seal the staging file
     - build derived A3CPMessage with raw_features_ref
         - event = "raw_features.ready"
         - preserve user_id, session_id, capture_id from capture state
     - append event via schema_recorder.append_event(...)
     - clear active capture state only after full finalize success
     - mark capture_id as terminal only after full finalize success
+    - return the capture's leased backend to the pool only after full
+      finalize success (no more frames expected)
 
     Commit-unit behavior:
     - artifact write occurs first
@@ -189,6 +663,7 @@ def _handle_close(message: LandmarkExtractorTerminalInput) -> None:
         - artifact write failure
         - feature-ref message construction failure
         - schema_recorder.append_event(...) failure
+    - the capture stays open and keeps its leased backend
     - if event append fails:
         - delete artifact via delete_feature_artifact(...)
         - preserve active capture state (do not clear)
@@ -200,29 +675,29 @@ def _handle_close(message: LandmarkExtractorTerminalInput) -> None:
     _reject_if_terminal(capture_id)
 
     state = _get_active_capture_state(capture_id)
+    totals = state.latency
 
     try:
-        _ensure_non_empty_feature_rows(state)
+        with _LATENCY.span("finalize_build", totals):
+            _ensure_non_empty_feature_rows(state)
 
-        finalize_result = _build_finalize_result(state)
+            finalize_result = _build_finalize_result(state)
 
-        _ensure_feature_matrix_shape(finalize_result.feature_matrix)
+            _ensure_feature_matrix_shape(finalize_result.feature_matrix)
 
-        artifact_result = write_feature_artifact(
-            user_id=finalize_result.user_id,
-            session_id=finalize_result.session_id,
-            capture_id=finalize_result.capture_id,
-            feature_matrix=finalize_result.feature_matrix,
-        )
+        with _LATENCY.span("artifact_write", totals):
+            artifact_result = _persist_feature_artifact(state, finalize_result)
 
         feature_ref_message = _build_feature_ref_message(
             finalize_result=finalize_result,
             artifact_result=artifact_result,
             timestamp_end=message.timestamp_end,
             schema_version=message.schema_version,
+            latency_summary=totals.as_dict() if totals is not None else None,
         )
 
-        _append_feature_ref_event(feature_ref_message)
+        with _LATENCY.span("event_append"):
+            _append_feature_ref_event(feature_ref_message)
 
     except Exception as exc:
         if "artifact_result" in locals():
@@ -234,6 +709,7 @@ def _handle_close(message: LandmarkExtractorTerminalInput) -> None:
 
     _clear_active_capture_state(capture_id)
     _mark_terminal(capture_id)
+    _release_backend(capture_id)
 
 
 def _handle_abort(message: LandmarkExtractorTerminalInput) -> None:
@@ -244,13 +720,14 @@ def _handle_abort(message: LandmarkExtractorTerminalInput) -> None:
     - require event == "capture.abort"
     - reject if capture_id is already terminal
     - resolve active capture state for capture_id
-    - discard buffered feature rows
+    - discard buffered feature rows (unlink the staging file in "mmap" mode)
     - write no artifact
     - emit no event
 
     Success behavior:
     - mark capture_id as terminal
     - clear active capture state
+    - return the capture's leased backend to the pool
 
     Failure behavior:
     - unknown capture_id raises service-level failure
@@ -260,8 +737,12 @@ def _handle_abort(message: LandmarkExtractorTerminalInput) -> None:
 
     _ensure_abort_message(message)
     _reject_if_terminal(capture_id)
-    _get_active_capture_state(capture_id)
+    state = _get_active_capture_state(capture_id)
 
+    if state.staged_artifact is not None:
+        discard_staged_artifact(state.staged_artifact)
+
+    _release_backend(capture_id)
     _clear_active_capture_state(capture_id)
     _mark_terminal(capture_id)
 
@@ -271,19 +752,58 @@ def _handle_abort(message: LandmarkExtractorTerminalInput) -> None:
 # ============================================================
 
 
-def _get_or_create_capture_state(message: LandmarkExtractorFrameInput) -> CaptureState:
-    """Return existing CaptureState or create one on first frame for the capture_id."""
+def _get_or_create_capture_state(
+    message: LandmarkExtractorFrameInput | LandmarkExtractorFrameBytesInput,
+) -> CaptureState:
+    """
+    Return existing CaptureState or create one on first frame for the capture_id.
+
+    The first frame fixes the capture's detector profile. In "mmap" staging
+    mode (float32 storage only) the new state buffers rows in a staging
+    artifact.
+
+    Raises:
+    - LandmarkExtractorFrameError for an unknown detector_profile
+    """
     capture_id = message.capture_id
 
     state = _ACTIVE_CAPTURES.get(capture_id)
     if state is not None:
+        _ACTIVE_CAPTURES.touch(capture_id)
         return state
 
-    state = CaptureState(
-        capture_id=capture_id,
-        user_id=message.user_id,
-        session_id=message.session_id,
-    )
+    detector_profile = _resolve_detector_profile(message.detector_profile)
+
+    if ARTIFACT_STAGING_MODE == "mmap" and FEATURE_STORAGE_ENCODING == "float32":
+        try:
+            staged = stage_feature_artifact(
+                user_id=message.user_id,
+                session_id=message.session_id,
+                capture_id=capture_id,
+            )
+        except Exception as exc:
+            raise LandmarkExtractorFrameError(
+                f"Failed to stage feature artifact: {capture_id}"
+            ) from exc
+
+        state = CaptureState(
+            capture_id=capture_id,
+            user_id=message.user_id,
+            session_id=message.session_id,
+            feature_rows=staged.buffer,
+            staged_artifact=staged,
+            detector_profile=detector_profile,
+            latency=StageTotals() if LATENCY_CAPTURE_SUMMARY_ENABLED else None,
+        )
+    else:
+        state = CaptureState(
+            capture_id=capture_id,
+            user_id=message.user_id,
+            session_id=message.session_id,
+            detector_profile=detector_profile,
+            latency=StageTotals() if LATENCY_CAPTURE_SUMMARY_ENABLED else None,
+        )
+
     _ACTIVE_CAPTURES[capture_id] = state
     return state
 
@@ -314,28 +834,221 @@ def _reject_if_terminal(capture_id: UUID) -> None:
         raise LandmarkExtractorServiceError(f"Capture already terminal: {capture_id}")
 
 
+def _evict_stale_captures(incoming_capture_id: UUID) -> list[UUID]:
+    """
+    Abort orphaned and over-budget captures before a frame is handled.
+
+    Returns the evicted capture_ids.
+
+    - captures idle for longer than CAPTURE_IDLE_TTL_S are aborted
+    - if incoming_capture_id starts a new capture, the least recently active
+      captures are aborted until its row buffer fits ACTIVE_CAPTURES_MAX_BYTES
+    - the incoming capture and captures with a message in flight (capture
+      order lock held) are never evicted
+    """
+    reserve_bytes = 0 if incoming_capture_id in _ACTIVE_CAPTURES else _NEW_CAPTURE_BYTES
+    evicted = []
+
+    for reason, victims in (
+        ("idle_timeout", _ACTIVE_CAPTURES.idle_captures()),
+        ("memory_cap", _ACTIVE_CAPTURES.over_budget_captures(reserve_bytes)),
+    ):
+        for capture_id in victims:
+            lock = _CAPTURE_ORDER_LOCKS.get(capture_id)
+            if capture_id == incoming_capture_id or (lock and lock.locked()):
+                continue
+            if _evict_capture(capture_id, reason):
+                evicted.append(capture_id)
+
+    return evicted
+
+
+def _evict_capture(capture_id: UUID, reason: str) -> bool:
+    """
+    Abort one active capture without a capture.abort event.
+
+    Same cleanup as _handle_abort (staging file, backend lease, terminal
+    marking); logged as a warning because its buffered rows are lost.
+    Returns False if the capture was no longer active.
+    """
+    state = _ACTIVE_CAPTURES.pop(capture_id, None)
+    if state is None:
+        return False
+
+    if state.staged_artifact is not None:
+        try:
+            discard_staged_artifact(state.staged_artifact)
+        except Exception:
+            logger.exception("Failed to discard staging file of %s", capture_id)
+
+    _release_backend(capture_id)
+    _mark_terminal(capture_id)
+    _CAPTURE_ORDER_LOCKS.pop(capture_id, None)
+
+    logger.warning(
+        "Aborted capture %s (%s): %d buffered rows discarded",
+        capture_id,
+        reason,
+        len(state.feature_rows),
+    )
+    return True
+
+
+# ============================================================
+# Backend lease helpers
+# ============================================================
+
+
+def warmup() -> None:
+    """
+    Construct the backend pool and run a blank frame through every backend.
+
+    Moves model loading and MediaPipe graph initialization out of the first
+    capture's first frame. In process execution mode every worker process
+    warms its own pool. Blocking; call it off the event loop (e.g. via
+    asyncio.to_thread from the FastAPI lifespan). Safe to call repeatedly.
+
+    Raises:
+    - MediaPipeBackendInitError if the detectors cannot be created
+    """
+    if EXTRACTION_EXECUTION_MODE == "process":
+        for future in _get_process_pool().submit_to_all(_warmup_local):
+            future.result()
+        return
+
+    _warmup_local()
+
+
+def _warmup_local() -> None:
+    """Warm up the backend pool of the current process."""
+    _get_backend_pool().warmup()
+
+
+def get_backend_pool_stats() -> BackendPoolStats:
+    """Return occupancy metrics for the MediaPipe backend pool."""
+    return _get_backend_pool().stats()
+
+
+def get_frame_buffer_stats() -> FrameBufferPoolStats:
+    """Return frame buffer reuse metrics (incl. hit rate) across backends."""
+    return _get_backend_pool().frame_buffer_stats()
+
+
+def _get_backend_pool() -> MediaPipeBackendPool:
+    """Return the backend pool, constructing it exactly once on first use."""
+    global _BACKEND_POOL
+
+    pool = _BACKEND_POOL
+    if pool is not None:
+        return pool
+
+    with _BACKEND_POOL_LOCK:
+        if _BACKEND_POOL is None:
+            _BACKEND_POOL = MediaPipeBackendPool(
+                size=BACKEND_POOL_SIZE,
+                backend_factory=_create_backend,
+                lease_timeout_s=BACKEND_LEASE_TIMEOUT_S,
+            )
+        return _BACKEND_POOL
+
+
+def _lease_backend(capture_id: UUID) -> MediaPipeLandmarkBackend:
+    """
+    Return the backend leased by capture_id, leasing one on first use.
+
+    A newly leased backend starts a stream limited to the detectors of the
+    capture's detector profile.
+
+    Inside a worker process the lease does not wait: the worker runs one
+    message at a time, so the close/abort that would free a backend is queued
+    behind this frame and waiting could only stall the worker's other captures.
+
+    Raises:
+    - LandmarkExtractorFrameError if no backend is available within the lease timeout
+    """
+    backend = _CAPTURE_BACKENDS.get(capture_id)
+    if backend is not None:
+        return backend
+
+    try:
+        pool = _get_backend_pool()
+        backend = pool.lease(timeout_s=0.0) if _IN_WORKER_PROCESS else pool.lease()
+    except MediaPipeBackendLeaseTimeout as exc:
+        raise LandmarkExtractorFrameError(str(exc)) from exc
+
+    state = _ACTIVE_CAPTURES.get(capture_id)
+    profile = state.detector_profile if state else DEFAULT_DETECTOR_PROFILE
+
+    backend.begin_stream(DETECTOR_PROFILES[profile])
+    _CAPTURE_BACKENDS[capture_id] = backend
+    return backend
+
+
+def _release_backend(capture_id: UUID) -> None:
+    """Return the backend leased by capture_id to the pool, if any."""
+    backend = _CAPTURE_BACKENDS.pop(capture_id, None)
+    if backend is not None:
+        _get_backend_pool().release(backend)
+
+
+# ============================================================
+# Motion gate helpers
+# ============================================================
+
+
+def _is_static_frame(state: CaptureState, signature: np.ndarray) -> bool:
+    """
+    Return True if the previous feature row may be reused for this frame.
+
+    Requires an earlier extracted frame to compare against and a reuse run
+    shorter than MOTION_GATE_MAX_REUSED_RUN.
+    """
+    if state.motion_reference is None or not state.feature_rows:
+        return False
+    if state.consecutive_reused >= MOTION_GATE_MAX_REUSED_RUN:
+        return False
+
+    return motion_score(state.motion_reference, signature) < MOTION_GATE_THRESHOLD
+
+
 # ============================================================
 # Frame decoding helpers
 # ============================================================
 
 
+def _decode_frame_payload(
+    message: LandmarkExtractorFrameInput | LandmarkExtractorFrameBytesInput,
+) -> np.ndarray:
+    """
+    Decode the image payload of either frame message variant.
+
+    - capture.frame_bytes: bytes-like payload goes straight to cv2.imdecode
+    - capture.frame: base64 frame_data is decoded first
+    """
+    if message.event == "capture.frame_bytes":
+        return _bytes_to_frame(message.frame_bytes)
+
+    return _decode_frame_data(message.frame_data)
+
+
 def _decode_frame_data(frame_data: str) -> np.ndarray:
     """
-    Decode validated frame_data into one OpenCV BGR image frame.
+    Decode validated frame_data into one RGB image frame.
 
     Supports:
     - data URL base64 payloads
     - raw base64 payloads
 
     Returns:
-    - decoded OpenCV frame (BGR)
+    - decoded frame (RGB)
 
     Raises:
     - LandmarkExtractorFrameError if base64 decoding or image decoding fails.
     """
     try:
-        raw_b64 = _strip_data_url_prefix(frame_data)
-        image_bytes = _decode_base64_bytes(raw_b64)
+        with _LATENCY.span("base64_decode"):
+            raw_b64 = _strip_data_url_prefix(frame_data)
+            image_bytes = _decode_base64_bytes(raw_b64)
         return _bytes_to_frame(image_bytes)
     except LandmarkExtractorFrameError:
         raise
@@ -366,25 +1079,120 @@ def _decode_base64_bytes(frame_data: str) -> bytes:
         raise LandmarkExtractorFrameError("Invalid base64 image payload") from exc
 
 
-def _bytes_to_frame(image_bytes: bytes) -> np.ndarray:
+def _bytes_to_frame(image_bytes: bytes | bytearray | memoryview) -> np.ndarray:
     """
-    Decode image bytes into one OpenCV BGR frame.
+    Decode image bytes into one RGB frame.
+
+    The bytes are wrapped with np.frombuffer (no copy) before decoding. JPEGs
+    larger than the extraction resolution are decoded at reduced scale.
+    OpenCV builds with IMREAD_COLOR_RGB decode straight to RGB; older builds
+    decode BGR and swap channels in place.
 
     Raises:
     - LandmarkExtractorFrameError if decoding fails.
     """
     try:
         buffer = np.frombuffer(image_bytes, dtype=np.uint8)
-        frame = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        flag = _imdecode_flag(buffer)
+        if _IMREAD_COLOR_RGB is not None:
+            flag = (flag & ~cv2.IMREAD_COLOR) | _IMREAD_COLOR_RGB
+        with _LATENCY.span("imdecode"):
+            frame = cv2.imdecode(buffer, flag)
     except Exception as exc:
         raise LandmarkExtractorFrameError("Failed to decode image bytes") from exc
 
     if frame is None:
         raise LandmarkExtractorFrameError("OpenCV returned empty frame during decode")
 
+    if _IMREAD_COLOR_RGB is None:
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
     return frame
 
 
+_IMREAD_COLOR_RGB: int | None = getattr(cv2, "IMREAD_COLOR_RGB", None)
+"""
+imdecode flag bit selecting RGB output (OpenCV >= 4.10), or None if missing.
+"""
+
+_REDUCED_DECODE_FLAGS = (
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+"""
+(scale denominator, imdecode flag) pairs tried from the smallest output up.
+"""
+
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+"""
+JPEG start-of-frame markers (all SOFn; excludes DHT, JPG and DAC).
+"""
+
+
+def _imdecode_flag(buffer: np.ndarray) -> int:
+    """
+    Pick the cheapest imdecode flag that still covers EXTRACTION_MAX_LONG_SIDE.
+
+    Only JPEGs benefit: libjpeg scales during the IDCT, so a 1/2 or 1/4 decode
+    skips most of the decode work. Other formats, unreadable headers and a
+    disabled target fall back to a full IMREAD_COLOR decode.
+    """
+    if EXTRACTION_MAX_LONG_SIDE is None:
+        return cv2.IMREAD_COLOR
+
+    size = _jpeg_frame_size(buffer)
+    if size is None:
+        return cv2.IMREAD_COLOR
+
+    long_side = max(size)
+    for denominator, flag in _REDUCED_DECODE_FLAGS:
+        if long_side // denominator >= EXTRACTION_MAX_LONG_SIDE:
+            return flag
+
+    return cv2.IMREAD_COLOR
+
+
+def _jpeg_frame_size(buffer: np.ndarray) -> tuple[int, int] | None:
+    """
+    Return (width, height) from a JPEG SOF header, or None if not found.
+
+    Walks the marker segments only; no pixel data is touched.
+    """
+    data = buffer.data
+    size = len(data)
+
+    if size < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+
+    pos = 2
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return None
+
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # fill byte before a marker
+            pos += 1
+            continue
+
+        segment_length = (data[pos + 2] << 8) | data[pos + 3]
+
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > size:
+                return None
+            height = (data[pos + 5] << 8) | data[pos + 6]
+            width = (data[pos + 7] << 8) | data[pos + 8]
+            return width, height
+
+        if marker == 0xDA or segment_length < 2:
+            # start of scan before any SOF, or corrupt segment
+            return None
+
+        pos += 2 + segment_length
+
+    return None
+
+
 # ============================================================
 # Finalize helpers
 # ============================================================
@@ -392,11 +1200,16 @@ def _bytes_to_frame(image_bytes: bytes) -> np.ndarray:
 
 def _build_finalize_result(state: CaptureState) -> FinalizeResult:
     """
-    Convert buffered feature rows into a finalized FeatureMatrix.
+    Expose buffered feature rows as a finalized FeatureMatrix.
 
     Enforces:
     - capture contains at least one feature row
-    - finalized matrix shape is (T, D)
+
+    The matrix is a zero-copy (T, D) view of the capture buffer. Stride-
+    skipped rows are interpolated in place and reported in interpolated_mask.
+    With CAPTURE_QUALITY_STATS_ENABLED, missingness masks and the quality
+    summary are computed from the final matrix. frame_timing is derived from
+    the recorded row event times when there is one per row.
     """
     rows = state.feature_rows
 
@@ -405,13 +1218,87 @@ def _build_finalize_result(state: CaptureState) -> FinalizeResult:
             "Cannot finalize capture with zero feature rows"
         )
 
-    feature_matrix: FeatureMatrix = rows
+    feature_matrix: FeatureMatrix = rows.view()
+    interpolated_mask = None
+
+    if EXTRACTION_STRIDE > 1 or state.skipped_rows:
+        interpolated_mask = np.zeros(len(rows), dtype=bool)
+        interpolated_mask[state.skipped_rows] = True
+
+        # A frozen buffer was already filled before an earlier seal.
+        if feature_matrix.flags.writeable:
+            interpolate_skipped_rows(feature_matrix, interpolated_mask)
+
+    quality = None
+    if CAPTURE_QUALITY_STATS_ENABLED:
+        quality = compute_capture_quality(feature_matrix, interpolated_mask)
+
+    frame_timing = None
+    if len(state.frame_times) == len(rows):
+        frame_timing = compute_frame_timing(state.frame_times.view())
 
     return FinalizeResult(
         capture_id=state.capture_id,
         user_id=state.user_id,
         session_id=state.session_id,
         feature_matrix=feature_matrix,
+        interpolated_mask=interpolated_mask,
+        detector_profile=state.detector_profile,
+        quality=quality,
+        frame_timing=frame_timing,
+    )
+
+
+def _persist_feature_artifact(
+    state: CaptureState, finalize_result: FinalizeResult
+) -> ArtifactWriteResult:
+    """
+    Persist the finalized matrix as the capture's artifact.
+
+    - staged capture: seal the staging file in place (no serialization)
+    - otherwise (or if a previous close already sealed it and was rolled
+      back, or failed to publish it): drop any leftover staging file and
+      write the matrix via write_feature_artifact(...)
+
+    The interpolated mask, capture quality arrays and frame timing, when
+    present, are stored as extra npz members.
+    """
+    extra_arrays = {}
+    if finalize_result.interpolated_mask is not None:
+        extra_arrays[FEATURE_ARTIFACT_INTERPOLATED_KEY] = (
+            finalize_result.interpolated_mask
+        )
+
+    quality = finalize_result.quality
+    if quality is not None:
+        extra_arrays[FEATURE_ARTIFACT_MISSING_REGIONS_KEY] = quality.missing_regions
+        extra_arrays[FEATURE_ARTIFACT_MISSING_FRACTION_KEY] = quality.missing_fraction
+        extra_arrays[FEATURE_ARTIFACT_REGION_NAMES_KEY] = np.asarray(
+            quality.region_names
+        )
+
+    timing = finalize_result.frame_timing
+    if timing is not None:
+        extra_arrays[FEATURE_ARTIFACT_FRAME_OFFSETS_KEY] = timing.offsets_ms
+        extra_arrays[FEATURE_ARTIFACT_FPS_KEY] = np.float64(timing.fps_estimate)
+        extra_arrays[FEATURE_ARTIFACT_JITTER_KEY] = np.float64(timing.jitter_ms)
+        extra_arrays[FEATURE_ARTIFACT_MAX_INTERVAL_KEY] = np.float64(
+            timing.max_interval_ms
+        )
+
+    staged = state.staged_artifact
+    if staged is not None:
+        if staged.sealable:
+            return seal_feature_artifact(staged, extra_arrays)
+        if not staged.sealed:
+            discard_staged_artifact(staged)
+
+    return write_feature_artifact(
+        user_id=finalize_result.user_id,
+        session_id=finalize_result.session_id,
+        capture_id=finalize_result.capture_id,
+        feature_matrix=finalize_result.feature_matrix,
+        extra_arrays=extra_arrays,
     )
 
 
@@ -421,6 +1308,7 @@ def _build_feature_ref_message(
     artifact_result: ArtifactWriteResult,
     timestamp_end: datetime,
     schema_version: str,
+    latency_summary: dict[str, dict[str, float]] | None = None,
 ) -> A3CPMessage:
     """
     Build one derived A3CPMessage referencing the persisted feature artifact.
@@ -434,7 +1322,13 @@ def _build_feature_ref_message(
     - record_id = newly generated ID
 
     Payload:
-    - raw_features_ref built from artifact_result
+    - raw_features_ref built from artifact_result; encoding names the
+      capture's detector profile when it is not the default and the storage
+      encoding (artifact_result.dtype) when it is not float32
+    - quality_summary (landmark missingness / tracking gaps), only if the
+      finalize result carries capture quality statistics
+    - latency_summary (per-capture stage timings up to the artifact write),
+      only if given
 
     Returns:
     - A3CPMessage
@@ -442,27 +1336,33 @@ def _build_feature_ref_message(
     raw_features_ref = RawFeaturesRef(
         uri=artifact_result.artifact_path,
         hash=artifact_result.artifact_hash,
-        encoding=FEATURE_ENCODING_ID,
+        encoding=feature_encoding_id(
+            finalize_result.detector_profile, storage=artifact_result.dtype
+        ),
         shape=list(artifact_result.shape),
         dtype=artifact_result.dtype,
         format=artifact_result.format,
     )
 
-    return A3CPMessage.model_validate(
-        {
-            "schema_version": schema_version,
-            "record_id": uuid4(),
-            "user_id": finalize_result.user_id,
-            "session_id": finalize_result.session_id,
-            "timestamp": timestamp_end,
-            "modality": "gesture",
-            "source": "landmark_extractor",
-            "performer_id": "system",
-            "capture_id": finalize_result.capture_id,
-            "event": "raw_features.ready",
-            "raw_features_ref": raw_features_ref,
-        }
-    )
+    payload = {
+        "schema_version": schema_version,
+        "record_id": uuid4(),
+        "user_id": finalize_result.user_id,
+        "session_id": finalize_result.session_id,
+        "timestamp": timestamp_end,
+        "modality": "gesture",
+        "source": "landmark_extractor",
+        "performer_id": "system",
+        "capture_id": finalize_result.capture_id,
+        "event": "raw_features.ready",
+        "raw_features_ref": raw_features_ref,
+    }
+    if finalize_result.quality is not None:
+        payload["quality_summary"] = finalize_result.quality.summary
+    if latency_summary is not None:
+        payload["latency_summary"] = latency_summary
+
+    return A3CPMessage.model_validate(payload)
 
 
 def _append_feature_ref_event(message: A3CPMessage) -> None:
@@ -490,7 +1390,10 @@ def _rollback_artifact(artifact_result: ArtifactWriteResult) -> None:
     - used only inside the commit-unit rollback path
     """
     try:
-        delete_feature_artifact(artifact_path=artifact_result.artifact_path)
+        delete_feature_artifact(
+            artifact_path=artifact_result.artifact_path,
+            capture_id=artifact_result.capture_id,
+        )
     except Exception:
         pass
 
@@ -500,6 +1403,19 @@ def _rollback_artifact(artifact_result: ArtifactWriteResult) -> None:
 # ============================================================
 
 
+def _resolve_detector_profile(detector_profile: str | None) -> str:
+    """Return the DETECTOR_PROFILES key for a frame's detector_profile."""
+    if detector_profile is None:
+        return DEFAULT_DETECTOR_PROFILE
+
+    if detector_profile not in DETECTOR_PROFILES:
+        raise LandmarkExtractorFrameError(
+            f"Unknown detector_profile: {detector_profile!r}"
+        )
+
+    return detector_profile
+
+
 def _ensure_close_message(message: LandmarkExtractorTerminalInput) -> None:
     """Require event == 'capture.close'."""
     if message.event != "capture.close":
@@ -525,15 +1441,21 @@ def _ensure_non_empty_feature_rows(state: CaptureState) -> None:
 
 
 def _ensure_feature_matrix_shape(feature_matrix: FeatureMatrix) -> None:
-    """Check finalized matrix shape is (T, D) with D == FEATURE_DIM."""
-    if not feature_matrix:
+    """Check finalized matrix shape is (T, D) with T > 0 and D == FEATURE_DIM."""
+    if feature_matrix.ndim != 2:
+        raise LandmarkExtractorFinalizeError(
+            f"Feature matrix must be 2-D, got shape {feature_matrix.shape}"
+        )
+
+    rows, dim = feature_matrix.shape
+
+    if rows == 0:
         raise LandmarkExtractorFinalizeError("Feature matrix is empty")
 
-    for row in feature_matrix:
-        if len(row) != FEATURE_DIM:
-            raise LandmarkExtractorFinalizeError(
-                f"Feature row dimension mismatch: expected {FEATURE_DIM}, got {len(row)}"
-            )
+    if dim != FEATURE_DIM:
+        raise LandmarkExtractorFinalizeError(
+            f"Feature row dimension mismatch: expected {FEATURE_DIM}, got {dim}"
+        )
 
 
 # ============================================================
@@ -0,0 +1,414 @@
+# apps/landmark_extractor/tests/test_artifact_writer.py
+
+import hashlib
+import os
+import zipfile
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from apps.landmark_extractor import artifact_writer, config
+from apps.landmark_extractor.artifact_writer import (
+    ArtifactWriterError,
+    delete_feature_artifact,
+    discard_staged_artifact,
+    seal_feature_artifact,
+    stage_feature_artifact,
+    write_feature_artifact,
+)
+from apps.landmark_extractor.config import FEATURE_ARTIFACT_ARRAY_KEY, FEATURE_DIM
+from apps.landmark_extractor.feature_codec import load_feature_artifact
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    root = tmp_path / "data"
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", root)
+    return root
+
+
+def _matrix(rows=4):
+    return np.arange(rows * FEATURE_DIM, dtype=np.float32).reshape(rows, FEATURE_DIM)
+
+
+def test_write_feature_artifact_writes_npz_at_canonical_path(data_root):
+    capture_id = uuid4()
+    matrix = _matrix()
+
+    result = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=capture_id,
+        feature_matrix=matrix,
+    )
+
+    expected = (
+        data_root
+        / "users"
+        / "user-1"
+        / "sessions"
+        / "session-1"
+        / "features"
+        / f"{capture_id}.npz"
+    )
+    assert result.artifact_path == str(expected)
+    assert result.capture_id == capture_id
+    assert result.shape == (4, FEATURE_DIM)
+    assert result.dtype == "float32"
+    assert result.format == "npz"
+
+    with np.load(expected) as archive:
+        np.testing.assert_array_equal(archive[FEATURE_ARTIFACT_ARRAY_KEY], matrix)
+
+    # only the final artifact remains; the temp file was renamed into place
+    assert list(expected.parent.iterdir()) == [expected]
+
+
+def test_write_feature_artifact_hash_matches_written_bytes(data_root):
+    result = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=_matrix(),
+    )
+
+    with open(result.artifact_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    assert result.artifact_hash == f"sha256:{digest}"
+
+
+def test_write_feature_artifact_deflate_compresses_members(data_root, monkeypatch):
+    monkeypatch.setattr(config, "ARTIFACT_COMPRESSION", "deflate")
+    matrix = np.zeros((20, FEATURE_DIM), dtype=np.float32)
+
+    result = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=matrix,
+    )
+
+    with zipfile.ZipFile(result.artifact_path) as archive:
+        assert all(
+            info.compress_type == zipfile.ZIP_DEFLATED for info in archive.infolist()
+        )
+
+    with np.load(result.artifact_path) as archive:
+        np.testing.assert_array_equal(archive[FEATURE_ARTIFACT_ARRAY_KEY], matrix)
+
+
+@pytest.mark.parametrize("policy, expected_calls", [("file", 1), ("none", 0)])
+def test_write_feature_artifact_applies_fsync_policy(
+    data_root, monkeypatch, policy, expected_calls
+):
+    calls = []
+    monkeypatch.setattr(config, "ARTIFACT_FSYNC_POLICY", policy)
+    monkeypatch.setattr(artifact_writer.os, "fsync", lambda fd: calls.append(fd))
+
+    write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=_matrix(),
+    )
+
+    assert len(calls) == expected_calls
+
+
+def test_write_feature_artifact_rejects_unknown_compression(data_root, monkeypatch):
+    monkeypatch.setattr(config, "ARTIFACT_COMPRESSION", "lzma")
+
+    with pytest.raises(ArtifactWriterError):
+        write_feature_artifact(
+            user_id="user-1",
+            session_id="session-1",
+            capture_id=uuid4(),
+            feature_matrix=_matrix(),
+        )
+
+    assert not data_root.exists()
+
+
+def test_write_feature_artifact_removes_temp_file_on_failure(data_root, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(artifact_writer.os, "replace", fail_replace)
+    capture_id = uuid4()
+
+    with pytest.raises(OSError):
+        write_feature_artifact(
+            user_id="user-1",
+            session_id="session-1",
+            capture_id=capture_id,
+            feature_matrix=_matrix(),
+        )
+
+    features_dir = data_root / "users" / "user-1" / "sessions" / "session-1"
+    assert list((features_dir / "features").iterdir()) == []
+
+
+def test_delete_feature_artifact_removes_file_and_tolerates_missing(data_root):
+    result = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=_matrix(),
+    )
+
+    delete_feature_artifact(artifact_path=result.artifact_path)
+    delete_feature_artifact(artifact_path=result.artifact_path)
+
+    with pytest.raises(FileNotFoundError):
+        with open(result.artifact_path, "rb"):
+            pass
+
+
+def test_staged_artifact_seals_into_loadable_npz(data_root):
+    capture_id = uuid4()
+    matrix = _matrix(rows=3)
+
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=capture_id
+    )
+    for row in matrix:
+        staged.buffer.append(row)
+
+    result = seal_feature_artifact(staged)
+
+    assert result.artifact_path == str(staged.artifact_path)
+    assert result.shape == (3, FEATURE_DIM)
+    assert result.dtype == "float32"
+    assert not staged.staging_path.exists()
+
+    with open(result.artifact_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    assert result.artifact_hash == f"sha256:{digest}"
+
+    with zipfile.ZipFile(result.artifact_path) as archive:
+        assert archive.testzip() is None
+
+    with np.load(result.artifact_path) as archive:
+        np.testing.assert_array_equal(archive[FEATURE_ARTIFACT_ARRAY_KEY], matrix)
+
+
+def test_staged_artifact_matches_written_artifact_contents(data_root):
+    matrix = _matrix(rows=2)
+
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    for row in matrix:
+        staged.buffer.append(row)
+    sealed = seal_feature_artifact(staged)
+
+    written = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=matrix,
+    )
+
+    with np.load(sealed.artifact_path) as a, np.load(written.artifact_path) as b:
+        assert a.files == b.files
+        np.testing.assert_array_equal(
+            a[FEATURE_ARTIFACT_ARRAY_KEY], b[FEATURE_ARTIFACT_ARRAY_KEY]
+        )
+
+
+def test_sealed_staged_artifact_is_read_only_and_not_resealable(data_root):
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    staged.buffer.append(_matrix(rows=1)[0])
+    seal_feature_artifact(staged)
+
+    with pytest.raises(ValueError):
+        staged.buffer.append(_matrix(rows=1)[0])
+
+    with pytest.raises(ArtifactWriterError):
+        seal_feature_artifact(staged)
+
+
+def test_seal_can_be_retried_after_trailer_write_failure(data_root, monkeypatch):
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    matrix = _matrix(rows=2)
+    for row in matrix:
+        staged.buffer.append(row)
+
+    def failing_fsync(fd):
+        raise OSError("transient fsync failure")
+
+    monkeypatch.setattr(config, "ARTIFACT_FSYNC_POLICY", "file")
+    monkeypatch.setattr(artifact_writer.os, "fsync", failing_fsync)
+
+    with pytest.raises(OSError):
+        seal_feature_artifact(staged)
+
+    assert staged.sealable
+    assert not staged.artifact_path.exists()
+
+    monkeypatch.undo()
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", data_root)
+
+    result = seal_feature_artifact(staged)
+
+    assert staged.sealed
+    np.testing.assert_array_equal(load_feature_artifact(result.artifact_path), matrix)
+
+
+def test_seal_publish_failure_leaves_rows_readable_but_not_sealable(
+    data_root, monkeypatch
+):
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    matrix = _matrix(rows=2)
+    for row in matrix:
+        staged.buffer.append(row)
+
+    def failing_publish(temp_path, artifact_path, content_hash):
+        raise OSError("transient rename failure")
+
+    monkeypatch.setattr(artifact_writer, "publish_feature_artifact", failing_publish)
+
+    with pytest.raises(OSError):
+        seal_feature_artifact(staged)
+
+    assert not staged.sealable
+    assert not staged.sealed
+    np.testing.assert_array_equal(staged.buffer.view(), matrix)
+
+    with pytest.raises(ArtifactWriterError):
+        seal_feature_artifact(staged)
+
+    discard_staged_artifact(staged)
+    assert not staged.staging_path.exists()
+
+
+def test_seal_rejects_empty_staged_artifact(data_root):
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+
+    with pytest.raises(ArtifactWriterError):
+        seal_feature_artifact(staged)
+
+    discard_staged_artifact(staged)
+
+
+def test_discard_staged_artifact_unlinks_staging_file(data_root):
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    staged.buffer.append(_matrix(rows=1)[0])
+
+    assert staged.staging_path.exists()
+
+    discard_staged_artifact(staged)
+    discard_staged_artifact(staged)
+
+    assert not staged.staging_path.exists()
+    assert not staged.artifact_path.exists()
+
+
+def test_artifacts_store_extra_arrays_as_npz_members(data_root):
+    mask = np.array([False, True, False])
+
+    written = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=_matrix(rows=3),
+        extra_arrays={"interpolated": mask},
+    )
+
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    for row in _matrix(rows=3):
+        staged.buffer.append(row)
+    sealed = seal_feature_artifact(staged, {"interpolated": mask})
+
+    for result in (written, sealed):
+        with zipfile.ZipFile(result.artifact_path) as archive:
+            assert archive.testzip() is None
+        with np.load(result.artifact_path) as archive:
+            np.testing.assert_array_equal(
+                archive[FEATURE_ARTIFACT_ARRAY_KEY], _matrix(rows=3)
+            )
+            np.testing.assert_array_equal(archive["interpolated"], mask)
+
+
+def test_write_feature_artifact_rejects_reserved_extra_array_key(data_root):
+    with pytest.raises(ArtifactWriterError):
+        write_feature_artifact(
+            user_id="user-1",
+            session_id="session-1",
+            capture_id=uuid4(),
+            feature_matrix=_matrix(),
+            extra_arrays={FEATURE_ARTIFACT_ARRAY_KEY: np.zeros(4)},
+        )
+
+
+@pytest.mark.parametrize("storage", ["float16", "int16", "int16_delta"])
+def test_write_feature_artifact_stores_compact_encoding(
+    data_root, monkeypatch, storage
+):
+    monkeypatch.setattr(config, "FEATURE_STORAGE_ENCODING", storage)
+    rng = np.random.default_rng(0)
+    matrix = np.cumsum(
+        rng.normal(0.0, 0.002, size=(60, FEATURE_DIM)), axis=0, dtype=np.float32
+    )
+
+    result = write_feature_artifact(
+        user_id="user-1",
+        session_id="session-1",
+        capture_id=uuid4(),
+        feature_matrix=matrix,
+        extra_arrays={"interpolated": np.zeros(60, dtype=bool)},
+    )
+
+    assert result.dtype == storage
+    assert result.shape == (60, FEATURE_DIM)
+    np.testing.assert_allclose(
+        load_feature_artifact(result.artifact_path), matrix, rtol=0, atol=1e-3
+    )
+    with np.load(result.artifact_path) as archive:
+        assert "interpolated" in archive.files
+
+
+def test_int16_delta_artifact_is_smaller_than_float32(data_root, monkeypatch):
+    rng = np.random.default_rng(0)
+    matrix = np.cumsum(
+        rng.normal(0.0, 0.002, size=(200, FEATURE_DIM)), axis=0, dtype=np.float32
+    )
+
+    sizes = {}
+    for storage in ("float32", "int16_delta"):
+        monkeypatch.setattr(config, "FEATURE_STORAGE_ENCODING", storage)
+        result = write_feature_artifact(
+            user_id="user-1",
+            session_id="session-1",
+            capture_id=uuid4(),
+            feature_matrix=matrix,
+        )
+        sizes[storage] = os.path.getsize(result.artifact_path)
+
+    assert sizes["int16_delta"] * 2 < sizes["float32"]
+
+
+@pytest.mark.parametrize("key", ["storage", "scale"])
+def test_write_feature_artifact_rejects_codec_extra_array_keys(data_root, key):
+    with pytest.raises(ArtifactWriterError):
+        write_feature_artifact(
+            user_id="user-1",
+            session_id="session-1",
+            capture_id=uuid4(),
+            feature_matrix=_matrix(),
+            extra_arrays={key: np.zeros(4)},
+        )
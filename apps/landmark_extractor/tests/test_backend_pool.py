@@ -0,0 +1,148 @@
+# apps/landmark_extractor/tests/test_backend_pool.py
+
+import threading
+import time
+
+import pytest
+
+from apps.landmark_extractor.backend_pool import (
+    MediaPipeBackendLeaseTimeout,
+    MediaPipeBackendPool,
+    MediaPipeBackendPoolError,
+)
+from apps.landmark_extractor.frame_buffers import FrameBufferPoolStats
+
+
+class FakeBackend:
+    def __init__(self):
+        self.closed = False
+
+    def frame_buffer_stats(self):
+        return FrameBufferPoolStats(sizes=1, hits=3, misses=1)
+
+    def close(self):
+        self.closed = True
+
+
+def test_backend_pool_preinitializes_backends():
+    created = []
+
+    def factory():
+        backend = FakeBackend()
+        created.append(backend)
+        return backend
+
+    pool = MediaPipeBackendPool(size=3, backend_factory=factory, lease_timeout_s=0.1)
+
+    stats = pool.stats()
+    assert len(created) == 3
+    assert stats.size == 3
+    assert stats.available == 3
+    assert stats.leased == 0
+
+
+def test_backend_pool_leases_distinct_backends_and_tracks_occupancy():
+    pool = MediaPipeBackendPool(
+        size=2, backend_factory=FakeBackend, lease_timeout_s=0.1
+    )
+
+    first = pool.lease()
+    second = pool.lease()
+
+    assert first is not second
+
+    stats = pool.stats()
+    assert stats.leased == 2
+    assert stats.available == 0
+    assert stats.peak_leased == 2
+    assert stats.leases_granted == 2
+
+    pool.release(first)
+
+    stats = pool.stats()
+    assert stats.leased == 1
+    assert stats.available == 1
+    assert pool.lease() is first
+
+
+def test_backend_pool_lease_times_out_when_exhausted():
+    pool = MediaPipeBackendPool(
+        size=1, backend_factory=FakeBackend, lease_timeout_s=0.05
+    )
+    pool.lease()
+
+    with pytest.raises(MediaPipeBackendLeaseTimeout):
+        pool.lease()
+
+    assert pool.stats().lease_timeouts == 1
+    assert pool.stats().waiting == 0
+
+
+def test_backend_pool_lease_waits_for_release():
+    pool = MediaPipeBackendPool(
+        size=1, backend_factory=FakeBackend, lease_timeout_s=1.0
+    )
+    backend = pool.lease()
+
+    def release_later():
+        time.sleep(0.05)
+        pool.release(backend)
+
+    thread = threading.Thread(target=release_later)
+    thread.start()
+
+    assert pool.lease() is backend
+    thread.join()
+
+
+def test_backend_pool_rejects_release_of_unleased_backend():
+    pool = MediaPipeBackendPool(
+        size=1, backend_factory=FakeBackend, lease_timeout_s=0.1
+    )
+
+    with pytest.raises(MediaPipeBackendPoolError):
+        pool.release(FakeBackend())
+
+
+def test_backend_pool_close_closes_available_backends():
+    backends = []
+
+    def factory():
+        backend = FakeBackend()
+        backends.append(backend)
+        return backend
+
+    pool = MediaPipeBackendPool(size=2, backend_factory=factory, lease_timeout_s=0.1)
+    pool.close()
+
+    assert all(backend.closed for backend in backends)
+
+
+def test_backend_pool_sums_frame_buffer_stats_across_backends():
+    pool = MediaPipeBackendPool(
+        size=2, backend_factory=FakeBackend, lease_timeout_s=0.1
+    )
+    pool.lease()  # leased backends are still counted
+
+    stats = pool.frame_buffer_stats()
+
+    assert stats == FrameBufferPoolStats(sizes=2, hits=6, misses=2)
+    assert stats.hit_rate == 0.75
+
+
+def test_backend_pool_warmup_runs_each_available_backend_once():
+    warmed = []
+
+    class WarmableBackend(FakeBackend):
+        def warmup(self):
+            warmed.append(self)
+
+    pool = MediaPipeBackendPool(
+        size=2, backend_factory=WarmableBackend, lease_timeout_s=0.1
+    )
+    leased = pool.lease()
+
+    pool.warmup()
+
+    assert len(warmed) == 1 and warmed[0] is not leased
+    assert pool.stats().available == 1
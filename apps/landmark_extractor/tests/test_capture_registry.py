@@ -0,0 +1,113 @@
+# apps/landmark_extractor/tests/test_capture_registry.py
+
+from uuid import uuid4
+
+import pytest
+
+from apps.landmark_extractor.capture_registry import (
+    ActiveCaptureRegistry,
+    TerminalCaptureIds,
+)
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _state(capture_id, capacity=10):
+    return CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer(capacity=capacity, dim=4),
+    )
+
+
+def test_active_capture_registry_reports_idle_captures_oldest_first():
+    clock = FakeClock()
+    registry = ActiveCaptureRegistry(idle_ttl_s=10.0, max_bytes=10**6, clock=clock)
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    registry[a] = _state(a)
+    clock.now = 1.0
+    registry[b] = _state(b)
+    clock.now = 2.0
+    registry[c] = _state(c)
+
+    clock.now = 5.0
+    registry.touch(a)
+
+    clock.now = 12.5
+    assert registry.idle_captures() == [b, c]
+
+    registry.pop(b)
+    assert registry.idle_captures() == [c]
+    assert set(registry) == {a, c}
+
+
+def test_active_capture_registry_over_budget_drops_least_recently_active():
+    clock = FakeClock()
+    one = FeatureBuffer(capacity=10, dim=4).nbytes
+    registry = ActiveCaptureRegistry(idle_ttl_s=10.0, max_bytes=3 * one, clock=clock)
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    for capture_id in (a, b, c):
+        registry[capture_id] = _state(capture_id)
+    registry.touch(a)
+
+    assert registry.nbytes == 3 * one
+    assert registry.over_budget_captures() == []
+    assert registry.over_budget_captures(reserve_bytes=one) == [b]
+    assert registry.over_budget_captures(reserve_bytes=2 * one) == [b, c]
+
+
+def test_active_capture_registry_behaves_as_mapping():
+    registry = ActiveCaptureRegistry(idle_ttl_s=10.0, max_bytes=10**6)
+    capture_id = uuid4()
+    state = _state(capture_id)
+
+    registry[capture_id] = state
+
+    assert registry[capture_id] is state
+    assert registry.get(uuid4()) is None
+    assert registry.pop(uuid4(), None) is None
+    assert registry.pop(capture_id) is state
+    with pytest.raises(KeyError):
+        registry.pop(capture_id)
+
+    registry[capture_id] = state
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_terminal_capture_ids_forget_ids_after_replay_window():
+    clock = FakeClock()
+    terminal = TerminalCaptureIds(replay_window_s=60.0, max_size=100, clock=clock)
+    a, b = uuid4(), uuid4()
+
+    terminal.add(a)
+    clock.now = 30.0
+    terminal.add(b)
+
+    clock.now = 59.0
+    assert a in terminal and b in terminal
+
+    clock.now = 61.0
+    assert a not in terminal
+    assert b in terminal
+    assert len(terminal) == 1
+
+
+def test_terminal_capture_ids_keep_at_most_max_size_newest():
+    terminal = TerminalCaptureIds(replay_window_s=60.0, max_size=2)
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    for capture_id in (a, b, c):
+        terminal.add(capture_id)
+
+    assert set(terminal) == {b, c}
@@ -0,0 +1,84 @@
+# apps/landmark_extractor/tests/test_domain.py
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from apps.landmark_extractor.config import (
+    CAPTURE_MAX_FRAMES,
+    FEATURE_DIM,
+    FEATURE_DTYPE,
+)
+from apps.landmark_extractor.domain import FeatureBuffer, FrameTimeBuffer
+
+
+def test_feature_buffer_preallocates_capture_capacity():
+    buffer = FeatureBuffer()
+
+    assert buffer.capacity == CAPTURE_MAX_FRAMES
+    assert buffer.dim == FEATURE_DIM
+    assert len(buffer) == 0
+    assert buffer.view().shape == (0, FEATURE_DIM)
+    assert buffer.view().dtype == np.dtype(FEATURE_DTYPE)
+
+
+def test_feature_buffer_view_is_zero_copy_and_ordered():
+    buffer = FeatureBuffer(capacity=4, dim=3)
+
+    buffer.append([1.0, 2.0, 3.0])
+    buffer.append(np.array([4.0, 5.0, 6.0]))
+
+    first = buffer.view()
+    buffer.append([7.0, 8.0, 9.0])
+    second = buffer.view()
+
+    assert np.shares_memory(first, second)
+    np.testing.assert_array_equal(
+        second, np.float32([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]])
+    )
+
+
+def test_feature_buffer_rejects_row_dimension_mismatch():
+    buffer = FeatureBuffer(capacity=2, dim=3)
+
+    with pytest.raises(ValueError):
+        buffer.append([1.0, 2.0])
+
+    assert len(buffer) == 0
+
+
+def test_feature_buffer_rejects_append_when_full():
+    buffer = FeatureBuffer.from_rows([[0.0, 0.0]], capacity=1, dim=2)
+
+    assert buffer.is_full
+    with pytest.raises(ValueError):
+        buffer.append([1.0, 1.0])
+
+
+def test_feature_buffer_repeat_last_copies_previous_row():
+    buffer = FeatureBuffer(capacity=3, dim=2)
+
+    with pytest.raises(ValueError):
+        buffer.repeat_last()
+
+    buffer.append([1.0, 2.0])
+    buffer.repeat_last()
+
+    np.testing.assert_array_equal(buffer.view(), np.float32([[1.0, 2.0], [1.0, 2.0]]))
+
+
+def test_frame_time_buffer_records_millisecond_offsets_from_first_row():
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    buffer = FrameTimeBuffer(capacity=4)
+
+    for delta_ms in (0, 66.6, 133.4, -10):
+        buffer.append(start + timedelta(milliseconds=delta_ms))
+
+    assert buffer.origin == start
+    assert len(buffer) == 4
+    assert buffer.view().dtype == np.int32
+    np.testing.assert_array_equal(buffer.view(), [0, 67, 133, -10])
+
+    with pytest.raises(ValueError):
+        buffer.append(start)
@@ -1,12 +1,25 @@
 # apps/landmark_extractor/tests/test_extractor.py
 
+import numpy as np
+import pytest
+
 from apps.landmark_extractor.config import (
+    DEFAULT_DETECTOR_PROFILE,
     FEATURE_DIM,
+    FEATURE_ENCODING_ID,
     MISSING_LANDMARK_PAIR,
     ORDERED_LANDMARKS,
 )
 from apps.landmark_extractor.domain import NormalizedLandmarks
-from apps.landmark_extractor.extractor import build_feature_row
+from apps.landmark_extractor.extractor import (
+    FEATURE_LAYOUT,
+    build_feature_row,
+    build_feature_row_array,
+    compute_capture_quality,
+    compute_frame_timing,
+    feature_encoding_id,
+    interpolate_skipped_rows,
+)
 
 
 def test_build_feature_row_returns_fixed_length_row():
@@ -83,3 +96,182 @@ def test_build_feature_row_all_missing_returns_only_missing_pairs():
     for i in range(0, FEATURE_DIM, 2):
         assert feature_row[i] == missing_x
         assert feature_row[i + 1] == missing_y
+
+
+def _gather_region_xy(landmarks, layout):
+    region_maps = {
+        "pose": landmarks.pose,
+        "left_hand": landmarks.left_hand,
+        "right_hand": landmarks.right_hand,
+        "face": landmarks.face,
+    }
+    region_xy = {}
+    for region in layout.regions:
+        landmark_map = region_maps[region.region]
+        if not landmark_map:
+            continue
+        region_xy[region.region] = np.asarray(
+            [landmark_map.get(i, (np.nan, np.nan)) for i in region.landmark_indices],
+            dtype=np.float32,
+        )
+    return region_xy
+
+
+def test_compiled_layout_covers_every_feature_column_once():
+    columns = np.concatenate(
+        [
+            np.concatenate([region.x_columns, region.y_columns])
+            for region in FEATURE_LAYOUT.regions
+        ]
+    )
+
+    assert FEATURE_LAYOUT.feature_dim == FEATURE_DIM
+    assert sorted(columns.tolist()) == list(range(FEATURE_DIM))
+    assert [region.region for region in FEATURE_LAYOUT.regions] == [
+        "pose",
+        "left_hand",
+        "right_hand",
+        "face",
+    ]
+
+
+def test_build_feature_row_array_matches_reference_row():
+    rng = np.random.default_rng(0)
+    face_indices = [idx for region, idx in ORDERED_LANDMARKS if region == "face"]
+
+    landmarks = NormalizedLandmarks(
+        pose={i: tuple(rng.random(2).tolist()) for i in range(0, 33, 2)},
+        left_hand={i: tuple(rng.random(2).tolist()) for i in range(21)},
+        right_hand={},
+        face={i: tuple(rng.random(2).tolist()) for i in face_indices[:-3]},
+    )
+
+    reference = np.asarray(build_feature_row(landmarks), dtype=np.float32)
+    row = build_feature_row_array(_gather_region_xy(landmarks, FEATURE_LAYOUT))
+
+    assert row.dtype == np.float32
+    assert row.shape == (FEATURE_DIM,)
+    np.testing.assert_array_equal(row, reference)
+
+
+def test_build_feature_row_array_all_missing_matches_reference_row():
+    reference = np.asarray(build_feature_row(NormalizedLandmarks()), dtype=np.float32)
+
+    row = build_feature_row_array({})
+
+    np.testing.assert_array_equal(row, reference)
+    assert row.flags.writeable
+
+
+def test_interpolate_skipped_rows_fills_linearly_and_holds_trailing_rows():
+    matrix = np.full((6, 4), np.nan, dtype=np.float32)
+    matrix[0] = [0.1, 0.2, 0.1, 0.2]
+    matrix[3] = [0.4, 0.5, 0.4, 0.5]
+    skipped = np.array([False, True, True, False, True, True])
+
+    interpolate_skipped_rows(matrix, skipped)
+
+    np.testing.assert_allclose(matrix[:, 0], [0.1, 0.2, 0.3, 0.4, 0.4, 0.4])
+    np.testing.assert_allclose(matrix[:, 1], [0.2, 0.3, 0.4, 0.5, 0.5, 0.5])
+    assert not np.isnan(matrix).any()
+
+
+def test_interpolate_skipped_rows_does_not_blend_with_missing_fill():
+    missing_x, missing_y = MISSING_LANDMARK_PAIR
+    matrix = np.full((4, 4), np.nan, dtype=np.float32)
+    matrix[0] = [0.3, 0.3, missing_x, missing_y]
+    matrix[3] = [missing_x, missing_y, 0.6, 0.6]
+    skipped = np.array([False, True, True, False])
+
+    interpolate_skipped_rows(matrix, skipped)
+
+    # nearer neighbour wins wherever either side is missing
+    np.testing.assert_allclose(matrix[1], [0.3, 0.3, missing_x, missing_y])
+    np.testing.assert_allclose(matrix[2], [missing_x, missing_y, 0.6, 0.6])
+
+
+def test_feature_encoding_id_names_non_default_profiles_only():
+    assert feature_encoding_id(DEFAULT_DETECTOR_PROFILE) == FEATURE_ENCODING_ID
+    assert feature_encoding_id("hands_only") == f"{FEATURE_ENCODING_ID}+hands_only"
+
+
+def test_feature_encoding_id_names_non_float32_storage():
+    assert feature_encoding_id(storage="float32") == FEATURE_ENCODING_ID
+    assert feature_encoding_id(storage="float16") == (
+        f"{FEATURE_ENCODING_ID};storage=float16"
+    )
+    assert feature_encoding_id("hands_only", storage="int16_delta") == (
+        f"{FEATURE_ENCODING_ID}+hands_only;storage=int16_delta;scale=6.103515625e-05"
+    )
+
+
+def test_compute_capture_quality_masks_and_summary():
+    region_columns = {
+        region.region: np.concatenate([region.x_columns, region.y_columns])
+        for region in FEATURE_LAYOUT.regions
+    }
+    matrix = np.full((6, FEATURE_DIM), 0.5, dtype=np.float32)
+    matrix[:, region_columns["face"]] = 0.0  # face never detected
+    matrix[1:4, region_columns["left_hand"]] = 0.0  # 3-frame hand dropout
+    matrix[5, region_columns["left_hand"]] = 0.0
+    matrix[0, 0:2] = 0.0  # pose landmark 0 missing
+    matrix[4] = 0.0  # nothing detected
+
+    interpolated = np.zeros(6, dtype=bool)
+    interpolated[[1, 3]] = True
+
+    quality = compute_capture_quality(matrix, interpolated)
+
+    assert quality.region_names == ("pose", "left_hand", "right_hand", "face")
+    assert quality.missing_regions.dtype == bool
+    np.testing.assert_array_equal(
+        quality.missing_regions,
+        [
+            [False, False, False, True],
+            [False, True, False, True],
+            [False, True, False, True],
+            [False, True, False, True],
+            [True, True, True, True],
+            [False, True, False, True],
+        ],
+    )
+    assert quality.missing_fraction.shape == (6,)
+    assert quality.missing_fraction[4] == 1.0
+    assert quality.missing_fraction[0] == np.float32((32 + 1) / 107)
+
+    summary = quality.summary
+    assert summary["frames"] == 6
+    assert summary["interpolated_frames"] == 2
+    assert summary["empty_frames"] == 1
+    assert summary["regions"]["face"] == {
+        "missing_fraction": 1.0,
+        "longest_gap_frames": 6,
+    }
+    assert summary["regions"]["left_hand"] == {
+        "missing_fraction": round(5 / 6, 4),
+        "longest_gap_frames": 5,
+    }
+    assert summary["regions"]["pose"]["longest_gap_frames"] == 1
+    assert summary["regions"]["right_hand"]["missing_fraction"] == round(1 / 6, 4)
+
+
+def test_compute_frame_timing_uses_median_interval_and_reports_jitter():
+    offsets = np.array([0, 66, 133, 200, 400], dtype=np.int32)
+
+    timing = compute_frame_timing(offsets)
+
+    assert timing.offsets_ms.dtype == np.int32
+    np.testing.assert_array_equal(timing.offsets_ms, offsets)
+    assert timing.fps_estimate == pytest.approx(1000 / 67)
+    assert timing.jitter_ms == pytest.approx(np.std([66, 67, 67, 200]))
+    assert timing.max_interval_ms == 200.0
+
+
+def test_compute_frame_timing_single_row_is_undefined():
+    timing = compute_frame_timing(np.zeros(1, dtype=np.int32))
+
+    assert (timing.fps_estimate, timing.jitter_ms, timing.max_interval_ms) == (
+        0.0,
+        0.0,
+        0.0,
+    )
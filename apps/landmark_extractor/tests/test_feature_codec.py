@@ -0,0 +1,91 @@
+# apps/landmark_extractor/tests/test_feature_codec.py
+
+import numpy as np
+import pytest
+
+from apps.landmark_extractor.config import (
+    FEATURE_ARTIFACT_ARRAY_KEY,
+    FEATURE_ARTIFACT_STORAGE_KEY,
+    FEATURE_DIM,
+    FEATURE_INT16_SCALE,
+)
+from apps.landmark_extractor.feature_codec import (
+    FeatureCodecError,
+    decode_feature_matrix,
+    encode_feature_matrix,
+)
+
+
+def _landmark_matrix(rows=30, seed=0):
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0.0, 1.0, size=FEATURE_DIM)
+    steps = rng.normal(0.0, 0.005, size=(rows, FEATURE_DIM))
+    matrix = (start + np.cumsum(steps, axis=0)).astype(np.float32)
+    matrix[:, :10] = 0.0  # missing landmarks
+    return matrix
+
+
+def test_float32_encoding_stores_matrix_unchanged():
+    matrix = _landmark_matrix()
+
+    arrays = encode_feature_matrix(matrix, "float32")
+
+    assert set(arrays) == {FEATURE_ARTIFACT_ARRAY_KEY}
+    np.testing.assert_array_equal(decode_feature_matrix(arrays), matrix)
+
+
+@pytest.mark.parametrize(
+    "storage, stored_dtype, atol",
+    [
+        ("float16", np.float16, 1e-3),
+        ("int16", np.int16, FEATURE_INT16_SCALE / 2),
+        ("int16_delta", np.int16, FEATURE_INT16_SCALE / 2),
+    ],
+)
+def test_compact_encodings_round_trip_to_float32(storage, stored_dtype, atol):
+    matrix = _landmark_matrix()
+
+    arrays = encode_feature_matrix(matrix, storage)
+    decoded = decode_feature_matrix(arrays)
+
+    assert arrays[FEATURE_ARTIFACT_ARRAY_KEY].dtype == stored_dtype
+    assert str(arrays[FEATURE_ARTIFACT_STORAGE_KEY]) == storage
+    assert decoded.dtype == np.float32
+    assert decoded.shape == matrix.shape
+    np.testing.assert_allclose(decoded, matrix, rtol=0, atol=atol)
+    # the missing-landmark fill survives exactly
+    assert (decoded[:, :10] == 0.0).all()
+
+
+def test_int16_delta_decodes_identically_to_int16_across_wraparound():
+    matrix = np.zeros((4, FEATURE_DIM), dtype=np.float32)
+    matrix[0, 0] = -1.99
+    matrix[1, 0] = 1.99  # difference exceeds the int16 range
+    matrix[2, 0] = -1.99
+    matrix[3, 0] = 0.5
+
+    plain = decode_feature_matrix(encode_feature_matrix(matrix, "int16"))
+    delta = decode_feature_matrix(encode_feature_matrix(matrix, "int16_delta"))
+
+    np.testing.assert_array_equal(delta, plain)
+
+
+def test_int16_encoding_clips_out_of_range_values():
+    matrix = np.full((1, FEATURE_DIM), 5.0, dtype=np.float32)
+
+    decoded = decode_feature_matrix(encode_feature_matrix(matrix, "int16"))
+
+    assert decoded.max() == pytest.approx(np.iinfo(np.int16).max * FEATURE_INT16_SCALE)
+
+
+def test_encode_rejects_unknown_storage_encoding():
+    with pytest.raises(FeatureCodecError):
+        encode_feature_matrix(_landmark_matrix(), "bfloat16")
+
+
+def test_decode_rejects_int16_artifact_without_scale():
+    arrays = encode_feature_matrix(_landmark_matrix(), "int16")
+    del arrays["scale"]
+
+    with pytest.raises(FeatureCodecError):
+        decode_feature_matrix(arrays)
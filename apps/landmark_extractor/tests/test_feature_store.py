@@ -0,0 +1,167 @@
+# apps/landmark_extractor/tests/test_feature_store.py
+
+import os
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from apps.landmark_extractor import config
+from apps.landmark_extractor.artifact_writer import (
+    delete_feature_artifact,
+    seal_feature_artifact,
+    stage_feature_artifact,
+    write_feature_artifact,
+)
+from apps.landmark_extractor.config import FEATURE_ARTIFACT_ARRAY_KEY, FEATURE_DIM
+from apps.landmark_extractor.feature_store import (
+    FeatureStoreError,
+    collect_garbage,
+    publish_feature_artifact,
+)
+from utils.paths import feature_artifact_path, feature_blob_path, feature_ref_path
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    root = tmp_path / "data"
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", root)
+    monkeypatch.setattr(config, "FEATURE_ARTIFACT_STORE", "content_addressed")
+    return root
+
+
+def _write(matrix, session_id="session-1", capture_id=None):
+    return write_feature_artifact(
+        user_id="user-1",
+        session_id=session_id,
+        capture_id=capture_id or uuid4(),
+        feature_matrix=matrix,
+    )
+
+
+def _matrix(value=0.5, rows=3):
+    return np.full((rows, FEATURE_DIM), value, dtype=np.float32)
+
+
+def test_identical_matrices_share_one_blob(data_root):
+    first = _write(_matrix())
+    retried = _write(_matrix(), session_id="session-2")
+
+    assert first.artifact_hash == retried.artifact_hash
+
+    blob = feature_blob_path(data_root, first.artifact_hash)
+    assert first.artifact_path == retried.artifact_path == str(blob)
+    assert os.stat(blob).st_nlink == 3
+    for result in (first, retried):
+        assert os.path.samefile(feature_ref_path(data_root, result.capture_id), blob)
+    assert len(list((data_root / "blobs" / "sha256").rglob("*.npz"))) == 1
+
+    with np.load(retried.artifact_path) as archive:
+        np.testing.assert_array_equal(archive[FEATURE_ARTIFACT_ARRAY_KEY], _matrix())
+
+
+def test_distinct_matrices_get_distinct_blobs(data_root):
+    a = _write(_matrix(0.1))
+    b = _write(_matrix(0.2))
+
+    assert a.artifact_hash != b.artifact_hash
+    assert len(list((data_root / "blobs" / "sha256").rglob("*.npz"))) == 2
+
+
+def test_content_addressed_store_leaves_session_directory_untouched(data_root):
+    capture_id = uuid4()
+    _write(_matrix(), capture_id=capture_id)
+
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    for row in _matrix(0.3):
+        staged.buffer.append(row)
+    seal_feature_artifact(staged)
+
+    capture_path = feature_artifact_path(data_root, "user-1", "session-1", capture_id)
+    assert not (data_root / "users").exists()
+    assert not capture_path.exists()
+    assert list((data_root / "blobs" / "staging").iterdir()) == []
+
+
+def test_delete_keeps_blob_shared_with_other_captures(data_root):
+    kept = _write(_matrix())
+    dropped = _write(_matrix())
+
+    delete_feature_artifact(
+        artifact_path=dropped.artifact_path, capture_id=dropped.capture_id
+    )
+
+    assert not feature_ref_path(data_root, dropped.capture_id).exists()
+    assert os.stat(kept.artifact_path).st_nlink == 2
+    assert collect_garbage(min_age_s=0).blobs_removed == 0
+
+
+def test_staged_artifact_seals_into_content_addressed_blob(data_root):
+    existing = _write(_matrix())
+
+    staged = stage_feature_artifact(
+        user_id="user-1", session_id="session-1", capture_id=uuid4()
+    )
+    for row in _matrix():
+        staged.buffer.append(row)
+    result = seal_feature_artifact(staged)
+
+    blob = feature_blob_path(data_root, result.artifact_hash)
+    assert result.artifact_path == str(blob)
+    assert os.path.samefile(feature_ref_path(data_root, staged.capture_id), blob)
+    assert not staged.staging_path.exists()
+    np.testing.assert_array_equal(staged.buffer.view(), _matrix())
+    # staged and streamed archives differ in bytes, so no dedup between them
+    assert result.artifact_hash != existing.artifact_hash
+
+
+def test_collect_garbage_removes_only_unreferenced_old_blobs(data_root):
+    kept = _write(_matrix(0.1))
+    dropped = _write(_matrix(0.2))
+    delete_feature_artifact(
+        artifact_path=dropped.artifact_path, capture_id=dropped.capture_id
+    )
+
+    dropped_blob = feature_blob_path(data_root, dropped.artifact_hash)
+    kept_blob = feature_blob_path(data_root, kept.artifact_hash)
+
+    # too young with the default minimum age
+    assert collect_garbage().blobs_removed == 0
+
+    dry = collect_garbage(min_age_s=0, dry_run=True)
+    assert (dry.blobs_scanned, dry.blobs_removed) == (2, 1)
+    assert dropped_blob.exists()
+
+    result = collect_garbage(min_age_s=0)
+
+    assert result.blobs_removed == 1
+    assert result.bytes_freed > 0
+    assert not dropped_blob.exists()
+    assert kept_blob.exists()
+    assert kept.artifact_path == str(kept_blob)
+
+
+def test_collect_garbage_tolerates_missing_store(tmp_path):
+    result = collect_garbage(tmp_path / "empty", min_age_s=0)
+
+    assert result.blobs_scanned == 0
+
+
+def test_capture_path_store_writes_no_blobs(data_root, monkeypatch):
+    monkeypatch.setattr(config, "FEATURE_ARTIFACT_STORE", "capture_path")
+
+    result = _write(_matrix())
+
+    assert os.stat(result.artifact_path).st_nlink == 1
+    assert not (data_root / "blobs").exists()
+
+
+def test_publish_rejects_unknown_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "FEATURE_ARTIFACT_STORE", "s3")
+    temp_path = tmp_path / "artifact.tmp"
+    temp_path.write_bytes(b"x")
+
+    with pytest.raises(FeatureStoreError):
+        publish_feature_artifact(temp_path, tmp_path / "artifact.npz", "0" * 64)
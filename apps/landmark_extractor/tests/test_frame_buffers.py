@@ -0,0 +1,42 @@
+# apps/landmark_extractor/tests/test_frame_buffers.py
+
+import pytest
+
+from apps.landmark_extractor.frame_buffers import FrameBufferPool
+
+
+def test_frame_buffer_pool_reuses_buffer_per_size_and_counts_hits():
+    pool = FrameBufferPool(max_sizes=2)
+
+    first = pool.get(320, 240)
+    second = pool.get(320, 240)
+    other = pool.get(160, 120)
+
+    assert first is second
+    assert first.shape == (240, 320, 3)
+    assert other.shape == (120, 160, 3)
+
+    stats = pool.stats()
+    assert (stats.sizes, stats.hits, stats.misses) == (2, 1, 2)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_frame_buffer_pool_evicts_least_recently_used_size():
+    pool = FrameBufferPool(max_sizes=2)
+
+    a = pool.get(10, 10)
+    pool.get(20, 20)
+    pool.get(10, 10)  # refresh (10, 10)
+    pool.get(30, 30)  # evicts (20, 20)
+
+    assert pool.get(10, 10) is a
+    assert pool.stats().sizes == 2
+
+    pool.get(20, 20)
+    assert pool.stats().misses == 4
+
+
+def test_frame_buffer_pool_rejects_non_positive_max_sizes():
+    with pytest.raises(ValueError):
+        FrameBufferPool(max_sizes=0)
+    assert FrameBufferPool().stats().hit_rate == 0.0
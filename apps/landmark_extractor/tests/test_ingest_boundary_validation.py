@@ -65,3 +65,63 @@ def test_ingest_boundary_validates_union(monkeypatch):
 
     with pytest.raises(ValidationError):
         asyncio.run(ingest(bad_terminal))
+
+
+def _frame_bytes_msg(frame_bytes):
+    return {
+        "schema_version": "1.0.1",
+        "record_id": str(uuid4()),
+        "user_id": "u1",
+        "session_id": "s1",
+        "timestamp": datetime.now(timezone.utc),
+        "event": "capture.frame_bytes",
+        "capture_id": str(uuid4()),
+        "seq": 1,
+        "timestamp_frame": datetime.now(timezone.utc),
+        "frame_bytes": frame_bytes,
+    }
+
+
+def test_ingest_boundary_passes_frame_bytes_through_without_copy(monkeypatch):
+    captured = {"messages": []}
+
+    async def fake_handle_message(message):
+        captured["messages"].append(message)
+
+    monkeypatch.setattr(service, "handle_message", fake_handle_message)
+
+    payload = memoryview(bytearray(b"\xff\xd8fake-jpeg"))
+
+    asyncio.run(ingest(_frame_bytes_msg(payload)))
+
+    assert len(captured["messages"]) == 1
+    msg = captured["messages"][0]
+    assert msg.event == "capture.frame_bytes"
+    assert msg.frame_bytes is payload
+    assert "frame_bytes" not in msg.model_dump()
+
+
+@pytest.mark.parametrize("bad_payload", [b"", "ZmFrZQ==", memoryview(b"abcd")[::2]])
+def test_ingest_boundary_rejects_invalid_frame_bytes(monkeypatch, bad_payload):
+    async def fake_handle_message(message):
+        raise AssertionError("handle_message should not be called")
+
+    monkeypatch.setattr(service, "handle_message", fake_handle_message)
+
+    with pytest.raises(ValidationError):
+        asyncio.run(ingest(_frame_bytes_msg(bad_payload)))
+
+
+def test_frame_schemas_share_fields_and_timestamp_coercion():
+    from schemas import LandmarkExtractorFrameBytesInput, LandmarkExtractorFrameInput
+
+    frame_bytes_fields = set(LandmarkExtractorFrameBytesInput.model_fields)
+    frame_fields = set(LandmarkExtractorFrameInput.model_fields)
+    assert frame_bytes_fields - {"frame_bytes"} == frame_fields - {"frame_data"}
+
+    message = _frame_bytes_msg(b"\xff\xd8fake-jpeg")
+    message["timestamp_frame"] = "2026-02-04T12:00:00"
+
+    msg = LandmarkExtractorFrameBytesInput(**message)
+
+    assert msg.timestamp_frame == datetime(2026, 2, 4, 12, tzinfo=timezone.utc)
@@ -1,17 +1,39 @@
 # apps/landmark_extractor/tests/test_landmark_mediapipe.py
 
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
 
 from apps.landmark_extractor.domain import NormalizedLandmarks
+from apps.landmark_extractor.extractor import build_feature_row
 from apps.landmark_extractor.landmark_mediapipe import (
     MediaPipeBackendInitError,
     MediaPipeExtractionError,
     MediaPipeLandmarkBackend,
 )
+from apps.landmark_extractor.latency import LatencyRecorder
+
+
+@pytest.fixture
+def stub_landmarkers(monkeypatch):
+    """
+    Build backends without the .task model files.
+
+    Tests using this swap in their own fake detectors after construction.
+    """
+    from apps.landmark_extractor import landmark_mediapipe
+
+    class StubFactory:
+        @staticmethod
+        def create_from_options(options):
+            return SimpleNamespace(close=lambda: None)
+
+    for attr in ("PoseLandmarker", "HandLandmarker", "FaceLandmarker"):
+        monkeypatch.setattr(landmark_mediapipe, attr, StubFactory)
 
 
 def test_mediapipe_backend_runs_one_frame():
@@ -80,3 +102,487 @@ def test_mediapipe_backend_returns_xy_pairs_only():
             assert isinstance(value, tuple)
             assert len(value) == 2
             assert all(isinstance(v, float) for v in value)
+
+
+def test_mediapipe_backend_concurrent_mode_merges_detector_results(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        concurrent_detectors=True,
+    )
+
+    thread_names = []
+
+    class FakeDetector:
+        def __init__(self, result):
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            thread_names.append(threading.current_thread().name)
+            return self._result
+
+    point = SimpleNamespace(x=0.25, y=0.75)
+    backend._pose_landmarker = FakeDetector(SimpleNamespace(pose_landmarks=[[point]]))
+    backend._hand_landmarker = FakeDetector(
+        SimpleNamespace(
+            hand_landmarks=[[point]],
+            handedness=[[SimpleNamespace(category_name="Left")]],
+        )
+    )
+    backend._face_landmarker = FakeDetector(SimpleNamespace(face_landmarks=[[point]]))
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    result = backend.extract_landmarks(frame, datetime.now(timezone.utc))
+    backend.close()
+
+    assert backend.concurrent_detectors is False
+    assert result.pose == {0: (0.25, 0.75)}
+    assert result.left_hand == {0: (0.25, 0.75)}
+    assert result.right_hand == {}
+    assert result.face == {0: (0.25, 0.75)}
+    assert len(thread_names) == 3
+    assert all(name.startswith("mediapipe-detector") for name in thread_names)
+
+
+def test_mediapipe_backend_timestamps_increase_across_streams(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+    )
+
+    first_stream_start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    second_stream_start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    backend.begin_stream()
+    a = backend._to_timestamp_ms(first_stream_start)
+    b = backend._to_timestamp_ms(first_stream_start + timedelta(milliseconds=66))
+
+    backend.begin_stream()
+    c = backend._to_timestamp_ms(second_stream_start)
+    d = backend._to_timestamp_ms(second_stream_start + timedelta(milliseconds=66))
+
+    assert a < b < c < d
+    assert b - a == 66
+    assert d - c == 66
+
+
+def test_mediapipe_backend_feature_row_matches_landmark_map_path(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+    )
+
+    class FakeDetector:
+        def __init__(self, result):
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            return self._result
+
+    def points(count, offset):
+        return [
+            SimpleNamespace(x=np.float32(offset + i / 1000), y=np.float32(i / 500))
+            for i in range(count)
+        ]
+
+    backend._pose_landmarker = FakeDetector(
+        SimpleNamespace(pose_landmarks=[points(33, 0.1)])
+    )
+    backend._hand_landmarker = FakeDetector(
+        SimpleNamespace(
+            hand_landmarks=[points(21, 0.2), points(21, 0.3)],
+            handedness=[
+                [SimpleNamespace(category_name="Right")],
+                [SimpleNamespace(category_name="Unknown")],
+            ],
+        )
+    )
+    # 468 points: the iris landmarks of the face subset are absent
+    backend._face_landmarker = FakeDetector(
+        SimpleNamespace(face_landmarks=[points(468, 0.4)])
+    )
+
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    ts = datetime.now(timezone.utc)
+
+    reference = np.asarray(
+        build_feature_row(backend.extract_landmarks(frame, ts)), dtype=np.float32
+    )
+    row = backend.extract_feature_row(frame, ts + timedelta(milliseconds=66))
+
+    np.testing.assert_array_equal(row, reference)
+
+
+def test_mediapipe_backend_downscales_before_color_conversion(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=320,
+    )
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # pure blue in BGR
+
+    rgb = backend._prepare_rgb_frame(frame)
+
+    assert rgb.shape == (240, 320, 3)
+    assert rgb[0, 0].tolist() == [0, 0, 255]
+
+    small = np.zeros((120, 160, 3), dtype=np.uint8)
+    assert backend._prepare_rgb_frame(small).shape == (120, 160, 3)
+
+
+def test_mediapipe_backend_rejects_non_positive_max_long_side():
+    with pytest.raises(ValueError):
+        MediaPipeLandmarkBackend(
+            pose_model_path="models/mediapipe/pose_landmarker.task",
+            hand_model_path="models/mediapipe/hand_landmarker.task",
+            face_model_path="models/mediapipe/face_landmarker.task",
+            max_long_side=0,
+        )
+
+
+def test_mediapipe_backend_reuses_frame_buffers_across_frames(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=320,
+    )
+
+    first = backend._prepare_rgb_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+    second = backend._prepare_rgb_frame(np.ones((480, 640, 3), dtype=np.uint8))
+
+    assert second is first
+    assert second.shape == (240, 320, 3)
+    assert second.min() == 1
+
+    stats = backend.frame_buffer_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_mediapipe_backend_passes_rgb_input_through_at_target_size(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=320,
+        input_color_order="rgb",
+    )
+
+    small = np.zeros((240, 320, 3), dtype=np.uint8)
+    small[..., 0] = 255  # pure red in RGB
+    large = np.zeros((480, 640, 3), dtype=np.uint8)
+    large[..., 0] = 255
+
+    assert backend._prepare_rgb_frame(small) is small
+    assert backend._prepare_rgb_frame(large)[0, 0].tolist() == [255, 0, 0]
+
+    with pytest.raises(ValueError):
+        MediaPipeLandmarkBackend(
+            pose_model_path="models/mediapipe/pose_landmarker.task",
+            hand_model_path="models/mediapipe/hand_landmarker.task",
+            face_model_path="models/mediapipe/face_landmarker.task",
+            input_color_order="bgra",
+        )
+
+
+def test_mediapipe_backend_pose_roi_crops_and_remaps_to_full_frame(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=None,
+        pose_roi=True,
+    )
+
+    seen_sizes = {}
+
+    class FakeDetector:
+        def __init__(self, name, make_result):
+            self._name = name
+            self._make_result = make_result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            return self.detect(mp_image)
+
+        def detect(self, mp_image):
+            seen_sizes[self._name] = (mp_image.width, mp_image.height)
+            return self._make_result()
+
+    pose = [SimpleNamespace(x=0.5, y=0.5, visibility=0.0) for _ in range(33)]
+    pose[11] = SimpleNamespace(x=0.4, y=0.6, visibility=1.0)
+    pose[12] = SimpleNamespace(x=0.6, y=0.6, visibility=1.0)
+    pose[0] = SimpleNamespace(x=0.5, y=0.3, visibility=1.0)
+
+    backend._pose_landmarker = FakeDetector(
+        "pose", lambda: SimpleNamespace(pose_landmarks=[pose])
+    )
+    backend._hand_landmarker = FakeDetector(
+        "hand", lambda: SimpleNamespace(hand_landmarks=[], handedness=[])
+    )
+    backend._face_landmarker = FakeDetector(
+        "face",
+        lambda: SimpleNamespace(face_landmarks=[[SimpleNamespace(x=0.5, y=0.5)]]),
+    )
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    result = backend.extract_landmarks(frame, datetime.now(timezone.utc))
+
+    # no visible hand anchor -> full frame; face crop around the nose
+    assert seen_sizes["pose"] == (640, 480)
+    assert seen_sizes["hand"] == (640, 480)
+    face_w, face_h = seen_sizes["face"]
+    assert face_w < 640 and face_h < 480
+
+    # crop centre maps back to the nose position in full-frame coordinates
+    face_x, face_y = result.face[0]
+    assert face_x == pytest.approx(0.5, abs=2 / 640)
+    assert face_y == pytest.approx(0.3, abs=2 / 480)
+
+
+def test_mediapipe_backend_pose_roi_runs_hand_and_face_in_image_mode(monkeypatch):
+    from apps.landmark_extractor import landmark_mediapipe
+
+    modes = {}
+
+    def recording_factory(name):
+        class Factory:
+            @staticmethod
+            def create_from_options(options):
+                modes[name] = options.running_mode
+                return SimpleNamespace(close=lambda: None)
+
+        return Factory
+
+    for name, attr in (
+        ("pose", "PoseLandmarker"),
+        ("hand", "HandLandmarker"),
+        ("face", "FaceLandmarker"),
+    ):
+        monkeypatch.setattr(landmark_mediapipe, attr, recording_factory(name))
+
+    RunningMode = landmark_mediapipe.RunningMode
+
+    MediaPipeLandmarkBackend("pose.task", "hand.task", "face.task", pose_roi=True)
+    assert modes == {
+        "pose": RunningMode.VIDEO,
+        "hand": RunningMode.IMAGE,
+        "face": RunningMode.IMAGE,
+    }
+
+    MediaPipeLandmarkBackend("pose.task", "hand.task", "face.task", pose_roi=False)
+    assert set(modes.values()) == {RunningMode.VIDEO}
+
+
+def test_mediapipe_backend_pose_roi_falls_back_to_full_frame_without_pose(
+    stub_landmarkers,
+):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=None,
+        pose_roi=True,
+    )
+
+    images = []
+
+    class FakeDetector:
+        def __init__(self, result):
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            return self.detect(mp_image)
+
+        def detect(self, mp_image):
+            images.append(mp_image)
+            return self._result
+
+    point = SimpleNamespace(x=0.25, y=0.75)
+    backend._pose_landmarker = FakeDetector(SimpleNamespace(pose_landmarks=[]))
+    backend._hand_landmarker = FakeDetector(
+        SimpleNamespace(
+            hand_landmarks=[[point]],
+            handedness=[[SimpleNamespace(category_name="Right")]],
+        )
+    )
+    backend._face_landmarker = FakeDetector(SimpleNamespace(face_landmarks=[]))
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    result = backend.extract_landmarks(frame, datetime.now(timezone.utc))
+
+    assert images[0] is images[1] is images[2]
+    assert result.right_hand == {0: (0.25, 0.75)}
+
+
+def test_mediapipe_backend_warmup_runs_every_detector_before_streams(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+    )
+
+    calls = []
+
+    class FakeDetector:
+        def __init__(self, name):
+            self._name = name
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            calls.append((self._name, timestamp_ms))
+
+    backend._pose_landmarker = FakeDetector("pose")
+    backend._hand_landmarker = FakeDetector("hand")
+    backend._face_landmarker = FakeDetector("face")
+
+    backend.warmup()
+    backend.begin_stream()
+    first_frame_ms = backend._to_timestamp_ms(datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+    assert sorted(name for name, _ in calls) == ["face", "hand", "pose"]
+    assert first_frame_ms > max(ts for _, ts in calls)
+
+
+def test_mediapipe_backend_stream_runs_only_selected_detectors(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        concurrent_detectors=True,
+    )
+
+    calls = []
+
+    class FakeDetector:
+        def __init__(self, name, result):
+            self._name = name
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            calls.append(self._name)
+            return self._result
+
+    point = SimpleNamespace(x=0.25, y=0.75)
+    backend._pose_landmarker = FakeDetector(
+        "pose", SimpleNamespace(pose_landmarks=[[point]])
+    )
+    backend._hand_landmarker = FakeDetector(
+        "hand",
+        SimpleNamespace(
+            hand_landmarks=[[point]],
+            handedness=[[SimpleNamespace(category_name="Left")]],
+        ),
+    )
+    backend._face_landmarker = FakeDetector(
+        "face", SimpleNamespace(face_landmarks=[[point]])
+    )
+
+    backend.begin_stream(("hand",))
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    ts = datetime.now(timezone.utc)
+    result = backend.extract_landmarks(frame, ts)
+    row = backend.extract_feature_row(frame, ts + timedelta(milliseconds=66))
+    backend.close()
+
+    assert calls == ["hand", "hand"]
+    assert backend.active_detectors == frozenset({"hand"})
+    assert result.pose == {} and result.face == {}
+    assert result.left_hand == {0: (0.25, 0.75)}
+    np.testing.assert_array_equal(
+        row, np.asarray(build_feature_row(result), dtype=np.float32)
+    )
+
+
+def test_mediapipe_backend_pose_roi_skips_unselected_detectors(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        max_long_side=None,
+        pose_roi=True,
+    )
+
+    calls = []
+
+    class FakeDetector:
+        def __init__(self, name, result):
+            self._name = name
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            calls.append((self._name, mp_image.width))
+            return self._result
+
+        def detect(self, mp_image):
+            calls.append((self._name, mp_image.width))
+            return self._result
+
+    point = SimpleNamespace(x=0.25, y=0.75)
+    backend._pose_landmarker = FakeDetector("pose", SimpleNamespace())
+    backend._hand_landmarker = FakeDetector(
+        "hand",
+        SimpleNamespace(
+            hand_landmarks=[[point]],
+            handedness=[[SimpleNamespace(category_name="Right")]],
+        ),
+    )
+    backend._face_landmarker = FakeDetector("face", SimpleNamespace())
+
+    backend.begin_stream(("hand",))
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    result = backend.extract_landmarks(frame, datetime.now(timezone.utc))
+
+    assert calls == [("hand", 640)]
+    assert result.right_hand == {0: (0.25, 0.75)}
+
+
+def test_mediapipe_backend_begin_stream_rejects_unknown_detector(stub_landmarkers):
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+    )
+
+    with pytest.raises(ValueError):
+        backend.begin_stream(("hand", "iris"))
+
+
+def test_mediapipe_backend_records_detector_stage_latency(stub_landmarkers):
+    latency = LatencyRecorder()
+    backend = MediaPipeLandmarkBackend(
+        pose_model_path="models/mediapipe/pose_landmarker.task",
+        hand_model_path="models/mediapipe/hand_landmarker.task",
+        face_model_path="models/mediapipe/face_landmarker.task",
+        latency=latency,
+    )
+
+    class FakeDetector:
+        def __init__(self, result):
+            self._result = result
+
+        def detect_for_video(self, mp_image, timestamp_ms):
+            return self._result
+
+    backend._pose_landmarker = FakeDetector(SimpleNamespace(pose_landmarks=[]))
+    backend._hand_landmarker = FakeDetector(
+        SimpleNamespace(hand_landmarks=[], handedness=[])
+    )
+    backend._face_landmarker = FakeDetector(SimpleNamespace(face_landmarks=[]))
+
+    backend.begin_stream(("pose", "hand"))
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    backend.extract_feature_row(frame, datetime.now(timezone.utc))
+
+    stats = latency.stats()
+    assert set(stats) == {
+        "prepare_rgb",
+        "detect_pose",
+        "detect_hand",
+        "gather_features",
+    }
+    assert all(stage.count == 1 for stage in stats.values())
@@ -0,0 +1,76 @@
+# apps/landmark_extractor/tests/test_latency.py
+
+import pytest
+
+from apps.landmark_extractor.latency import (
+    LatencyHistogram,
+    LatencyRecorder,
+    StageTotals,
+)
+
+
+def test_latency_histogram_percentiles_within_bucket_resolution():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000.0)
+
+    stats = histogram.stats("decode")
+
+    assert stats.stage == "decode"
+    assert stats.count == 100
+    assert stats.mean_ms == pytest.approx(50.5)
+    assert stats.max_ms == pytest.approx(100.0)
+    assert stats.p50_ms == pytest.approx(50.0, rel=0.1)
+    assert stats.p95_ms == pytest.approx(95.0, rel=0.1)
+    assert stats.p99_ms == pytest.approx(99.0, rel=0.1)
+    assert stats.p50_ms <= stats.p95_ms <= stats.p99_ms <= stats.max_ms
+
+
+def test_latency_histogram_empty_stats_are_zero():
+    stats = LatencyHistogram().stats("extract")
+
+    assert stats.count == 0
+    assert stats.mean_ms == 0.0
+    assert stats.p99_ms == 0.0
+
+
+def test_latency_recorder_span_records_stage_and_capture_totals():
+    recorder = LatencyRecorder()
+    totals = StageTotals()
+
+    with recorder.span("decode", totals):
+        pass
+    with pytest.raises(RuntimeError):
+        with recorder.span("decode", totals):
+            raise RuntimeError("boom")
+
+    stats = recorder.stats()
+    assert set(stats) == {"decode"}
+    assert stats["decode"].count == 2
+
+    summary = totals.as_dict()
+    assert set(summary) == {"decode"}
+    assert summary["decode"]["count"] == 2
+    assert summary["decode"]["total_ms"] >= summary["decode"]["max_ms"] >= 0.0
+
+
+def test_latency_recorder_reset_drops_samples():
+    recorder = LatencyRecorder()
+    recorder.record("extract", 0.01)
+
+    recorder.reset()
+
+    assert recorder.stats() == {}
+
+
+def test_disabled_latency_recorder_records_nothing():
+    recorder = LatencyRecorder(enabled=False)
+    totals = StageTotals()
+
+    with recorder.span("decode", totals):
+        pass
+    recorder.record("extract", 0.01)
+
+    assert recorder.enabled is False
+    assert recorder.stats() == {}
+    assert totals.as_dict() == {}
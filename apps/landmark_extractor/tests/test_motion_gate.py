@@ -0,0 +1,26 @@
+# apps/landmark_extractor/tests/test_motion_gate.py
+
+import numpy as np
+
+from apps.landmark_extractor.motion_gate import motion_score, motion_signature
+
+
+def test_motion_signature_is_small_grayscale_thumbnail():
+    frame = np.full((480, 640, 3), 200, dtype=np.uint8)
+
+    signature = motion_signature(frame, size=(32, 24))
+
+    assert signature.shape == (24, 32)
+    assert signature.dtype == np.uint8
+    assert int(signature[0, 0]) == 200
+
+
+def test_motion_score_is_zero_for_identical_and_grows_with_change():
+    frame = np.full((48, 64, 3), 100, dtype=np.uint8)
+    moved = frame.copy()
+    moved[:, :32] = 160
+
+    reference = motion_signature(frame)
+
+    assert motion_score(reference, motion_signature(frame)) == 0.0
+    assert motion_score(reference, motion_signature(moved)) == 30.0
@@ -0,0 +1,40 @@
+# apps/landmark_extractor/tests/test_pose_roi.py
+
+import numpy as np
+
+from apps.landmark_extractor.domain import CropBox
+from apps.landmark_extractor.pose_roi import (
+    POSE_FACE_ANCHORS,
+    POSE_HAND_ANCHORS,
+    pose_crop_box,
+)
+
+
+def _pose_xy():
+    xy = np.full((33, 2), np.nan, dtype=np.float32)
+    xy[11] = (0.375, 0.5)  # shoulders: 0.25 * 640 = 160 px apart
+    xy[12] = (0.625, 0.5)
+    xy[list(POSE_FACE_ANCHORS)] = (0.5, 0.25)
+    return xy
+
+
+def test_pose_crop_box_pads_visible_anchors_by_shoulder_width():
+    crop = pose_crop_box(_pose_xy(), POSE_FACE_ANCHORS, 0.5, 640, 480)
+
+    # face point at (320, 120), pad 80 px
+    assert crop == CropBox(x0=240, y0=40, x1=400, y1=200)
+    assert (crop.width, crop.height) == (160, 160)
+
+
+def test_pose_crop_box_clips_to_frame():
+    xy = _pose_xy()
+    xy[15] = (0.01, 0.99)
+
+    crop = pose_crop_box(xy, POSE_HAND_ANCHORS, 0.5, 640, 480)
+
+    assert crop.x0 == 0 and crop.y1 == 480
+
+
+def test_pose_crop_box_returns_none_without_visible_anchor_or_for_large_crop():
+    assert pose_crop_box(_pose_xy(), POSE_HAND_ANCHORS, 0.5, 640, 480) is None
+    assert pose_crop_box(_pose_xy(), POSE_FACE_ANCHORS, 5.0, 640, 480) is None
@@ -7,10 +7,26 @@ import pytest
 
 from apps.landmark_extractor import service
 from apps.landmark_extractor.config import FEATURE_DIM
-from apps.landmark_extractor.domain import CaptureState
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
 from schemas import LandmarkExtractorTerminalInput
 
 
+class FakeBackendPool:
+    """Stands in for MediaPipeBackendPool so no MediaPipe models are loaded."""
+
+    def __init__(self):
+        self.released = []
+
+    def lease(self):
+        raise AssertionError("abort must not lease a backend")
+
+    def release(self, backend):
+        self.released.append(backend)
+
+    def stats(self):
+        return None
+
+
 def test_handle_abort_rejects_terminal_capture():
     service._ACTIVE_CAPTURES.clear()
     service._TERMINAL_CAPTURE_IDS.clear()
@@ -69,7 +85,7 @@ def test_handle_abort_clears_active_state():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     now = datetime.now(timezone.utc)
@@ -101,7 +117,7 @@ def test_handle_abort_marks_capture_terminal():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     now = datetime.now(timezone.utc)
@@ -133,7 +149,7 @@ def test_handle_abort_writes_no_artifact(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fail_write(**kwargs):
@@ -168,7 +184,7 @@ def test_handle_abort_emits_no_event(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fail_append(**kwargs):
@@ -191,3 +207,101 @@ def test_handle_abort_emits_no_event(monkeypatch):
     )
 
     service._handle_abort(message)
+
+
+def test_handle_abort_returns_leased_backend_to_pool(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    backend = object()
+    pool = FakeBackendPool()
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", pool)
+
+    capture_id = uuid4()
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
+    )
+    service._CAPTURE_BACKENDS[capture_id] = backend
+
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.abort",
+        timestamp_end=now,
+        error_code="capture_aborted",
+    )
+
+    service._handle_abort(message)
+
+    assert pool.released == [backend]
+    assert capture_id not in service._CAPTURE_BACKENDS
+
+
+def test_handle_abort_unlinks_staged_artifact(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+    from schemas import LandmarkExtractorFrameInput
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", "mmap")
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: [0.1] * FEATURE_DIM
+        ),
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    service._handle_frame(
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=1,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+        )
+    )
+
+    staged = service._ACTIVE_CAPTURES[capture_id].staged_artifact
+    assert staged.staging_path.exists()
+
+    service._handle_abort(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.abort",
+            timestamp_end=now,
+            error_code="capture_aborted",
+        )
+    )
+
+    assert not staged.staging_path.exists()
+    assert not staged.artifact_path.exists()
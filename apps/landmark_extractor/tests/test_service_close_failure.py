@@ -7,7 +7,7 @@ import pytest
 
 from apps.landmark_extractor import service
 from apps.landmark_extractor.config import FEATURE_DIM
-from apps.landmark_extractor.domain import CaptureState
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
 from schemas import LandmarkExtractorTerminalInput
 
 
@@ -21,7 +21,7 @@ def test_handle_close_raises_finalize_error_when_feature_matrix_empty():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[],
+        feature_rows=FeatureBuffer(),
     )
 
     now = datetime.now(timezone.utc)
@@ -55,7 +55,7 @@ def test_handle_close_raises_finalize_error_when_feature_row_dim_mismatch():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[bad_row],
+        feature_rows=FeatureBuffer.from_rows([bad_row], dim=FEATURE_DIM - 1),
     )
 
     now = datetime.now(timezone.utc)
@@ -86,7 +86,7 @@ def test_handle_close_raises_finalize_error_when_artifact_write_fails(monkeypatc
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -127,7 +127,7 @@ def test_handle_close_rolls_back_artifact_when_append_event_fails(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -143,7 +143,7 @@ def test_handle_close_rolls_back_artifact_when_append_event_fails(monkeypatch):
     def fake_append_event(**kwargs):
         raise RuntimeError("append failure")
 
-    def fake_delete_feature_artifact(*, artifact_path: str):
+    def fake_delete_feature_artifact(*, artifact_path: str, capture_id=None):
         deleted["called"] = True
         deleted["artifact_path"] = artifact_path
 
@@ -184,7 +184,7 @@ def test_handle_close_preserves_active_state_when_append_event_fails(monkeypatch
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
     service._ACTIVE_CAPTURES[capture_id] = existing_state
 
@@ -236,7 +236,7 @@ def test_handle_close_does_not_mark_terminal_when_append_event_fails(monkeypatch
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -288,7 +288,7 @@ def test_handle_close_swallows_rollback_delete_failure_and_still_raises_finalize
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -332,3 +332,162 @@ def test_handle_close_swallows_rollback_delete_failure_and_still_raises_finalize
 
     assert capture_id in service._ACTIVE_CAPTURES
     assert capture_id not in service._TERMINAL_CAPTURE_IDS
+
+
+def test_handle_close_retry_commits_staged_capture_after_publish_failure(
+    tmp_path, monkeypatch
+):
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from apps.landmark_extractor import artifact_writer, config
+    from schemas import LandmarkExtractorFrameInput
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", "mmap")
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: [0.1] * FEATURE_DIM
+        ),
+    )
+
+    real_publish = artifact_writer.publish_feature_artifact
+    publish_calls = []
+
+    def flaky_publish(temp_path, artifact_path, content_hash):
+        publish_calls.append(temp_path)
+        if len(publish_calls) == 1:
+            raise OSError("transient rename failure")
+        real_publish(temp_path, artifact_path, content_hash)
+
+    monkeypatch.setattr(artifact_writer, "publish_feature_artifact", flaky_publish)
+
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    service._handle_frame(
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=1,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+        )
+    )
+
+    staged = service._ACTIVE_CAPTURES[capture_id].staged_artifact
+
+    message = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.close",
+        timestamp_end=now,
+        error_code=None,
+    )
+
+    with pytest.raises(service.LandmarkExtractorFinalizeError):
+        service._handle_close(message)
+
+    assert capture_id in service._ACTIVE_CAPTURES
+
+    service._handle_close(message)
+
+    assert capture_id in service._TERMINAL_CAPTURE_IDS
+    assert not staged.staging_path.exists()
+
+    with np.load(appended[0].raw_features_ref.uri) as archive:
+        np.testing.assert_array_equal(
+            archive["features"], np.float32([[0.1] * FEATURE_DIM])
+        )
+
+
+def test_handle_close_keeps_backend_lease_until_commit_succeeds(monkeypatch):
+    from types import SimpleNamespace
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    released = []
+    monkeypatch.setattr(
+        service,
+        "_BACKEND_POOL",
+        SimpleNamespace(release=released.append, stats=lambda: None),
+    )
+
+    capture_id = uuid4()
+    backend = object()
+
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
+    )
+    service._CAPTURE_BACKENDS[capture_id] = backend
+
+    def fake_write_feature_artifact(**kwargs):
+        return service.ArtifactWriteResult(
+            capture_id=capture_id,
+            artifact_path="artifact.npz",
+            artifact_hash="sha256:abc",
+            shape=(1, FEATURE_DIM),
+            dtype="float32",
+            format="npz",
+        )
+
+    append_failures = [RuntimeError("append failure")]
+
+    def flaky_append_event(**kwargs):
+        if append_failures:
+            raise append_failures.pop()
+
+    monkeypatch.setattr(service, "write_feature_artifact", fake_write_feature_artifact)
+    monkeypatch.setattr(service, "append_event", flaky_append_event)
+    monkeypatch.setattr(service, "delete_feature_artifact", lambda **kwargs: None)
+
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.close",
+        timestamp_end=now,
+        error_code=None,
+    )
+
+    with pytest.raises(service.LandmarkExtractorFinalizeError):
+        service._handle_close(message)
+
+    assert released == []
+    assert service._CAPTURE_BACKENDS[capture_id] is backend
+
+    service._handle_close(message)
+
+    assert released == [backend]
+    assert capture_id not in service._CAPTURE_BACKENDS
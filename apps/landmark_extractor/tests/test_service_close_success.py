@@ -1,14 +1,17 @@
 # apps/landmark_extractor/tests/test_service_close_success.py
 
+import hashlib
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from apps.landmark_extractor import service
-from apps.landmark_extractor.config import FEATURE_DIM
-from apps.landmark_extractor.domain import CaptureState
-from schemas import LandmarkExtractorTerminalInput
+from apps.landmark_extractor.config import FEATURE_DIM, FEATURE_ENCODING_ID
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
+from apps.landmark_extractor.latency import StageTotals
+from schemas import LandmarkExtractorFrameInput, LandmarkExtractorTerminalInput
 
 
 def test_handle_close_rejects_terminal_capture():
@@ -69,7 +72,7 @@ def test_handle_close_raises_when_feature_rows_empty():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[],
+        feature_rows=FeatureBuffer(),
     )
 
     now = datetime.now(timezone.utc)
@@ -102,7 +105,7 @@ def test_handle_close_writes_artifact_before_append_event(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -151,7 +154,7 @@ def test_handle_close_builds_and_appends_raw_features_ready_message(monkeypatch)
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     captured = {"message": None, "user_id": None, "session_id": None}
@@ -206,7 +209,7 @@ def test_handle_close_builds_and_appends_raw_features_ready_message(monkeypatch)
 
     assert appended.raw_features_ref.uri == "artifact.npz"
     assert appended.raw_features_ref.hash == "sha256:abc"
-    assert appended.raw_features_ref.encoding == service.FEATURE_ENCODING_ID
+    assert appended.raw_features_ref.encoding == FEATURE_ENCODING_ID
     assert appended.raw_features_ref.shape == [1, FEATURE_DIM]
     assert appended.raw_features_ref.dtype == "float32"
     assert appended.raw_features_ref.format == "npz"
@@ -222,7 +225,7 @@ def test_handle_close_clears_active_state_after_success(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -270,7 +273,7 @@ def test_handle_close_marks_capture_terminal_after_success(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     def fake_write_feature_artifact(**kwargs):
@@ -306,3 +309,525 @@ def test_handle_close_marks_capture_terminal_after_success(monkeypatch):
     service._handle_close(message)
 
     assert capture_id in service._TERMINAL_CAPTURE_IDS
+
+
+def test_handle_close_persists_artifact_referenced_by_event(tmp_path, monkeypatch):
+    from apps.landmark_extractor import config
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+
+    capture_id = uuid4()
+    rows = [[0.1] * FEATURE_DIM, [0.2] * FEATURE_DIM]
+
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer.from_rows(rows),
+    )
+
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    now = datetime.now(timezone.utc)
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    ref = appended[0].raw_features_ref
+    assert ref.shape == [2, FEATURE_DIM]
+
+    with open(ref.uri, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    assert ref.hash == f"sha256:{digest}"
+
+    with np.load(ref.uri) as archive:
+        np.testing.assert_array_equal(archive["features"], np.float32(rows))
+
+
+def test_handle_close_seals_staged_artifact(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+    from schemas import LandmarkExtractorFrameInput
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", "mmap")
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+
+    rows = iter([[0.1] * FEATURE_DIM, [0.2] * FEATURE_DIM])
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: next(rows)
+        ),
+    )
+
+    def fail_write(**kwargs):
+        raise AssertionError("staged capture must be sealed, not rewritten")
+
+    monkeypatch.setattr(service, "write_feature_artifact", fail_write)
+
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    for seq in (1, 2):
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=seq,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+    staged = service._ACTIVE_CAPTURES[capture_id].staged_artifact
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    ref = appended[0].raw_features_ref
+    assert ref.uri == str(staged.artifact_path)
+    assert ref.shape == [2, FEATURE_DIM]
+    assert not staged.staging_path.exists()
+
+    with np.load(ref.uri) as archive:
+        np.testing.assert_array_equal(
+            archive["features"],
+            np.float32([[0.1] * FEATURE_DIM, [0.2] * FEATURE_DIM]),
+        )
+
+
+def test_handle_close_interpolates_stride_skipped_rows(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+    from schemas import LandmarkExtractorFrameInput
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "EXTRACTION_STRIDE", 2)
+
+    decoded = []
+    monkeypatch.setattr(
+        service, "_decode_frame_data", lambda data: decoded.append(data) or object()
+    )
+
+    rows = iter([[0.2] * FEATURE_DIM, [0.4] * FEATURE_DIM])
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: next(rows)
+        ),
+    )
+
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    for seq in range(1, 5):
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=seq,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+    assert len(decoded) == 2
+    assert service._ACTIVE_CAPTURES[capture_id].skipped_rows == [1, 3]
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    ref = appended[0].raw_features_ref
+    assert ref.shape == [4, FEATURE_DIM]
+
+    with np.load(ref.uri) as archive:
+        np.testing.assert_allclose(archive["features"][:, 0], [0.2, 0.3, 0.4, 0.4])
+        np.testing.assert_array_equal(
+            archive["interpolated"], [False, True, False, True]
+        )
+
+
+def test_handle_close_attaches_capture_latency_summary(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    capture_id = uuid4()
+    totals = StageTotals()
+    totals.add("extract", 0.004)
+
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
+        latency=totals,
+    )
+
+    captured = {}
+
+    def fake_write_feature_artifact(**kwargs):
+        return service.ArtifactWriteResult(
+            capture_id=capture_id,
+            artifact_path="artifact.npz",
+            artifact_hash="sha256:abc",
+            shape=(1, FEATURE_DIM),
+            dtype="float32",
+            format="npz",
+        )
+
+    def fake_append_event(**kwargs):
+        captured["message"] = kwargs["message"]
+
+    monkeypatch.setattr(service, "write_feature_artifact", fake_write_feature_artifact)
+    monkeypatch.setattr(service, "append_event", fake_append_event)
+
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.close",
+        timestamp_end=now,
+        error_code=None,
+    )
+
+    service._handle_close(message)
+
+    summary = captured["message"].model_dump()["latency_summary"]
+    assert summary["extract"] == {"count": 1, "total_ms": 4.0, "max_ms": 4.0}
+    assert {"finalize_build", "artifact_write"} <= set(summary)
+
+
+def test_handle_close_writes_compact_storage_encoding(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+    from apps.landmark_extractor.feature_codec import load_feature_artifact
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(config, "FEATURE_STORAGE_ENCODING", "int16_delta")
+    monkeypatch.setattr(service, "FEATURE_STORAGE_ENCODING", "int16_delta")
+    # mmap staging only applies to float32 storage; rows buffer in memory
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", "mmap")
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: np.full(
+                FEATURE_DIM, 0.25, dtype=np.float32
+            )
+        ),
+    )
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    service._handle_frame(
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=1,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+        )
+    )
+    assert service._ACTIVE_CAPTURES[capture_id].staged_artifact is None
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    ref = appended[0].raw_features_ref
+    assert ref.dtype == "int16_delta"
+    assert ref.encoding.startswith(f"{FEATURE_ENCODING_ID};storage=int16_delta")
+    np.testing.assert_array_equal(
+        load_feature_artifact(ref.uri), np.full((1, FEATURE_DIM), 0.25, np.float32)
+    )
+
+
+def test_handle_close_stores_and_reports_capture_quality(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", "mmap")
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    rows = iter(
+        [
+            np.full(FEATURE_DIM, 0.5, dtype=np.float32),
+            np.zeros(FEATURE_DIM, dtype=np.float32),
+        ]
+    )
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: next(rows)
+        ),
+    )
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    for seq in (1, 2):
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=seq,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    message = appended[0]
+    summary = message.model_dump()["quality_summary"]
+    assert summary["frames"] == 2
+    assert summary["empty_frames"] == 1
+    assert summary["landmark_missing_fraction"] == 0.5
+
+    with np.load(message.raw_features_ref.uri) as archive:
+        np.testing.assert_array_equal(
+            archive["missing_regions"], [[False] * 4, [True] * 4]
+        )
+        np.testing.assert_array_equal(archive["missing_fraction"], [0.0, 1.0])
+        assert list(archive["region_names"]) == [
+            "pose",
+            "left_hand",
+            "right_hand",
+            "face",
+        ]
+
+
+@pytest.mark.parametrize("staging_mode", ["memory", "mmap"])
+def test_handle_close_stores_frame_time_axis(tmp_path, monkeypatch, staging_mode):
+    from datetime import timedelta
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor import config
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    monkeypatch.setattr(service, "ARTIFACT_STAGING_MODE", staging_mode)
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: np.full(
+                FEATURE_DIM, 0.5, dtype=np.float32
+            )
+        ),
+    )
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    for seq, offset_ms in enumerate((0, 66, 133, 266), start=1):
+        timestamp_frame = start + timedelta(milliseconds=offset_ms)
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=timestamp_frame,
+                capture_id=capture_id,
+                seq=seq,
+                timestamp_frame=timestamp_frame,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=start,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=start + timedelta(milliseconds=300),
+            error_code=None,
+        )
+    )
+
+    with np.load(appended[0].raw_features_ref.uri) as archive:
+        offsets = archive["frame_offsets_ms"]
+        assert offsets.dtype == np.int32
+        np.testing.assert_array_equal(offsets, [0, 66, 133, 266])
+        assert archive["fps_estimate"].shape == ()
+        assert float(archive["fps_estimate"]) == pytest.approx(1000 / 67)
+        assert float(archive["frame_jitter_ms"]) == pytest.approx(np.std([66, 67, 133]))
+        assert float(archive["frame_interval_max_ms"]) == 133.0
+
+
+def test_handle_close_omits_time_axis_for_rows_without_frame_times(
+    tmp_path, monkeypatch
+):
+    from apps.landmark_extractor import config
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    monkeypatch.setattr(config, "FEATURE_DATA_ROOT", tmp_path)
+    appended = []
+    monkeypatch.setattr(
+        service, "append_event", lambda **kwargs: appended.append(kwargs["message"])
+    )
+
+    capture_id = uuid4()
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
+    )
+
+    now = datetime.now(timezone.utc)
+    service._handle_close(
+        LandmarkExtractorTerminalInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            event="capture.close",
+            timestamp_end=now,
+            error_code=None,
+        )
+    )
+
+    with np.load(appended[0].raw_features_ref.uri) as archive:
+        assert "frame_offsets_ms" not in archive.files
+        assert "fps_estimate" not in archive.files
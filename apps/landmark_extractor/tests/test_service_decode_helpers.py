@@ -1,4 +1,8 @@
 # apps/landmark_extractor/tests/test_service_decode_helpers.py
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
 import pytest
 
 from apps.landmark_extractor import service
@@ -91,3 +95,97 @@ def test_decode_frame_data_decodes_data_url_image(monkeypatch):
 
     assert called["strip"] is True
     assert result is expected_frame
+
+
+# test_bytes_to_frame_decodes_memoryview_without_base64
+def test_bytes_to_frame_decodes_memoryview_without_base64():
+    image = np.zeros((8, 12, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+
+    frame = service._bytes_to_frame(memoryview(encoded.tobytes()))
+
+    assert frame.shape == (8, 12, 3)
+
+
+# test_decode_frame_payload_dispatches_on_event
+def test_decode_frame_payload_dispatches_on_event(monkeypatch):
+    seen = {}
+
+    monkeypatch.setattr(
+        service, "_bytes_to_frame", lambda v: seen.setdefault("bytes", v)
+    )
+    monkeypatch.setattr(
+        service, "_decode_frame_data", lambda v: seen.setdefault("b64", v)
+    )
+
+    payload = memoryview(b"raw")
+    service._decode_frame_payload(
+        SimpleNamespace(event="capture.frame_bytes", frame_bytes=payload)
+    )
+    service._decode_frame_payload(
+        SimpleNamespace(event="capture.frame", frame_data="ZmFrZQ==")
+    )
+
+    assert seen == {"bytes": payload, "b64": "ZmFrZQ=="}
+
+
+# test_bytes_to_frame_decodes_large_jpeg_at_reduced_scale
+def test_bytes_to_frame_decodes_large_jpeg_at_reduced_scale(monkeypatch):
+    monkeypatch.setattr(service, "EXTRACTION_MAX_LONG_SIDE", 320)
+
+    ok, encoded = cv2.imencode(".jpg", np.zeros((480, 640, 3), dtype=np.uint8))
+    assert ok
+    buffer = np.frombuffer(encoded.tobytes(), dtype=np.uint8)
+
+    assert service._jpeg_frame_size(buffer) == (640, 480)
+    assert service._imdecode_flag(buffer) == cv2.IMREAD_REDUCED_COLOR_2
+    assert service._bytes_to_frame(buffer.tobytes()).shape == (240, 320, 3)
+
+
+# test_imdecode_flag_uses_full_decode_when_reduction_would_undershoot
+def test_imdecode_flag_uses_full_decode_when_reduction_would_undershoot(monkeypatch):
+    ok, encoded = cv2.imencode(".jpg", np.zeros((240, 320, 3), dtype=np.uint8))
+    assert ok
+    buffer = np.frombuffer(encoded.tobytes(), dtype=np.uint8)
+
+    monkeypatch.setattr(service, "EXTRACTION_MAX_LONG_SIDE", 320)
+    assert service._imdecode_flag(buffer) == cv2.IMREAD_COLOR
+
+    monkeypatch.setattr(service, "EXTRACTION_MAX_LONG_SIDE", None)
+    assert service._imdecode_flag(buffer) == cv2.IMREAD_COLOR
+
+
+# test_jpeg_frame_size_returns_none_for_non_jpeg
+def test_jpeg_frame_size_returns_none_for_non_jpeg():
+    ok, encoded = cv2.imencode(".png", np.zeros((8, 8, 3), dtype=np.uint8))
+    assert ok
+
+    assert service._jpeg_frame_size(encoded.ravel()) is None
+    assert service._jpeg_frame_size(np.frombuffer(b"\xff\xd8", np.uint8)) is None
+
+
+# test_bytes_to_frame_returns_rgb_channel_order
+def test_bytes_to_frame_returns_rgb_channel_order():
+    bgr = np.zeros((8, 8, 3), dtype=np.uint8)
+    bgr[..., 0] = 255  # pure blue in BGR
+    ok, encoded = cv2.imencode(".png", bgr)
+    assert ok
+
+    frame = service._bytes_to_frame(encoded.tobytes())
+
+    assert frame[0, 0].tolist() == [0, 0, 255]
+
+
+# test_bytes_to_frame_swaps_channels_when_rgb_decode_unavailable
+def test_bytes_to_frame_swaps_channels_when_rgb_decode_unavailable(monkeypatch):
+    monkeypatch.setattr(service, "_IMREAD_COLOR_RGB", None)
+
+    bgr = np.zeros((8, 8, 3), dtype=np.uint8)
+    bgr[..., 0] = 255
+    ok, encoded = cv2.imencode(".png", bgr)
+    assert ok
+
+    frame = service._bytes_to_frame(encoded.tobytes())
+
+    assert frame[0, 0].tolist() == [0, 0, 255]
@@ -3,10 +3,12 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 import apps.landmark_extractor.service as service
 from apps.landmark_extractor.config import FEATURE_DIM
+from apps.landmark_extractor.domain import FeatureBuffer
 
 
 # test_build_finalize_result_returns_finalize_result_for_buffered_rows
@@ -17,13 +19,14 @@ def test_build_finalize_result_returns_finalize_result_for_buffered_rows():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.0] * FEATURE_DIM for _ in range(3)],
+        feature_rows=FeatureBuffer.from_rows([[0.0] * FEATURE_DIM for _ in range(3)]),
     )
 
     result = service._build_finalize_result(state=state)
 
     assert result.capture_id == capture_id
-    assert result.feature_matrix == state.feature_rows
+    assert result.feature_matrix.shape == (3, FEATURE_DIM)
+    assert np.shares_memory(result.feature_matrix, state.feature_rows.view())
 
 
 # test_build_finalize_result_raises_for_zero_rows
@@ -34,7 +37,7 @@ def test_build_finalize_result_raises_for_zero_rows():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[],
+        feature_rows=FeatureBuffer(),
     )
 
     with pytest.raises(service.LandmarkExtractorFinalizeError):
@@ -63,7 +66,9 @@ def test_build_feature_ref_message_builds_valid_a3cp_message():
                 capture_id=capture_id,
                 user_id="user-1",
                 session_id="session-1",
-                feature_rows=[[0.0] * FEATURE_DIM for _ in range(3)],
+                feature_rows=FeatureBuffer.from_rows(
+                    [[0.0] * FEATURE_DIM for _ in range(3)]
+                ),
             )
         ),
         artifact_result=artifact_result,
@@ -80,7 +85,7 @@ def test_build_feature_ref_message_builds_valid_a3cp_message():
 
 # test_ensure_feature_matrix_shape_accepts_valid_rows
 def test_ensure_feature_matrix_shape_accepts_valid_rows():
-    rows = [[0.0] * FEATURE_DIM for _ in range(5)]
+    rows = np.zeros((5, FEATURE_DIM), dtype=np.float32)
 
     # Should not raise
     service._ensure_feature_matrix_shape(rows)
@@ -91,15 +96,14 @@ def test_ensure_feature_matrix_shape_raises_for_empty_matrix():
     with pytest.raises(
         service.LandmarkExtractorFinalizeError, match="Feature matrix is empty"
     ):
-        service._ensure_feature_matrix_shape([])
+        service._ensure_feature_matrix_shape(
+            np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        )
 
 
 # test_ensure_feature_matrix_shape_raises_for_row_dim_mismatch
 def test_ensure_feature_matrix_shape_raises_for_row_dim_mismatch():
-    rows = [
-        [0.0] * FEATURE_DIM,
-        [0.0] * (FEATURE_DIM - 1),  # incorrect dimension
-    ]
+    rows = np.zeros((2, FEATURE_DIM - 1), dtype=np.float32)  # incorrect dimension
 
     with pytest.raises(service.LandmarkExtractorFinalizeError):
         service._ensure_feature_matrix_shape(rows)
@@ -1,26 +1,45 @@
 # apps/landmark_extractor/tests/test_service_frame.py
 
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from apps.landmark_extractor import service
-from apps.landmark_extractor.domain import CaptureState, NormalizedLandmarks
+from apps.landmark_extractor.backend_pool import MediaPipeBackendLeaseTimeout
+from apps.landmark_extractor.config import FEATURE_DIM
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
 from schemas import LandmarkExtractorFrameInput
 
 
+class FakeBackendPool:
+    """Stands in for MediaPipeBackendPool so no MediaPipe models are loaded."""
+
+    def __init__(self, lease):
+        self.lease = lease
+        self.released = []
+
+    def release(self, backend):
+        self.released.append(backend)
+
+    def stats(self):
+        return None
+
+
 def test_handle_frame_creates_new_capture_state_on_first_frame(monkeypatch):
     service._ACTIVE_CAPTURES.clear()
     service._TERMINAL_CAPTURE_IDS.clear()
 
     monkeypatch.setattr(service, "_decode_frame_data", lambda frame_data: object())
     monkeypatch.setattr(
-        service._BACKEND,
-        "extract_landmarks",
-        lambda frame, timestamp_frame: NormalizedLandmarks(),
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, timestamp_frame: [0.1] * FEATURE_DIM
+        ),
     )
-    monkeypatch.setattr(service, "build_feature_row", lambda landmarks: [0.1] * 176)
 
     capture_id = uuid4()
     now = datetime.now(timezone.utc)
@@ -45,7 +64,9 @@ def test_handle_frame_creates_new_capture_state_on_first_frame(monkeypatch):
     assert state.capture_id == capture_id
     assert state.user_id == "user-1"
     assert state.session_id == "session-1"
-    assert state.feature_rows == [[0.1] * 176]
+    np.testing.assert_array_equal(
+        state.feature_rows.view(), np.float32([[0.1] * FEATURE_DIM])
+    )
 
 
 def test_handle_frame_appends_feature_row_to_existing_capture(monkeypatch):
@@ -54,18 +75,19 @@ def test_handle_frame_appends_feature_row_to_existing_capture(monkeypatch):
 
     monkeypatch.setattr(service, "_decode_frame_data", lambda frame_data: object())
     monkeypatch.setattr(
-        service._BACKEND,
-        "extract_landmarks",
-        lambda frame, timestamp_frame: NormalizedLandmarks(),
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, timestamp_frame: [0.2] * FEATURE_DIM
+        ),
     )
-    monkeypatch.setattr(service, "build_feature_row", lambda landmarks: [0.2] * 176)
 
     capture_id = uuid4()
     existing_state = CaptureState(
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * 176],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
     service._ACTIVE_CAPTURES[capture_id] = existing_state
 
@@ -87,7 +109,10 @@ def test_handle_frame_appends_feature_row_to_existing_capture(monkeypatch):
 
     state = service._ACTIVE_CAPTURES[capture_id]
     assert state is existing_state
-    assert state.feature_rows == [[0.1] * 176, [0.2] * 176]
+    np.testing.assert_array_equal(
+        state.feature_rows.view(),
+        np.float32([[0.1] * FEATURE_DIM, [0.2] * FEATURE_DIM]),
+    )
 
 
 def test_handle_frame_rejects_frame_for_terminal_capture():
@@ -125,7 +150,7 @@ def test_handle_frame_preserves_state_when_decode_fails(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * 176],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
     service._ACTIVE_CAPTURES[capture_id] = existing_state
 
@@ -154,7 +179,9 @@ def test_handle_frame_preserves_state_when_decode_fails(monkeypatch):
     state = service._ACTIVE_CAPTURES[capture_id]
 
     assert state is existing_state
-    assert state.feature_rows == [[0.1] * 176]
+    np.testing.assert_array_equal(
+        state.feature_rows.view(), np.float32([[0.1] * FEATURE_DIM])
+    )
 
 
 def test_handle_frame_raises_frame_error_when_backend_extraction_fails(monkeypatch):
@@ -165,10 +192,16 @@ def test_handle_frame_raises_frame_error_when_backend_extraction_fails(monkeypat
 
     monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
 
-    def fake_extract_landmarks(frame, timestamp_frame):
+    def fake_extract_feature_row(frame, timestamp_frame):
         raise service.MediaPipeExtractionError("backend failure")
 
-    monkeypatch.setattr(service._BACKEND, "extract_landmarks", fake_extract_landmarks)
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=fake_extract_feature_row
+        ),
+    )
 
     now = datetime.now(timezone.utc)
 
@@ -189,7 +222,7 @@ def test_handle_frame_raises_frame_error_when_backend_extraction_fails(monkeypat
 
     assert capture_id in service._ACTIVE_CAPTURES
     state = service._ACTIVE_CAPTURES[capture_id]
-    assert state.feature_rows == []
+    assert len(state.feature_rows) == 0
 
 
 def test_handle_frame_raises_frame_error_when_feature_row_build_fails(monkeypatch):
@@ -199,16 +232,17 @@ def test_handle_frame_raises_frame_error_when_feature_row_build_fails(monkeypatc
     capture_id = uuid4()
 
     monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
-    monkeypatch.setattr(
-        service._BACKEND,
-        "extract_landmarks",
-        lambda frame, ts: NormalizedLandmarks(),
-    )
 
-    def fake_build_feature_row(_):
+    def fake_extract_feature_row(frame, ts):
         raise ValueError("feature build failure")
 
-    monkeypatch.setattr(service, "build_feature_row", fake_build_feature_row)
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=fake_extract_feature_row
+        ),
+    )
 
     now = datetime.now(timezone.utc)
 
@@ -229,7 +263,7 @@ def test_handle_frame_raises_frame_error_when_feature_row_build_fails(monkeypatc
 
     assert capture_id in service._ACTIVE_CAPTURES
     state = service._ACTIVE_CAPTURES[capture_id]
-    assert state.feature_rows == []
+    assert len(state.feature_rows) == 0
 
 
 def test_handle_frame_does_not_append_row_on_processing_failure(monkeypatch):
@@ -242,16 +276,22 @@ def test_handle_frame_does_not_append_row_on_processing_failure(monkeypatch):
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * 176],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
     service._ACTIVE_CAPTURES[capture_id] = existing_state
 
     monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
 
-    def fake_extract_landmarks(frame, ts):
+    def fake_extract_feature_row(frame, ts):
         raise service.MediaPipeExtractionError("backend failure")
 
-    monkeypatch.setattr(service._BACKEND, "extract_landmarks", fake_extract_landmarks)
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=fake_extract_feature_row
+        ),
+    )
 
     now = datetime.now(timezone.utc)
 
@@ -272,4 +312,389 @@ def test_handle_frame_does_not_append_row_on_processing_failure(monkeypatch):
 
     state = service._ACTIVE_CAPTURES[capture_id]
 
-    assert state.feature_rows == [[0.1] * 176]
+    np.testing.assert_array_equal(
+        state.feature_rows.view(), np.float32([[0.1] * FEATURE_DIM])
+    )
+
+
+def test_handle_frame_leases_one_backend_per_capture(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    streams = []
+    backend = SimpleNamespace(
+        begin_stream=streams.append,
+        extract_feature_row=lambda frame, timestamp_frame: [0.1] * FEATURE_DIM,
+    )
+    leases = []
+
+    def fake_lease():
+        leases.append(backend)
+        return backend
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", FakeBackendPool(fake_lease))
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    for seq in (1, 2, 3):
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=seq,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+    assert leases == [backend]
+    assert streams == [("pose", "hand", "face")]
+    assert service._CAPTURE_BACKENDS[capture_id] is backend
+    service._CAPTURE_BACKENDS.clear()
+
+
+def test_handle_frame_starts_stream_with_capture_detector_profile(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    streams = []
+    backend = SimpleNamespace(
+        begin_stream=streams.append,
+        extract_feature_row=lambda frame, timestamp_frame: [0.1] * FEATURE_DIM,
+    )
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", FakeBackendPool(lambda: backend))
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    service._handle_frame(
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=1,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+            detector_profile="hands_only",
+        )
+    )
+
+    assert streams == [("hand",)]
+    assert service._ACTIVE_CAPTURES[capture_id].detector_profile == "hands_only"
+    service._CAPTURE_BACKENDS.clear()
+
+
+def test_handle_frame_rejects_unknown_detector_profile():
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    with pytest.raises(service.LandmarkExtractorFrameError):
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=1,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+                detector_profile="no_such_profile",
+            )
+        )
+
+    assert capture_id not in service._ACTIVE_CAPTURES
+
+
+def test_handle_frame_raises_frame_error_when_no_backend_available(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    def fake_lease():
+        raise MediaPipeBackendLeaseTimeout("pool exhausted")
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", FakeBackendPool(fake_lease))
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+    with pytest.raises(service.LandmarkExtractorFrameError):
+        service._handle_frame(message)
+
+    assert capture_id not in service._CAPTURE_BACKENDS
+
+
+def test_handle_frame_rejects_frame_when_capture_buffer_full(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    capture_id = uuid4()
+    full_buffer = FeatureBuffer(capacity=2)
+    full_buffer.append([0.1] * FEATURE_DIM)
+    full_buffer.append([0.2] * FEATURE_DIM)
+
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=full_buffer,
+    )
+
+    def fail_decode(_):
+        raise AssertionError("full capture must not decode")
+
+    monkeypatch.setattr(service, "_decode_frame_data", fail_decode)
+
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=3,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+    with pytest.raises(service.LandmarkExtractorFrameError):
+        service._handle_frame(message)
+
+    assert len(full_buffer) == 2
+
+
+@pytest.mark.parametrize("stride", [1, 2])
+def test_handle_frame_maps_frozen_buffer_append_to_frame_error(monkeypatch, stride):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    capture_id = uuid4()
+    sealed_buffer = FeatureBuffer.from_rows([[0.1] * FEATURE_DIM])
+    sealed_buffer.freeze()
+
+    service._ACTIVE_CAPTURES[capture_id] = CaptureState(
+        capture_id=capture_id,
+        user_id="user-1",
+        session_id="session-1",
+        feature_rows=sealed_buffer,
+    )
+
+    monkeypatch.setattr(service, "EXTRACTION_STRIDE", stride)
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, timestamp_frame: [0.2] * FEATURE_DIM
+        ),
+    )
+
+    with pytest.raises(service.LandmarkExtractorFrameError):
+        service._handle_frame(_frame_message(capture_id, 2))
+
+    state = service._ACTIVE_CAPTURES[capture_id]
+    assert len(sealed_buffer) == 1
+    assert state.skipped_rows == []
+    assert len(state.frame_times) == 0
+
+
+def _frame_message(capture_id, seq):
+    now = datetime.now(timezone.utc)
+    return LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=seq,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+
+def test_handle_frame_motion_gate_reuses_row_for_static_frames(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    still = np.full((48, 64, 3), 100, dtype=np.uint8)
+    moved = still.copy()
+    moved[:, :32] = 200
+    frames = iter([still, still.copy(), moved, moved.copy(), moved.copy()])
+    calls = []
+
+    def fake_extract_feature_row(frame, timestamp_frame):
+        calls.append(frame)
+        return [float(len(calls))] * FEATURE_DIM
+
+    monkeypatch.setattr(service, "MOTION_GATE_ENABLED", True)
+    monkeypatch.setattr(service, "MOTION_GATE_MAX_REUSED_RUN", 1)
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: next(frames))
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=fake_extract_feature_row
+        ),
+    )
+
+    capture_id = uuid4()
+    for seq in range(1, 6):
+        service._handle_frame(_frame_message(capture_id, seq))
+
+    state = service._ACTIVE_CAPTURES[capture_id]
+
+    # still, (reused), moved, (reused), forced extraction after max run
+    assert len(calls) == 3
+    assert state.frames_extracted == 3
+    assert state.frames_reused == 2
+    np.testing.assert_array_equal(
+        state.feature_rows.view()[:, 0], np.float32([1, 1, 2, 2, 3])
+    )
+
+
+def test_handle_frame_motion_gate_disabled_extracts_every_frame(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    calls = []
+
+    monkeypatch.setattr(service, "MOTION_GATE_ENABLED", False)
+    monkeypatch.setattr(
+        service,
+        "_decode_frame_data",
+        lambda _: np.zeros((48, 64, 3), dtype=np.uint8),
+    )
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, ts: calls.append(ts)
+            or [0.0] * FEATURE_DIM
+        ),
+    )
+
+    capture_id = uuid4()
+    for seq in range(1, 4):
+        service._handle_frame(_frame_message(capture_id, seq))
+
+    state = service._ACTIVE_CAPTURES[capture_id]
+    assert len(calls) == 3
+    assert (state.frames_extracted, state.frames_reused) == (3, 0)
+    assert state.motion_reference is None
+
+
+def test_handle_frame_skips_inference_when_abort_arrives_during_decode(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    capture_id = uuid4()
+
+    def decode_then_abort(_):
+        service._PENDING_ABORTS[capture_id] = 0
+        return object()
+
+    def fail_lease(capture_id):
+        raise AssertionError("backend must not be leased")
+
+    monkeypatch.setattr(service, "_decode_frame_data", decode_then_abort)
+    monkeypatch.setattr(service, "_lease_backend", fail_lease)
+
+    now = datetime.now(timezone.utc)
+    try:
+        service._handle_frame(
+            LandmarkExtractorFrameInput(
+                schema_version="1.0.1",
+                record_id=uuid4(),
+                user_id="user-1",
+                session_id="session-1",
+                timestamp=now,
+                capture_id=capture_id,
+                seq=1,
+                timestamp_frame=now,
+                frame_data="ZmFrZQ==",
+            )
+        )
+
+        assert service._PENDING_ABORTS[capture_id] == 1
+        assert len(service._ACTIVE_CAPTURES[capture_id].feature_rows) == 0
+    finally:
+        service._PENDING_ABORTS.pop(capture_id, None)
+
+
+def test_handle_frame_records_stage_latency(monkeypatch):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service.reset_latency_stats()
+
+    monkeypatch.setattr(service, "MOTION_GATE_ENABLED", False)
+    monkeypatch.setattr(service, "LATENCY_CAPTURE_SUMMARY_ENABLED", True)
+    monkeypatch.setattr(service, "_decode_frame_data", lambda frame_data: object())
+    monkeypatch.setattr(
+        service,
+        "_lease_backend",
+        lambda capture_id: SimpleNamespace(
+            extract_feature_row=lambda frame, timestamp_frame: [0.1] * FEATURE_DIM
+        ),
+    )
+
+    capture_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    message = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+    service._handle_frame(message)
+
+    stats = service.get_latency_stats()
+    for stage in ("decode", "backend_lease", "extract"):
+        assert stats[stage].count == 1
+    assert "motion_signature" not in stats
+
+    summary = service._ACTIVE_CAPTURES[capture_id].latency.as_dict()
+    assert set(summary) == {"decode", "backend_lease", "extract"}
+
+    service.reset_latency_stats()
+    assert service.get_latency_stats() == {}
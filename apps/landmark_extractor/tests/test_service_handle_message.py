@@ -1,6 +1,8 @@
 # apps/landmark_extractor/tests/test_service_handle_message.py
 
 import asyncio
+import threading
+import time
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -99,3 +101,461 @@ def test_handle_message_raises_for_unsupported_event():
 
     with pytest.raises(service.LandmarkExtractorServiceError):
         asyncio.run(service.handle_message(message))  # type: ignore[arg-type]
+
+
+def test_handle_message_runs_frames_off_event_loop_in_arrival_order(monkeypatch):
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    processed = []
+    loop_thread = threading.current_thread()
+
+    def fake_handle_frame(message: LandmarkExtractorFrameInput) -> None:
+        # Earlier frames take longer, so only per-capture ordering keeps them in order.
+        time.sleep(0.02 / message.seq)
+        processed.append((message.capture_id, message.seq, threading.current_thread()))
+
+    monkeypatch.setattr(service, "_handle_frame", fake_handle_frame)
+
+    now = datetime.now(timezone.utc)
+    capture_ids = [uuid4(), uuid4()]
+
+    messages = [
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=seq,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+        )
+        for seq in range(1, 6)
+        for capture_id in capture_ids
+    ]
+
+    async def run_all():
+        await asyncio.gather(*(service.handle_message(m) for m in messages))
+
+    asyncio.run(run_all())
+
+    for capture_id in capture_ids:
+        seqs = [seq for cid, seq, _ in processed if cid == capture_id]
+        assert seqs == [1, 2, 3, 4, 5]
+
+    assert all(thread is not loop_thread for _, _, thread in processed)
+
+
+def test_handle_message_runs_close_after_pending_frames(monkeypatch):
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    calls = []
+
+    def fake_handle_frame(message: LandmarkExtractorFrameInput) -> None:
+        time.sleep(0.02)
+        calls.append("frame")
+
+    def fake_handle_close(message: LandmarkExtractorTerminalInput) -> None:
+        calls.append("close")
+        service._TERMINAL_CAPTURE_IDS.add(message.capture_id)
+
+    monkeypatch.setattr(service, "_handle_frame", fake_handle_frame)
+    monkeypatch.setattr(service, "_handle_close", fake_handle_close)
+
+    now = datetime.now(timezone.utc)
+    capture_id = uuid4()
+
+    frame = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+    close = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.close",
+        timestamp_end=now,
+        error_code=None,
+    )
+
+    async def run_all():
+        await asyncio.gather(
+            service.handle_message(frame), service.handle_message(close)
+        )
+
+    asyncio.run(run_all())
+
+    assert calls == ["frame", "close"]
+    assert capture_id not in service._CAPTURE_ORDER_LOCKS
+
+
+def test_handle_message_process_mode_routes_capture_to_worker_pool(monkeypatch):
+    from concurrent.futures import Future
+
+    submitted = []
+
+    class FakeProcessPool:
+        def submit(self, capture_id, fn, *args):
+            submitted.append((capture_id, fn, args[0].event))
+            future = Future()
+            future.set_result(service._WorkerResult())
+            return future
+
+        def forget(self, capture_id):
+            pass
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    monkeypatch.setattr(service, "EXTRACTION_EXECUTION_MODE", "process")
+    monkeypatch.setattr(service, "_get_process_pool", lambda: FakeProcessPool())
+
+    now = datetime.now(timezone.utc)
+    capture_id = uuid4()
+
+    frame = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+    close = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.close",
+        timestamp_end=now,
+    )
+
+    asyncio.run(service.handle_message(frame))
+    asyncio.run(service.handle_message(close))
+
+    assert [(cid, event) for cid, _, event in submitted] == [
+        (capture_id, "capture.frame"),
+        (capture_id, "capture.close"),
+    ]
+    assert all(fn is service._handle_message_in_worker for _, fn, _ in submitted)
+
+    # terminal state is mirrored locally so late frames are rejected here
+    assert capture_id in service._TERMINAL_CAPTURE_IDS
+    assert capture_id not in service._CAPTURE_ORDER_LOCKS
+
+    with pytest.raises(service.LandmarkExtractorServiceError):
+        asyncio.run(service.handle_message(frame))
+
+    assert len(submitted) == 2
+
+
+def test_handle_message_process_mode_fails_capture_on_worker_crash(monkeypatch):
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    forgotten = []
+
+    class CrashedProcessPool:
+        def submit(self, capture_id, fn, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def forget(self, capture_id):
+            forgotten.append(capture_id)
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    monkeypatch.setattr(service, "EXTRACTION_EXECUTION_MODE", "process")
+    monkeypatch.setattr(service, "_get_process_pool", lambda: CrashedProcessPool())
+
+    now = datetime.now(timezone.utc)
+    capture_id = uuid4()
+
+    frame = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+    with pytest.raises(service.LandmarkExtractorFrameError):
+        asyncio.run(service.handle_message(frame))
+
+    assert forgotten == [capture_id]
+    assert capture_id in service._TERMINAL_CAPTURE_IDS
+
+
+def _frame_message(capture_id, now=None):
+    now = now or datetime.now(timezone.utc)
+    return LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+
+def test_worker_lease_fails_fast_when_shard_has_more_captures_than_backends(
+    monkeypatch,
+):
+    from types import SimpleNamespace
+
+    from apps.landmark_extractor.config import FEATURE_DIM
+
+    def factory():
+        return SimpleNamespace(
+            begin_stream=lambda detectors: None,
+            extract_feature_row=lambda frame, ts: [0.1] * FEATURE_DIM,
+            close=lambda: None,
+        )
+
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_BACKENDS.clear()
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", None)
+    monkeypatch.setattr(service, "BACKEND_POOL_SIZE", 2)
+    monkeypatch.setattr(service, "BACKEND_LEASE_TIMEOUT_S", 30.0)
+    monkeypatch.setattr(service, "_create_backend", factory)
+    monkeypatch.setattr(service, "_decode_frame_data", lambda _: object())
+    monkeypatch.setattr(service, "_IN_WORKER_PROCESS", False)
+
+    service._init_worker_process()
+    assert service._IN_WORKER_PROCESS
+
+    capture_ids = [uuid4() for _ in range(service.BACKEND_POOL_SIZE + 1)]
+    results = [
+        service._handle_message_in_worker(_frame_message(capture_id))
+        for capture_id in capture_ids[:-1]
+    ]
+
+    start = time.monotonic()
+    overflow = service._handle_message_in_worker(_frame_message(capture_ids[-1]))
+    elapsed = time.monotonic() - start
+
+    assert all(result.error is None for result in results)
+    assert isinstance(overflow.error, service.LandmarkExtractorFrameError)
+    assert elapsed < 1.0
+
+    service._CAPTURE_BACKENDS.clear()
+    service._ACTIVE_CAPTURES.clear()
+
+
+def test_worker_reports_evicted_captures_even_when_frame_fails(monkeypatch):
+    victim = uuid4()
+
+    def failing_frame(message):
+        raise service.LandmarkExtractorFrameError("decode failed")
+
+    monkeypatch.setattr(service, "_evict_stale_captures", lambda capture_id: [victim])
+    monkeypatch.setattr(service, "_handle_frame", failing_frame)
+
+    result = service._handle_message_in_worker(_frame_message(uuid4()))
+
+    assert result.evicted_capture_ids == (victim,)
+    assert isinstance(result.error, service.LandmarkExtractorFrameError)
+
+
+def test_handle_message_process_mode_mirrors_worker_evictions(monkeypatch):
+    from concurrent.futures import Future
+
+    victim = uuid4()
+    capture_id = uuid4()
+    forgotten = []
+
+    class EvictingProcessPool:
+        def submit(self, capture_id, fn, *args):
+            future = Future()
+            future.set_result(service._WorkerResult(evicted_capture_ids=(victim,)))
+            return future
+
+        def forget(self, capture_id):
+            forgotten.append(capture_id)
+
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+    service._CAPTURE_ORDER_LOCKS[victim] = asyncio.Lock()
+
+    monkeypatch.setattr(service, "EXTRACTION_EXECUTION_MODE", "process")
+    monkeypatch.setattr(service, "_get_process_pool", lambda: EvictingProcessPool())
+
+    asyncio.run(service.handle_message(_frame_message(capture_id)))
+
+    assert forgotten == [victim]
+    assert victim in service._TERMINAL_CAPTURE_IDS
+    assert victim not in service._CAPTURE_ORDER_LOCKS
+    assert capture_id not in service._TERMINAL_CAPTURE_IDS
+
+
+def _abort_message(capture_id, now):
+    return LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        event="capture.abort",
+        timestamp_end=now,
+        error_code="aborted",
+    )
+
+
+def test_handle_message_abort_drops_frames_queued_behind_in_flight_frame(
+    monkeypatch,
+):
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    calls = []
+
+    def fake_handle_frame(message: LandmarkExtractorFrameInput) -> None:
+        time.sleep(0.02)
+        calls.append(("frame", message.seq))
+
+    def fake_handle_abort(message: LandmarkExtractorTerminalInput) -> None:
+        calls.append(("abort", None))
+        service._TERMINAL_CAPTURE_IDS.add(message.capture_id)
+
+    monkeypatch.setattr(service, "_handle_frame", fake_handle_frame)
+    monkeypatch.setattr(service, "_handle_abort", fake_handle_abort)
+
+    now = datetime.now(timezone.utc)
+    capture_id = uuid4()
+    frames = [
+        LandmarkExtractorFrameInput(
+            schema_version="1.0.1",
+            record_id=uuid4(),
+            user_id="user-1",
+            session_id="session-1",
+            timestamp=now,
+            capture_id=capture_id,
+            seq=seq,
+            timestamp_frame=now,
+            frame_data="ZmFrZQ==",
+        )
+        for seq in (1, 2, 3)
+    ]
+    skipped_before = service.get_frames_skipped_on_abort()
+
+    async def run_all():
+        await asyncio.gather(
+            *(service.handle_message(m) for m in frames),
+            service.handle_message(_abort_message(capture_id, now)),
+        )
+
+    asyncio.run(run_all())
+
+    assert calls == [("frame", 1), ("abort", None)]
+    assert service.get_frames_skipped_on_abort() - skipped_before == 2
+    assert capture_id not in service._PENDING_ABORTS
+
+
+def test_handle_message_abort_marks_terminal_when_every_frame_was_dropped(
+    monkeypatch,
+):
+    service._ACTIVE_CAPTURES.clear()
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    def fail_handle_frame(message: LandmarkExtractorFrameInput) -> None:
+        raise AssertionError("frame must not be processed")
+
+    monkeypatch.setattr(service, "_handle_frame", fail_handle_frame)
+
+    now = datetime.now(timezone.utc)
+    capture_id = uuid4()
+    frame = LandmarkExtractorFrameInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=capture_id,
+        seq=1,
+        timestamp_frame=now,
+        frame_data="ZmFrZQ==",
+    )
+
+    async def run_all():
+        # Hold the capture lock so the frame is still queued when abort arrives.
+        lock = service._CAPTURE_ORDER_LOCKS.setdefault(capture_id, asyncio.Lock())
+        await lock.acquire()
+        frame_task = asyncio.create_task(service.handle_message(frame))
+        abort_task = asyncio.create_task(
+            service.handle_message(_abort_message(capture_id, now))
+        )
+        await asyncio.sleep(0)
+        lock.release()
+        await asyncio.gather(frame_task, abort_task)
+
+    asyncio.run(run_all())
+
+    assert capture_id in service._TERMINAL_CAPTURE_IDS
+    assert capture_id not in service._ACTIVE_CAPTURES
+    assert capture_id not in service._CAPTURE_ORDER_LOCKS
+
+
+def test_handle_message_runs_close_off_event_loop(monkeypatch):
+    service._TERMINAL_CAPTURE_IDS.clear()
+    service._CAPTURE_ORDER_LOCKS.clear()
+
+    threads = []
+    loop_thread = threading.current_thread()
+
+    def fake_handle_close(message: LandmarkExtractorTerminalInput) -> None:
+        threads.append(threading.current_thread())
+        service._TERMINAL_CAPTURE_IDS.add(message.capture_id)
+
+    monkeypatch.setattr(service, "_handle_close", fake_handle_close)
+
+    now = datetime.now(timezone.utc)
+    message = LandmarkExtractorTerminalInput(
+        schema_version="1.0.1",
+        record_id=uuid4(),
+        user_id="user-1",
+        session_id="session-1",
+        timestamp=now,
+        capture_id=uuid4(),
+        event="capture.close",
+        timestamp_end=now,
+        error_code=None,
+    )
+
+    asyncio.run(service.handle_message(message))
+
+    assert len(threads) == 1
+    assert threads[0] is not loop_thread
+    assert threads[0].name.startswith("landmark-finalize")
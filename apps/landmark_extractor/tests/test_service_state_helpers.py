@@ -6,8 +6,9 @@ from uuid import uuid4
 import pytest
 
 from apps.landmark_extractor import service
+from apps.landmark_extractor.capture_registry import ActiveCaptureRegistry
 from apps.landmark_extractor.config import FEATURE_DIM
-from apps.landmark_extractor.domain import CaptureState
+from apps.landmark_extractor.domain import CaptureState, FeatureBuffer
 from schemas import LandmarkExtractorFrameInput
 
 # test_get_or_create_capture_state_creates_new_state
@@ -37,7 +38,7 @@ def test_get_or_create_capture_state_creates_new_state():
     assert state.capture_id == capture_id
     assert state.user_id == "user-1"
     assert state.session_id == "session-1"
-    assert state.feature_rows == []
+    assert len(state.feature_rows) == 0
 
 
 # test_get_or_create_capture_state_returns_existing_state
@@ -52,7 +53,7 @@ def test_get_or_create_capture_state_returns_existing_state():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     service._ACTIVE_CAPTURES[capture_id] = existing_state
@@ -86,7 +87,7 @@ def test_get_active_capture_state_returns_existing_state():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     service._ACTIVE_CAPTURES[capture_id] = existing_state
@@ -116,7 +117,7 @@ def test_clear_active_capture_state_removes_capture():
         capture_id=capture_id,
         user_id="user-1",
         session_id="session-1",
-        feature_rows=[[0.1] * FEATURE_DIM],
+        feature_rows=FeatureBuffer.from_rows([[0.1] * FEATURE_DIM]),
     )
 
     service._clear_active_capture_state(capture_id)
@@ -144,3 +145,49 @@ def test_reject_if_terminal_raises_for_terminal_capture():
 
     with pytest.raises(service.LandmarkExtractorServiceError):
         service._reject_if_terminal(capture_id)
+
+
+def test_evict_stale_captures_aborts_idle_captures(monkeypatch):
+    clock = {"now": 0.0}
+    registry = ActiveCaptureRegistry(
+        idle_ttl_s=10.0, max_bytes=10**9, clock=lambda: clock["now"]
+    )
+    monkeypatch.setattr(service, "_ACTIVE_CAPTURES", registry)
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    idle_id, busy_id = uuid4(), uuid4()
+    for capture_id in (idle_id, busy_id):
+        registry[capture_id] = CaptureState(
+            capture_id=capture_id, user_id="user-1", session_id="session-1"
+        )
+
+    clock["now"] = 11.0
+    service._evict_stale_captures(busy_id)
+
+    assert idle_id not in registry
+    assert idle_id in service._TERMINAL_CAPTURE_IDS
+    assert busy_id in registry
+
+    with pytest.raises(service.LandmarkExtractorServiceError):
+        service._reject_if_terminal(idle_id)
+
+
+def test_evict_stale_captures_frees_budget_for_new_capture(monkeypatch):
+    registry = ActiveCaptureRegistry(
+        idle_ttl_s=10.0, max_bytes=2 * service._NEW_CAPTURE_BYTES
+    )
+    monkeypatch.setattr(service, "_ACTIVE_CAPTURES", registry)
+    service._TERMINAL_CAPTURE_IDS.clear()
+
+    oldest, newest = uuid4(), uuid4()
+    for capture_id in (oldest, newest):
+        registry[capture_id] = CaptureState(
+            capture_id=capture_id, user_id="user-1", session_id="session-1"
+        )
+
+    service._evict_stale_captures(newest)
+    assert set(registry) == {oldest, newest}
+
+    service._evict_stale_captures(uuid4())
+    assert set(registry) == {newest}
+    assert oldest in service._TERMINAL_CAPTURE_IDS
@@ -0,0 +1,79 @@
+# apps/landmark_extractor/tests/test_service_warmup.py
+
+import subprocess
+import sys
+import threading
+
+from apps.landmark_extractor import service
+
+
+class FakeBackend:
+    def __init__(self):
+        self.warmups = 0
+
+    def warmup(self):
+        self.warmups += 1
+
+    def close(self):
+        pass
+
+
+def test_importing_api_does_not_construct_backends():
+    code = (
+        "import api.main\n"
+        "from apps.landmark_extractor import service\n"
+        "assert service._BACKEND_POOL is None\n"
+    )
+
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=120
+    )
+
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_backend_pool_is_constructed_once_under_concurrent_first_use(monkeypatch):
+    created = []
+
+    def factory():
+        backend = FakeBackend()
+        created.append(backend)
+        return backend
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", None)
+    monkeypatch.setattr(service, "BACKEND_POOL_SIZE", 2)
+    monkeypatch.setattr(service, "_create_backend", factory)
+
+    pools = []
+    barrier = threading.Barrier(4)
+
+    def first_use():
+        barrier.wait()
+        pools.append(service._get_backend_pool())
+
+    threads = [threading.Thread(target=first_use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2
+    assert all(pool is pools[0] for pool in pools)
+
+
+def test_warmup_warms_every_backend(monkeypatch):
+    created = []
+
+    def factory():
+        backend = FakeBackend()
+        created.append(backend)
+        return backend
+
+    monkeypatch.setattr(service, "_BACKEND_POOL", None)
+    monkeypatch.setattr(service, "BACKEND_POOL_SIZE", 2)
+    monkeypatch.setattr(service, "_create_backend", factory)
+
+    service.warmup()
+
+    assert [backend.warmups for backend in created] == [1, 1]
+    assert service.get_backend_pool_stats().available == 2
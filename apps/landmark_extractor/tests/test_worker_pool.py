@@ -0,0 +1,77 @@
+# apps/landmark_extractor/tests/test_worker_pool.py
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+from uuid import UUID
+
+import pytest
+
+from apps.landmark_extractor.worker_pool import (
+    CaptureAffinityProcessPool,
+    LandmarkWorkerCrashedError,
+    LandmarkWorkerPoolError,
+)
+
+
+def test_worker_pool_rejects_zero_workers():
+    with pytest.raises(LandmarkWorkerPoolError):
+        CaptureAffinityProcessPool(workers=0)
+
+
+def test_worker_index_is_stable_per_capture():
+    pool = CaptureAffinityProcessPool(workers=3)
+    try:
+        capture_id = UUID(int=7)
+
+        assert pool.worker_index(capture_id) == 1
+        assert pool.worker_index(capture_id) == pool.worker_index(UUID(int=7))
+        assert pool.worker_index(UUID(int=9)) == 0
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_routes_capture_to_same_process():
+    pool = CaptureAffinityProcessPool(workers=2)
+    try:
+        first = UUID(int=0)
+        second = UUID(int=1)
+
+        first_pids = {
+            pool.submit(first, os.getpid).result(timeout=60) for _ in range(3)
+        }
+        second_pid = pool.submit(second, os.getpid).result(timeout=60)
+
+        assert len(first_pids) == 1
+        assert second_pid not in first_pids
+        assert os.getpid() not in first_pids | {second_pid}
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_restarts_crashed_worker_and_fails_only_its_open_captures():
+    pool = CaptureAffinityProcessPool(workers=2)
+    try:
+        crashing = UUID(int=0)
+        open_on_same_worker = UUID(int=2)
+        other_worker = UUID(int=1)
+
+        other_pid = pool.submit(other_worker, os.getpid).result(timeout=60)
+        old_pid = pool.submit(open_on_same_worker, os.getpid).result(timeout=60)
+
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(crashing, os._exit, 1).result(timeout=60)
+        pool.forget(crashing)
+
+        new_pid = pool.submit(UUID(int=4), os.getpid).result(timeout=60)
+
+        assert new_pid != old_pid
+        with pytest.raises(LandmarkWorkerCrashedError):
+            pool.submit(open_on_same_worker, os.getpid)
+        assert pool.submit(other_worker, os.getpid).result(timeout=60) == other_pid
+
+        pool.forget(open_on_same_worker)
+        assert pool.submit(open_on_same_worker, os.getpid).result(timeout=60) == (
+            new_pid
+        )
+    finally:
+        pool.shutdown()
@@ -0,0 +1,162 @@
+# apps/landmark_extractor/worker_pool.py
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class LandmarkWorkerPoolError(Exception):
+    """Raised for worker pool configuration or lifecycle failures."""
+
+
+class LandmarkWorkerCrashedError(LandmarkWorkerPoolError):
+    """Raised for calls of a capture whose worker process died mid-capture."""
+
+
+class CaptureAffinityProcessPool:
+    """
+    Fixed set of single-process workers with capture-affinity routing.
+
+    Responsibilities:
+    - run `workers` independent worker processes
+    - route every call for one capture_id to the same worker
+    - preserve submission order per worker (each worker runs one call at a time)
+
+    Each worker process imports its own copy of the service module and so owns
+    its own MediaPipe backends and capture state. Capture affinity is what makes
+    that per-process state consistent: all frames and the finalize for a capture
+    run in the process that buffered its rows.
+
+    Worker crashes (e.g. a native segfault) break only that worker's executor:
+    - calls already queued on it fail with BrokenProcessPool
+    - the next submit to it starts a fresh worker process
+    - captures that were open on the dead worker lost their state there; later
+      calls for them raise LandmarkWorkerCrashedError until forget(capture_id)
+    - other workers and captures that start afterwards are unaffected
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        start_method: str = "spawn",
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        if workers < 1:
+            raise LandmarkWorkerPoolError("Worker pool needs at least one worker")
+
+        self._context = multiprocessing.get_context(start_method)
+        self._initializer = initializer
+        self._lock = threading.Lock()
+        self._executors = [self._new_executor() for _ in range(workers)]
+        # Captures routed to each worker's current process and not yet forgotten.
+        self._open_captures: list[set[UUID]] = [set() for _ in range(workers)]
+        self._lost_captures: set[UUID] = set()
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes."""
+        return len(self._executors)
+
+    def worker_index(self, capture_id: UUID) -> int:
+        """Return the stable worker index that owns capture_id."""
+        return capture_id.int % len(self._executors)
+
+    def submit(
+        self,
+        capture_id: UUID,
+        fn: Callable[..., Any],
+        *args: Any,
+    ) -> Future:
+        """
+        Submit fn(*args) to the worker that owns capture_id.
+
+        fn and args must be picklable. A crashed worker is restarted first.
+
+        Raises:
+        - LandmarkWorkerCrashedError if capture_id was open on a worker
+          process that has since died
+        """
+        index = self.worker_index(capture_id)
+
+        with self._lock:
+            self._raise_if_lost(capture_id)
+            try:
+                future = self._executors[index].submit(fn, *args)
+            except BrokenProcessPool:
+                self._restart_worker(index)
+                self._raise_if_lost(capture_id)
+                future = self._executors[index].submit(fn, *args)
+
+            self._open_captures[index].add(capture_id)
+
+        return future
+
+    def forget(self, capture_id: UUID) -> None:
+        """
+        Drop the pool's record of capture_id once it is terminal.
+
+        Called after a capture's close/abort, or after its worker crashed.
+        """
+        with self._lock:
+            self._open_captures[self.worker_index(capture_id)].discard(capture_id)
+            self._lost_captures.discard(capture_id)
+
+    def submit_to_all(self, fn: Callable[..., Any], *args: Any) -> list[Future]:
+        """
+        Submit fn(*args) once to every worker (e.g. per-process warm-up).
+
+        Queued behind, and ahead of, other calls in each worker's order.
+        """
+        futures = []
+
+        with self._lock:
+            for index in range(len(self._executors)):
+                try:
+                    futures.append(self._executors[index].submit(fn, *args))
+                except BrokenProcessPool:
+                    self._restart_worker(index)
+                    futures.append(self._executors[index].submit(fn, *args))
+
+        return futures
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all worker processes."""
+        for executor in self._executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._context,
+            initializer=self._initializer,
+        )
+
+    def _restart_worker(self, index: int) -> None:
+        """Replace a broken worker; its open captures become lost. Needs _lock."""
+        lost = self._open_captures[index]
+        logger.error(
+            "Landmark worker %d crashed; restarting it and failing %d open captures",
+            index,
+            len(lost),
+        )
+
+        self._executors[index].shutdown(wait=False, cancel_futures=True)
+        self._executors[index] = self._new_executor()
+        self._lost_captures |= lost
+        self._open_captures[index] = set()
+
+    def _raise_if_lost(self, capture_id: UUID) -> None:
+        if capture_id in self._lost_captures:
+            raise LandmarkWorkerCrashedError(
+                f"Worker process of capture {capture_id} crashed mid-capture"
+            )
@@ -24,6 +24,7 @@ from .camera_feed_worker.camera_feed_worker import (
 
 # landmark_extractor
 from .landmark_extractor.landmark_extractor import (
+    LandmarkExtractorFrameBytesInput,
     LandmarkExtractorFrameInput,
     LandmarkExtractorIngest,
     LandmarkExtractorInput,
@@ -63,6 +64,7 @@ __all__ = [
     "LandmarkExtractorInput",
     "LandmarkExtractorOutput",
     "LandmarkExtractorFrameInput",
+    "LandmarkExtractorFrameBytesInput",
     "LandmarkExtractorTerminalInput",
     "LandmarkExtractorIngest",
 ]
@@ -26,6 +26,10 @@ CameraFeedWorkerEventIn = Literal[
 ]
 
 
+# Must match the keys of apps.landmark_extractor.config.DETECTOR_PROFILES.
+DetectorProfile = Literal["full", "pose_hands", "hands_only"]
+
+
 class Annotation(BaseModel):
     intent: str
 
@@ -65,6 +69,19 @@ class CameraFeedWorkerInput(BaseSchema):
     # --- Open-only (annotation) ---
     annotation: Optional[Annotation] = None
 
+    # --- Open-only (landmark extraction) ---
+    detector_profile: Optional[
+        Annotated[
+            DetectorProfile,
+            Field(
+                description=(
+                    "Landmark detector profile for this capture (e.g., "
+                    "'hands_only'); omitted = extractor default"
+                )
+            ),
+        ]
+    ] = None
+
     # --- Frame-meta-only fields ---
     seq: Optional[
         Annotated[int, Field(description="Frame sequence number, starts at 1")]
@@ -113,6 +130,8 @@ class CameraFeedWorkerInput(BaseSchema):
         # --- NEW: annotation constraint ---
         if self.annotation is not None and self.event != "capture.open":
             raise ValueError("annotation is only allowed on capture.open")
+        if self.detector_profile is not None and self.event != "capture.open":
+            raise ValueError("detector_profile is only allowed on capture.open")
 
         if self.event == "capture.open":
             missing = [
@@ -2,21 +2,24 @@
 
 
 from datetime import datetime, timezone
-from typing import Annotated, Dict, Literal, Optional, Union
+from typing import Annotated, Any, Dict, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from schemas import BaseSchema
 
-LandmarkExtractorEventIn = Literal["capture.frame", "capture.close", "capture.abort"]
+LandmarkExtractorEventIn = Literal[
+    "capture.frame", "capture.frame_bytes", "capture.close", "capture.abort"
+]
 
 
-class LandmarkExtractorFrameInput(BaseSchema):
-    event: Annotated[
-        Literal["capture.frame"],
-        Field(description="Per-frame ingest event (image payload included)"),
-    ] = "capture.frame"
+class LandmarkExtractorFrameBase(BaseSchema):
+    """
+    Fields and validation shared by the per-frame ingest schemas.
+
+    Subclasses add the event literal and the image payload field.
+    """
 
     # Override BaseSchema optionality with required session_id for ingest contract
     session_id: str = Field(
@@ -47,16 +50,13 @@ class LandmarkExtractorFrameInput(BaseSchema):
         Field(..., description="Event-time timestamp for the frame (UTC)"),
     ]
 
-    frame_data: Annotated[
-        str,
-        Field(
-            ...,
-            description=(
-                "Base64-encoded image (typically JPEG). May be a data URL "
-                "(data:image/jpeg;base64,...) or raw base64."
-            ),
+    detector_profile: Optional[str] = Field(
+        None,
+        description=(
+            "Detector profile selected on capture.open; read from the first "
+            "frame of a capture. None = extractor default profile."
         ),
-    ]
+    )
 
     @field_validator("timestamp_frame", mode="before")
     @classmethod
@@ -74,6 +74,24 @@ class LandmarkExtractorFrameInput(BaseSchema):
             dt = dt.astimezone(timezone.utc)
         return dt
 
+
+class LandmarkExtractorFrameInput(LandmarkExtractorFrameBase):
+    event: Annotated[
+        Literal["capture.frame"],
+        Field(description="Per-frame ingest event (image payload included)"),
+    ] = "capture.frame"
+
+    frame_data: Annotated[
+        str,
+        Field(
+            ...,
+            description=(
+                "Base64-encoded image (typically JPEG). May be a data URL "
+                "(data:image/jpeg;base64,...) or raw base64."
+            ),
+        ),
+    ]
+
     @field_validator("frame_data")
     @classmethod
     def _frame_data_non_empty(cls, v: str) -> str:
@@ -82,6 +100,44 @@ class LandmarkExtractorFrameInput(BaseSchema):
         return v
 
 
+class LandmarkExtractorFrameBytesInput(LandmarkExtractorFrameBase):
+    """
+    In-process binary variant of LandmarkExtractorFrameInput.
+
+    Carries the encoded image as a bytes-like object instead of base64 text so
+    the extractor can decode it without a base64 round trip. Not a wire format:
+    frame_bytes is excluded from serialization.
+    """
+
+    event: Annotated[
+        Literal["capture.frame_bytes"],
+        Field(description="Per-frame ingest event (binary image payload included)"),
+    ] = "capture.frame_bytes"
+
+    frame_bytes: Annotated[
+        Any,
+        Field(
+            ...,
+            exclude=True,
+            description=(
+                "Encoded image (typically JPEG) as bytes, bytearray or a "
+                "C-contiguous memoryview. Passed through without copying."
+            ),
+        ),
+    ]
+
+    @field_validator("frame_bytes")
+    @classmethod
+    def _frame_bytes_non_empty(cls, v: Any) -> Any:
+        if not isinstance(v, (bytes, bytearray, memoryview)):
+            raise ValueError("frame_bytes must be bytes, bytearray or memoryview")
+        if isinstance(v, memoryview) and not v.c_contiguous:
+            raise ValueError("frame_bytes memoryview must be C-contiguous")
+        if len(v) == 0:
+            raise ValueError("frame_bytes must be non-empty")
+        return v
+
+
 class LandmarkExtractorTerminalInput(BaseSchema):
     event: Annotated[
         Literal["capture.close", "capture.abort"],
@@ -151,7 +207,11 @@ class LandmarkExtractorTerminalInput(BaseSchema):
 
 
 LandmarkExtractorIngest = Annotated[
-    Union[LandmarkExtractorFrameInput, LandmarkExtractorTerminalInput],
+    Union[
+        LandmarkExtractorFrameInput,
+        LandmarkExtractorFrameBytesInput,
+        LandmarkExtractorTerminalInput,
+    ],
     Field(discriminator="event"),
 ]
 
@@ -182,7 +242,7 @@ class LandmarkExtractorOverlayOutput(BaseModel):
 # Canonical public module schema surface (required by project convention)
 # -------------------------------------------------------------------
 
-# Input: union of frame + terminal (authoritative ingest surface)
+# Input: union of frame (base64 or binary) + terminal (authoritative ingest surface)
 LandmarkExtractorInput = LandmarkExtractorIngest
 
 # Output: module output surface (keep demo/legacy output for now)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# scripts/bench_landmark_extractor.py
+
+"""
+End-to-end throughput benchmark for apps.landmark_extractor.
+
+Drives deterministic synthetic JPEG captures through
+apps.landmark_extractor.ingest_boundary.ingest with the real MediaPipe .task
+models and prints one JSON report (stdout, or --output):
+
+- throughput (frames/s) per resolution and scenario
+- per-frame ingest latency p50/p95/p99 (ms)
+- peak RSS of this process (and of worker processes in "process" mode)
+- per-stage latency percentiles from service.get_latency_stats()
+
+Scenarios:
+- sequential: captures run one after another
+- concurrent: --concurrency captures stream frames at the same time
+
+Artifacts and session logs are written to a temporary directory that is
+removed afterwards. Service settings (execution mode, pool sizes, motion gate)
+come from apps/landmark_extractor/config.py; in "process" execution mode the
+worker processes must see the same temporary roots, so use the fork start
+method or benchmark "thread" mode.
+
+Usage:
+    python scripts/bench_landmark_extractor.py
+    python scripts/bench_landmark_extractor.py --resolutions 640x480 \\
+        --frames 30 --captures 2 --concurrency 4 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from apps.landmark_extractor import config as extractor_config  # noqa: E402
+from apps.landmark_extractor import service  # noqa: E402
+from apps.landmark_extractor.ingest_boundary import ingest  # noqa: E402
+from apps.schema_recorder import config as recorder_config  # noqa: E402
+from utils.paths import session_log_path  # noqa: E402
+
+DEFAULT_RESOLUTIONS = ("640x480", "1280x720", "1920x1080")
+USER_ID = "bench-user"
+SESSION_ID = "bench-session"
+FRAME_INTERVAL = timedelta(milliseconds=66)
+
+
+# ============================================================
+# Synthetic captures
+# ============================================================
+
+
+def synthetic_capture(
+    width: int, height: int, frames: int, seed: int, jpeg_quality: int
+) -> list[bytes]:
+    """
+    Return `frames` JPEG-encoded frames of one deterministic synthetic capture.
+
+    A textured background with a few moving filled shapes, so consecutive
+    frames differ (the motion gate does not short-circuit them) while the
+    same seed always yields the same bytes.
+    """
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), sigmaX=max(width, height) / 80)
+
+    shapes = [
+        (
+            rng.uniform(0.2, 0.8, size=2),
+            rng.uniform(-0.01, 0.01, size=2),
+            int(rng.integers(min(width, height) // 20, min(width, height) // 6)),
+            tuple(int(c) for c in rng.integers(0, 256, size=3)),
+        )
+        for _ in range(4)
+    ]
+
+    encoded = []
+    for index in range(frames):
+        frame = background.copy()
+        for center, velocity, radius, color in shapes:
+            x, y = (center + velocity * index) % 1.0
+            cv2.circle(frame, (int(x * width), int(y * height)), radius, color, -1)
+
+        ok, jpeg = cv2.imencode(
+            ".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+        )
+        if not ok:
+            raise RuntimeError(f"JPEG encoding failed at {width}x{height}")
+        encoded.append(jpeg.tobytes())
+
+    return encoded
+
+
+def _frame_message(
+    capture_id, seq: int, timestamp_frame: datetime, jpeg: bytes
+) -> dict[str, Any]:
+    return {
+        "schema_version": "1.0.1",
+        "record_id": uuid4(),
+        "user_id": USER_ID,
+        "session_id": SESSION_ID,
+        "timestamp": timestamp_frame,
+        "event": "capture.frame_bytes",
+        "capture_id": capture_id,
+        "seq": seq,
+        "timestamp_frame": timestamp_frame,
+        "frame_bytes": jpeg,
+    }
+
+
+def _close_message(capture_id, timestamp_end: datetime) -> dict[str, Any]:
+    return {
+        "schema_version": "1.0.1",
+        "record_id": uuid4(),
+        "user_id": USER_ID,
+        "session_id": SESSION_ID,
+        "timestamp": timestamp_end,
+        "event": "capture.close",
+        "capture_id": capture_id,
+        "timestamp_end": timestamp_end,
+    }
+
+
+# ============================================================
+# Scenarios
+# ============================================================
+
+
+async def _run_capture(frames: list[bytes], latencies_s: list[float]) -> None:
+    """Stream one capture through ingest(), then close it."""
+    capture_id = uuid4()
+    timestamp = datetime.now(timezone.utc)
+
+    for seq, jpeg in enumerate(frames, start=1):
+        message = _frame_message(capture_id, seq, timestamp, jpeg)
+        start = time.perf_counter()
+        await ingest(message)
+        latencies_s.append(time.perf_counter() - start)
+        timestamp += FRAME_INTERVAL
+
+    await ingest(_close_message(capture_id, timestamp))
+
+
+async def run_scenario(
+    captures: list[list[bytes]], concurrency: int
+) -> tuple[float, list[float]]:
+    """
+    Run all captures, at most `concurrency` at a time.
+
+    Returns:
+    - wall-clock seconds, including capture.close finalization
+    - per-frame ingest latencies in seconds
+    """
+    latencies_s: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(frames: list[bytes]) -> None:
+        async with semaphore:
+            await _run_capture(frames, latencies_s)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(frames) for frames in captures))
+    return time.perf_counter() - start, latencies_s
+
+
+# ============================================================
+# Reporting
+# ============================================================
+
+
+def _peak_rss_mb() -> dict[str, float]:
+    """Peak resident set size (MiB) of this process and its reaped children."""
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1
+        ),
+    }
+
+
+def _latency_summary_ms(latencies_s: list[float]) -> dict[str, float]:
+    values = np.asarray(latencies_s, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+def _stage_summary_ms() -> dict[str, dict[str, float]]:
+    return {
+        stage: {
+            "count": stats.count,
+            "mean": round(stats.mean_ms, 3),
+            "p50": round(stats.p50_ms, 3),
+            "p95": round(stats.p95_ms, 3),
+            "p99": round(stats.p99_ms, 3),
+        }
+        for stage, stats in service.get_latency_stats().items()
+    }
+
+
+def _environment() -> dict[str, Any]:
+    try:
+        import mediapipe
+
+        mediapipe_version = mediapipe.__version__
+    except Exception:
+        mediapipe_version = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "mediapipe": mediapipe_version,
+        "execution_mode": extractor_config.EXTRACTION_EXECUTION_MODE,
+        "backend_pool_size": extractor_config.BACKEND_POOL_SIZE,
+        "frame_pipeline_max_workers": extractor_config.FRAME_PIPELINE_MAX_WORKERS,
+        "motion_gate_enabled": extractor_config.MOTION_GATE_ENABLED,
+        "extraction_stride": extractor_config.EXTRACTION_STRIDE,
+    }
+
+
+# ============================================================
+# Entry point
+# ============================================================
+
+
+def _parse_resolution(value: str) -> tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"resolution must look like 640x480, got {value!r}"
+        ) from exc
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"resolution must be positive: {value!r}")
+    return width, height
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--resolutions",
+        nargs="+",
+        type=_parse_resolution,
+        default=[_parse_resolution(r) for r in DEFAULT_RESOLUTIONS],
+        help="frame sizes as WIDTHxHEIGHT (default: %(default)s)",
+    )
+    parser.add_argument("--frames", type=int, default=60, help="frames per capture")
+    parser.add_argument("--captures", type=int, default=4, help="captures per scenario")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="captures in flight in the concurrent scenario",
+    )
+    parser.add_argument("--jpeg-quality", type=int, default=85)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="write the JSON report here"
+    )
+    args = parser.parse_args(argv)
+
+    for name in ("frames", "captures", "concurrency"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be >= 1")
+
+    return args
+
+
+def _check_models() -> None:
+    missing = [
+        str(path)
+        for path in (
+            extractor_config.POSE_LANDMARKER_MODEL_PATH,
+            extractor_config.HAND_LANDMARKER_MODEL_PATH,
+            extractor_config.FACE_LANDMARKER_MODEL_PATH,
+        )
+        if not Path(path).is_file()
+    ]
+    if missing:
+        raise SystemExit(f"Missing MediaPipe model files: {', '.join(missing)}")
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every (resolution, scenario) pair and return the JSON report."""
+    await asyncio.to_thread(service.warmup)
+
+    results = []
+    for width, height in args.resolutions:
+        captures = [
+            synthetic_capture(
+                width, height, args.frames, args.seed + index, args.jpeg_quality
+            )
+            for index in range(args.captures)
+        ]
+
+        for scenario, concurrency in (
+            ("sequential", 1),
+            ("concurrent", args.concurrency),
+        ):
+            service.reset_latency_stats()
+            wall_s, latencies_s = await run_scenario(captures, concurrency)
+
+            results.append(
+                {
+                    "scenario": scenario,
+                    "resolution": f"{width}x{height}",
+                    "captures": args.captures,
+                    "frames_per_capture": args.frames,
+                    "concurrency": concurrency,
+                    "wall_s": round(wall_s, 3),
+                    "throughput_fps": round(len(latencies_s) / wall_s, 2),
+                    "frame_latency_ms": _latency_summary_ms(latencies_s),
+                    "peak_rss_mb": _peak_rss_mb(),
+                    "stages_ms": _stage_summary_ms(),
+                }
+            )
+
+    return {
+        "benchmark": "landmark_extractor.ingest",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "parameters": {
+            "frames_per_capture": args.frames,
+            "captures": args.captures,
+            "concurrency": args.concurrency,
+            "jpeg_quality": args.jpeg_quality,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    _check_models()
+
+    with tempfile.TemporaryDirectory(prefix="a3cp-bench-") as tmp:
+        tmp_root = Path(tmp)
+        extractor_config.FEATURE_DATA_ROOT = tmp_root / "data"
+        recorder_config.LOG_ROOT = tmp_root / "logs"
+        # schema_recorder never creates session directories itself.
+        session_log_path(recorder_config.LOG_ROOT, USER_ID, SESSION_ID).parent.mkdir(
+            parents=True
+        )
+
+        report = asyncio.run(run_benchmark(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,15 @@
 # tests/utils/test_paths.py
 from pathlib import Path
 
-from utils.paths import session_log_path
+import pytest
+
+from utils.paths import (
+    feature_artifact_path,
+    feature_blob_path,
+    feature_ref_path,
+    feature_staging_root,
+    session_log_path,
+)
 
 
 def test_session_log_path_is_pure_and_deterministic(tmp_path: Path) -> None:
@@ -18,3 +26,67 @@ def test_session_log_path_is_pure_and_deterministic(tmp_path: Path) -> None:
     # Purity check: function must not create directories or files.
     assert not log_root.exists()
     assert not p1.exists()
+
+
+def test_feature_artifact_path_is_pure_and_deterministic(tmp_path: Path) -> None:
+    data_root = tmp_path / "data"  # intentionally does NOT exist
+
+    p1 = feature_artifact_path(
+        data_root=data_root, user_id="u123", session_id="sess_abc", capture_id="c1"
+    )
+    p2 = feature_artifact_path(
+        data_root=data_root, user_id="u123", session_id="sess_abc", capture_id="c1"
+    )
+
+    assert p1 == p2
+    assert p1.relative_to(data_root).parts == (
+        "users",
+        "u123",
+        "sessions",
+        "sess_abc",
+        "features",
+        "c1.npz",
+    )
+
+    # Purity check: function must not create directories or files.
+    assert not data_root.exists()
+
+
+def test_feature_blob_path_fans_out_by_hash_prefix(tmp_path: Path) -> None:
+    data_root = tmp_path / "data"  # intentionally does NOT exist
+    digest = "ab" + "cd" + "0" * 60
+
+    p1 = feature_blob_path(data_root, f"sha256:{digest}")
+    p2 = feature_blob_path(data_root, digest.upper())
+
+    assert p1 == p2
+    assert p1.relative_to(data_root).parts == (
+        "blobs",
+        "sha256",
+        "ab",
+        "cd",
+        f"{digest}.npz",
+    )
+    assert not data_root.exists()
+
+
+def test_feature_blob_path_rejects_non_sha256_hash(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        feature_blob_path(tmp_path, "sha256:abc")
+
+
+def test_feature_ref_path_fans_out_by_capture_id(tmp_path: Path) -> None:
+    data_root = tmp_path / "data"  # intentionally does NOT exist
+    capture_id = "3f2a9c1e-0000-4000-8000-000000000000"
+
+    p = feature_ref_path(data_root, capture_id)
+
+    assert p.relative_to(data_root).parts == (
+        "blobs",
+        "refs",
+        "3f",
+        "2a",
+        f"{capture_id}.npz",
+    )
+    assert feature_staging_root(data_root) == data_root / "blobs" / "staging"
+    assert not data_root.exists()
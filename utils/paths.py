@@ -21,3 +21,103 @@ def session_log_path(log_root: Path, user_id: Any, session_id: Any) -> Path:
     session_seg = str(session_id)
 
     return log_root / "users" / user_seg / "sessions" / f"{session_seg}.jsonl"
+
+
+def feature_artifact_path(
+    data_root: Path, user_id: Any, session_id: Any, capture_id: Any
+) -> Path:
+    """
+    Pure path helper (NO IO, NO env reads, NO mkdir).
+
+    Canonical layout:
+      <DATA_ROOT>/users/<user_id>/sessions/<session_id>/features/<capture_id>.npz
+    """
+    if not isinstance(data_root, Path):
+        raise TypeError("data_root must be a pathlib.Path")
+
+    # Treat ids as opaque segments; no validation here (validation belongs upstream).
+    user_seg = str(user_id)
+    session_seg = str(session_id)
+    capture_seg = str(capture_id)
+
+    return (
+        data_root
+        / "users"
+        / user_seg
+        / "sessions"
+        / session_seg
+        / "features"
+        / f"{capture_seg}.npz"
+    )
+
+
+def feature_blob_path(data_root: Path, content_hash: str) -> Path:
+    """
+    Pure path helper (NO IO, NO env reads, NO mkdir).
+
+    Content-addressed layout (two 256-way fan-out levels):
+      <DATA_ROOT>/blobs/sha256/<hex[0:2]>/<hex[2:4]>/<hex>.npz
+
+    content_hash is a sha256 hex digest, with or without the "sha256:" prefix.
+    """
+    if not isinstance(data_root, Path):
+        raise TypeError("data_root must be a pathlib.Path")
+
+    hex_digest = content_hash.removeprefix("sha256:").lower()
+    if len(hex_digest) != 64 or any(c not in "0123456789abcdef" for c in hex_digest):
+        raise ValueError(f"not a sha256 hex digest: {content_hash!r}")
+
+    return (
+        feature_blob_root(data_root)
+        / hex_digest[0:2]
+        / hex_digest[2:4]
+        / f"{hex_digest}.npz"
+    )
+
+
+def feature_blob_root(data_root: Path) -> Path:
+    """
+    Pure path helper (NO IO, NO env reads, NO mkdir).
+
+    Root of the content-addressed feature blobs: <DATA_ROOT>/blobs/sha256
+    """
+    if not isinstance(data_root, Path):
+        raise TypeError("data_root must be a pathlib.Path")
+
+    return data_root / "blobs" / "sha256"
+
+
+def feature_ref_path(data_root: Path, capture_id: Any) -> Path:
+    """
+    Pure path helper (NO IO, NO env reads, NO mkdir).
+
+    Per-capture reference (hard link) to a content-addressed blob, fanned out
+    by capture id like the blobs themselves:
+      <DATA_ROOT>/blobs/refs/<id[0:2]>/<id[2:4]>/<capture_id>.npz
+    """
+    if not isinstance(data_root, Path):
+        raise TypeError("data_root must be a pathlib.Path")
+
+    capture_seg = str(capture_id)
+
+    return (
+        data_root
+        / "blobs"
+        / "refs"
+        / capture_seg[0:2]
+        / capture_seg[2:4]
+        / f"{capture_seg}.npz"
+    )
+
+
+def feature_staging_root(data_root: Path) -> Path:
+    """
+    Pure path helper (NO IO, NO env reads, NO mkdir).
+
+    Temp and staging files of the content-addressed store:
+      <DATA_ROOT>/blobs/staging
+    """
+    if not isinstance(data_root, Path):
+        raise TypeError("data_root must be a pathlib.Path")
+
+    return data_root / "blobs" / "staging"